@@ -3,58 +3,33 @@ GitHub Agent for extracting project information and insights
 """
 
 import re
+import base64
 import asyncio
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any
 
-import requests
-from app.core.llm import llm
+from app.agents.github_client import (
+    GITHUB_API_BASE,
+    GitHubClient,
+    GitHubRateLimited,
+    GitHubResponse,
+    github_client,
+)
+from app.agents.repo_ingest import IngestedContent, repo_ingestor
+from app.core.model_router import routed_llm
+from app.core.singleflight import coalesced_ainvoke, web_flights
 
-try:  # Prefer async ingest if available
-    from gitingest import ingest_async as _gitingest_async  # type: ignore
-
-    _HAS_GITINGEST = True
-    _HAS_GITINGEST_ASYNC = True
-
-except ImportError:  # Fallback to sync ingest
-    try:
-        from gitingest import ingest as _gitingest_sync  # type: ignore
-
-        _HAS_GITINGEST = True
-        _HAS_GITINGEST_ASYNC = False
-
-    except ImportError:  # Completely optional dependency
-        _HAS_GITINGEST = False
-        _HAS_GITINGEST_ASYNC = False
-
-
-from pydantic import BaseModel, HttpUrl
-
-
-class IngestedContent(BaseModel):
-    """Structured representation of repository ingestion output."""
-
-    tree: str
-    summary: str
-    content: str
-
-    def excerpt(self, max_chars: int = 4000) -> str:  # type: ignore
-        """Return a safe excerpt of the combined content for LLM prompts."""
-        content = getattr(self, "content", "")  # compatibility
-        if len(content) <= max_chars:
-            return content
-
-        return content[: max_chars - 500] + "\n...\n[truncated]" + content[-400:]
+insights_llm = routed_llm("extraction", "github_insights")
 
 
 class GitHubAgent:
     """Agent for extracting information from GitHub repositories"""
 
-    def __init__(self):
-        self.github_api_base = "https://api.github.com"
-        self.headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "TalentSync-LinkedIn-Generator",
-        }
+    def __init__(self, client: Optional[GitHubClient] = None):
+        # Shared by default so ETags, cached responses and rate-limit state
+        # carry over between requests.
+        self.client = client or github_client
+        self.github_api_base = GITHUB_API_BASE
+        self.headers = self.client.headers
 
     def parse_github_url(self, url: str) -> Optional[Dict[str, str]]:
         """
@@ -96,39 +71,31 @@ class GitHubAgent:
             return {"error": "Invalid GitHub URL format"}
 
         owner, repo = parsed["owner"], parsed["repo"]
+        base = f"/repos/{owner}/{repo}"
 
         try:
-            # Get basic repository info
-            repo_url = f"{self.github_api_base}/repos/{owner}/{repo}"
-            response = requests.get(repo_url, headers=self.headers, timeout=10)
+            # The four endpoints are independent, so fetch them together.
+            repo_response, lang_response, commit_response, readme_response = (
+                await asyncio.gather(
+                    self.client.get(base),
+                    self.client.get(f"{base}/languages"),
+                    self.client.get(f"{base}/commits", params={"per_page": 5}),
+                    self.client.get(f"{base}/readme"),
+                    return_exceptions=True,
+                )
+            )
 
-            if response.status_code != 200:
+            if isinstance(repo_response, BaseException):
+                raise repo_response
+            if not repo_response.ok:
                 return {
-                    "error": f"Repository not found or private: {response.status_code}"
+                    "error": f"Repository not found or private: {repo_response.status_code}"
                 }
 
-            repo_data = response.json()
-
-            # Get languages
-            languages_url = f"{self.github_api_base}/repos/{owner}/{repo}/languages"
-            lang_response = requests.get(
-                languages_url, headers=self.headers, timeout=10
-            )
-            languages = lang_response.json() if lang_response.status_code == 200 else {}
-
-            # Get recent commits (for activity)
-            commits_url = (
-                f"{self.github_api_base}/repos/{owner}/{repo}/commits?per_page=5"
-            )
-            commit_response = requests.get(
-                commits_url, headers=self.headers, timeout=10
-            )
-            commits = (
-                commit_response.json() if commit_response.status_code == 200 else []
-            )
-
-            # Get README content
-            readme_content = self._get_readme_content(owner, repo)
+            repo_data = repo_response.data
+            languages = self._ok_data(lang_response, {})
+            commits = self._ok_data(commit_response, [])
+            readme_content = self._decode_readme(self._ok_data(readme_response, {}))
 
             return {
                 "name": repo_data.get("name", ""),
@@ -154,40 +121,30 @@ class GitHubAgent:
                 "url": repo_data.get("html_url", url),
             }
 
+        except GitHubRateLimited as e:
+            return {"error": str(e)}
+
         except Exception as e:
             print(f"Error fetching repository info: {e}")
             return {"error": f"Failed to fetch repository information: {str(e)}"}
 
-    async def _ingest_repository(
-        self, url: str, timeout: float = 60.0
-    ) -> Optional[IngestedContent]:
-        """Ingest repository codebase (if gitingest installed).
+    @staticmethod
+    def _ok_data(response: Any, default: Any) -> Any:
+        if isinstance(response, GitHubResponse) and response.ok and response.data:
+            return response.data
+        return default
 
-        Returns None if ingestion library not available or any failure occurs.
-        Heavy content is truncated later when used in prompts.
+    async def _ingest_repository(self, url: str) -> Optional[IngestedContent]:
+        """Ingest the repository codebase within the configured byte budget.
+
+        Results are cached per commit (see ``app.agents.repo_ingest``).
+        Returns None if ingestion is unavailable or any failure occurs.
         """
-        if not _HAS_GITINGEST:
+        parsed = self.parse_github_url(url)
+        if not parsed:
             return None
-
-        async def _run_ingest() -> Tuple[str, str, str]:
-            if _HAS_GITINGEST_ASYNC:
-                return await _gitingest_async(url)  # summary, tree, content
-            # Run sync version in thread to avoid blocking event loop
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(None, lambda: _gitingest_sync(url))  # type: ignore
-
         try:
-            summary, tree, content = await asyncio.wait_for(
-                _run_ingest(), timeout=timeout
-            )
-            # Guard against extremely large content (keep first ~1.8M chars max)
-            max_len = 5 * 3 * 600_000
-            if len(content) > max_len:
-                content = (
-                    content[: max_len - 1000]
-                    + "\n...\n[large repository content truncated]"
-                )
-            return IngestedContent(tree=tree, summary=summary, content=content)
+            return await repo_ingestor.ingest(parsed["owner"], parsed["repo"], url)
         except Exception as e:  # Broad except OK for optional feature
             print(f"[GitHubAgent] Ingestion skipped: {e}")
             return None
@@ -201,30 +158,39 @@ class GitHubAgent:
         """
         return await self._ingest_repository(repo_link)
 
-    def _get_readme_content(self, owner: str, repo: str) -> str:
+    async def _get_readme_content(self, owner: str, repo: str) -> str:
         """
         Get README content from repository
         """
         try:
-            readme_url = f"{self.github_api_base}/repos/{owner}/{repo}/readme"
-            response = requests.get(readme_url, headers=self.headers, timeout=10)
-
-            if response.status_code == 200:
-                readme_data = response.json()
-                # GitHub API returns base64 encoded content
-                import base64
-
-                content = base64.b64decode(readme_data["content"]).decode("utf-8")
-                # Return first 1000 characters to avoid too much content
-                return content[:1000] if len(content) > 1000 else content
+            response = await self.client.get(f"/repos/{owner}/{repo}/readme")
+            return self._decode_readme(response.data if response.ok else {})
+        except Exception:
             return ""
+
+    @staticmethod
+    def _decode_readme(readme_data: Dict[str, Any]) -> str:
+        try:
+            # GitHub API returns base64 encoded content
+            content = base64.b64decode(readme_data["content"]).decode("utf-8")
         except Exception:
             return ""
+        # Return first 1000 characters to avoid too much content
+        return content[:1000] if len(content) > 1000 else content
 
     async def analyze_project_for_linkedin(self, url: str) -> Dict[str, Any]:
         """
         Analyze GitHub project and generate insights for LinkedIn content
         """
+        # Concurrent requests for the same repository share one analysis.
+        result = await web_flights.do(
+            ("github", url.strip().rstrip("/").lower()),
+            self._analyze_project_for_linkedin,
+            url,
+        )
+        return dict(result)
+
+    async def _analyze_project_for_linkedin(self, url: str) -> Dict[str, Any]:
         repo_info = await self.get_repository_info(url)
 
         if repo_info.get("error"):
@@ -283,7 +249,7 @@ class GitHubAgent:
                 f"Keep each point concise and professional."
             )
 
-            response = await llm.ainvoke(prompt)
+            response = await coalesced_ainvoke(insights_llm, prompt)
             insights_text = (
                 str(response.content) if hasattr(response, "content") else str(response)
             )
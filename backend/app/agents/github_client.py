@@ -0,0 +1,205 @@
+"""Caching, rate-limit aware client for the GitHub REST API.
+
+Responses are kept in memory with their ``ETag``. Within
+``GITHUB_CACHE_TTL`` a cached response is returned without touching the
+network; after that the request is revalidated with ``If-None-Match``, and a
+``304 Not Modified`` answer does not count against the rate limit. Analysing
+the same repository twice therefore costs no API quota.
+
+``GITHUB_TOKEN`` is sent as a bearer token when set. The ``X-RateLimit-*``
+headers of every response are tracked: once the quota is exhausted requests
+wait for the reset (up to ``GITHUB_RATE_LIMIT_MAX_WAIT`` seconds) or are
+answered from the cache, even if stale, instead of burning more 403s.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core import http
+from app.core.cache import LRUCache, register_cache_stats
+from app.core.config import (
+    github_cache_max_bytes,
+    github_cache_ttl,
+    github_rate_limit_max_wait,
+    github_token,
+)
+from app.core.singleflight import SingleFlight
+
+GITHUB_API_BASE = "https://api.github.com"
+
+
+class GitHubRateLimited(RuntimeError):
+    """Raised when the quota is exhausted and nothing is cached."""
+
+    def __init__(self, reset_at: float):
+        super().__init__(
+            f"GitHub API rate limit exceeded; resets in {max(0, int(reset_at - time.time()))}s"
+        )
+        self.reset_at = reset_at
+
+
+@dataclass
+class GitHubResponse:
+    status_code: int
+    data: Any
+    etag: Optional[str]
+    fetched_at: float
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200
+
+
+def _response_size(response: GitHubResponse) -> int:
+    return len(json.dumps(response.data, default=str)) if response.data else 64
+
+
+class GitHubClient:
+    def __init__(
+        self,
+        token: Optional[str] = github_token,
+        ttl: float = github_cache_ttl,
+        max_bytes: int = github_cache_max_bytes,
+        max_rate_limit_wait: float = github_rate_limit_max_wait,
+    ) -> None:
+        self.token = token
+        self.ttl = ttl
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.cache = LRUCache[GitHubResponse](
+            max_bytes=max_bytes, sizeof=_response_size
+        )
+        self._flights = SingleFlight("github_api")
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: float = 0.0
+        self.requests = 0
+        self.not_modified = 0
+        self.rate_limited = 0
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "TalentSync-LinkedIn-Generator",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def _track_rate_limit(self, response: httpx.Response) -> None:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is not None and remaining.isdigit():
+            self.rate_limit_remaining = int(remaining)
+        if reset is not None and reset.isdigit():
+            self.rate_limit_reset = float(reset)
+
+    def _is_rate_limited(self, response: httpx.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        return response.status_code == 403 and (
+            response.headers.get("X-RateLimit-Remaining") == "0"
+            or "Retry-After" in response.headers
+        )
+
+    def _wait_seconds(self, response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return max(0.0, self.rate_limit_reset - time.time())
+
+    async def _send(self, url: str, etag: Optional[str]) -> httpx.Response:
+        headers = self.headers
+        if etag:
+            headers["If-None-Match"] = etag
+
+        for attempt in range(2):
+            self.requests += 1
+            response = await http.get(url, headers=headers, timeout=10)
+            self._track_rate_limit(response)
+            if not self._is_rate_limited(response):
+                return response
+
+            self.rate_limited += 1
+            wait = self._wait_seconds(response)
+            if attempt == 1 or wait > self.max_rate_limit_wait:
+                return response
+            await asyncio.sleep(wait)
+
+        return response
+
+    async def _fetch(self, url: str) -> GitHubResponse:
+        cached: Optional[GitHubResponse] = self.cache.get(url)
+        now = time.time()
+        if cached is not None and now - cached.fetched_at < self.ttl:
+            return cached
+
+        # Quota known to be exhausted: don't spend a request to learn that again.
+        if self.rate_limit_remaining == 0 and self.rate_limit_reset > now:
+            if cached is not None:
+                return cached
+            if self.rate_limit_reset - now > self.max_rate_limit_wait:
+                raise GitHubRateLimited(self.rate_limit_reset)
+            await asyncio.sleep(self.rate_limit_reset - now)
+
+        response = await self._send(url, cached.etag if cached else None)
+
+        if response.status_code == 304 and cached is not None:
+            self.not_modified += 1
+            refreshed = GitHubResponse(200, cached.data, cached.etag, time.time())
+            self.cache.set(url, refreshed)
+            return refreshed
+
+        if self._is_rate_limited(response):
+            if cached is not None:
+                return cached
+            raise GitHubRateLimited(self.rate_limit_reset or time.time())
+
+        try:
+            data = response.json() if response.content else None
+        except ValueError:
+            data = None
+
+        result = GitHubResponse(
+            response.status_code, data, response.headers.get("ETag"), time.time()
+        )
+        if response.status_code in (200, 404):
+            self.cache.set(url, result)
+        return result
+
+    async def get(
+        self, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> GitHubResponse:
+        """GET ``path`` (relative to the API root) through the cache."""
+        url = str(httpx.URL(f"{GITHUB_API_BASE}{path}", params=params))
+        return await self._flights.do(url, self._fetch, url)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.cache.stats_dict(),
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "rate_limited": self.rate_limited,
+            "rate_limit_remaining": self.rate_limit_remaining,
+            "authenticated": bool(self.token),
+        }
+
+
+github_client = GitHubClient()
+
+register_cache_stats("github_api", github_client.stats)
+
+
+__all__ = [
+    "GITHUB_API_BASE",
+    "GitHubClient",
+    "GitHubRateLimited",
+    "GitHubResponse",
+    "github_client",
+]
@@ -0,0 +1,489 @@
+"""Bounded, cached repository ingestion for the GitHub agent.
+
+The LinkedIn insights only ever read a few thousand characters of a
+repository, so ingesting the whole codebase per request is wasted work. Two
+modes are available (``GITHUB_INGEST_MODE``):
+
+- ``budgeted`` (default): reads the git tree of the resolved commit through
+  the GitHub API, then fetches only the README and the most relevant files
+  (manifests, entry points, shallow sources) that fit within
+  ``GITHUB_INGEST_MAX_BYTES`` / ``GITHUB_INGEST_MAX_FILES``. File sizes come
+  from the tree, so nothing beyond the budget is downloaded.
+- ``full``: runs ``gitingest`` (optional dependency) and truncates its output
+  to the same budget. Also used as the fallback when the API is unavailable.
+
+Results are keyed by ``owner/repo@<commit sha>`` and stored gzip-compressed
+under ``GITHUB_INGEST_CACHE_DIR``, so analysing an unchanged repository again
+costs two conditional API requests and a cache read.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import posixpath
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from app.agents.github_client import GitHubClient, github_client
+from app.core import http
+from app.core.cache import register_cache_stats
+from app.core.concurrency import run_blocking
+from app.core.config import (
+    github_ingest_cache_dir,
+    github_ingest_cache_disk_max_bytes,
+    github_ingest_cache_memory_entries,
+    github_ingest_max_bytes,
+    github_ingest_max_files,
+    github_ingest_mode,
+    github_ingest_timeout,
+)
+from app.core.singleflight import SingleFlight
+from app.services.document_cache import DocumentCache
+
+try:  # Prefer async ingest if available
+    from gitingest import ingest_async as _gitingest_async  # type: ignore
+
+    _HAS_GITINGEST = True
+    _HAS_GITINGEST_ASYNC = True
+
+except ImportError:  # Fallback to sync ingest
+    try:
+        from gitingest import ingest as _gitingest_sync  # type: ignore
+
+        _HAS_GITINGEST = True
+        _HAS_GITINGEST_ASYNC = False
+
+    except ImportError:  # Completely optional dependency
+        _HAS_GITINGEST = False
+        _HAS_GITINGEST_ASYNC = False
+
+
+logger = logging.getLogger(__name__)
+
+RAW_CONTENT_BASE = "https://raw.githubusercontent.com"
+FILE_FETCH_CONCURRENCY = 4
+MAX_TREE_LINES = 400
+
+_SKIP_DIRS = {
+    ".git",
+    ".github",
+    ".next",
+    ".venv",
+    "__pycache__",
+    "build",
+    "coverage",
+    "dist",
+    "node_modules",
+    "out",
+    "site-packages",
+    "target",
+    "third_party",
+    "vendor",
+    "venv",
+}
+_SKIP_EXTENSIONS = frozenset(
+    ".bin .csv .db .dll .eot .exe .gif .gz .h5 .ico .ipynb .jar .jpeg .jpg "
+    ".lock .map .mp3 .mp4 .onnx .parquet .pdf .pkl .png .pt .so .sqlite "
+    ".svg .tar .ttf .wav .webp .woff .woff2 .zip".split()
+)
+_SKIP_NAMES = {
+    "cargo.lock",
+    "composer.lock",
+    "gemfile.lock",
+    "go.sum",
+    "package-lock.json",
+    "pnpm-lock.yaml",
+    "poetry.lock",
+    "yarn.lock",
+}
+_MANIFESTS = {
+    "build.gradle",
+    "build.gradle.kts",
+    "cargo.toml",
+    "composer.json",
+    "docker-compose.yaml",
+    "docker-compose.yml",
+    "dockerfile",
+    "gemfile",
+    "go.mod",
+    "makefile",
+    "package.json",
+    "pom.xml",
+    "pyproject.toml",
+    "requirements.txt",
+    "setup.cfg",
+    "setup.py",
+}
+_ENTRYPOINTS = {"__main__", "app", "cli", "index", "lib", "main", "manage", "server"}
+_SOURCE_EXTENSIONS = frozenset(
+    ".c .cpp .cs .dart .ex .go .h .hpp .java .js .jsx .kt .php .py .rb .rs "
+    ".scala .sh .svelte .swift .ts .tsx .vue".split()
+)
+_TEST_DIRS = {"__tests__", "spec", "test", "tests"}
+
+
+class IngestedContent(BaseModel):
+    """Structured representation of repository ingestion output."""
+
+    tree: str
+    summary: str
+    content: str
+    commit: str = ""
+    files: List[str] = Field(default_factory=list)
+    mode: str = "full"
+
+    def excerpt(self, max_chars: int = 4000) -> str:  # type: ignore
+        """Return a safe excerpt of the combined content for LLM prompts."""
+        content = getattr(self, "content", "")  # compatibility
+        if len(content) <= max_chars:
+            return content
+
+        return content[: max_chars - 500] + "\n...\n[truncated]" + content[-400:]
+
+
+@dataclass
+class RepoFile:
+    path: str
+    size: int
+
+    @property
+    def depth(self) -> int:
+        return self.path.count("/")
+
+
+def _is_readme(path: str) -> bool:
+    return "/" not in path and path.lower().startswith("readme")
+
+
+def _is_skipped(path: str) -> bool:
+    parts = path.lower().split("/")
+    name = parts[-1]
+    if any(part in _SKIP_DIRS for part in parts[:-1]):
+        return True
+    if name in _SKIP_NAMES or name.endswith(".min.js"):
+        return True
+    return posixpath.splitext(name)[1] in _SKIP_EXTENSIONS
+
+
+def relevance(file: RepoFile) -> int:
+    """Heuristic score of how much ``file`` tells about the project."""
+    parts = file.path.lower().split("/")
+    name = parts[-1]
+    stem, extension = posixpath.splitext(name)
+
+    if name in _MANIFESTS:
+        score = 100
+    elif stem in _ENTRYPOINTS and extension in _SOURCE_EXTENSIONS:
+        score = 60
+    elif extension in _SOURCE_EXTENSIONS:
+        score = 30
+    elif extension in (".md", ".rst"):
+        score = 15
+    else:
+        score = 5
+
+    if any(part in _TEST_DIRS for part in parts[:-1]) or stem.startswith("test_"):
+        score -= 20
+    return score - 5 * file.depth
+
+
+def select_files(
+    files: List[RepoFile], max_bytes: int, max_files: int
+) -> Tuple[Optional[RepoFile], List[RepoFile]]:
+    """Pick the README and the most relevant files that fit the byte budget."""
+    readme = next((f for f in files if _is_readme(f.path)), None)
+    budget = max_bytes - (min(readme.size, max_bytes // 4) if readme else 0)
+
+    candidates = sorted(
+        (
+            f
+            for f in files
+            if f is not readme and 0 < f.size <= budget and not _is_skipped(f.path)
+        ),
+        key=lambda f: (-relevance(f), f.depth, f.path),
+    )
+
+    selected: List[RepoFile] = []
+    for file in candidates:
+        if len(selected) >= max_files:
+            break
+        if file.size <= budget:
+            selected.append(file)
+            budget -= file.size
+    return readme, selected
+
+
+def render_tree(repo: str, paths: List[Tuple[str, bool]]) -> str:
+    """Indented directory listing; contents of skipped directories are elided."""
+    lines = ["Directory structure:", f"{repo}/"]
+    for path, is_dir in sorted(paths, key=lambda p: p[0].split("/")):
+        parts = path.split("/")
+        if any(part.lower() in _SKIP_DIRS for part in parts[:-1]):
+            continue
+        if len(lines) >= MAX_TREE_LINES:
+            lines.append("    ... (tree truncated)")
+            break
+        lines.append("    " * len(parts) + parts[-1] + ("/" if is_dir else ""))
+    return "\n".join(lines)
+
+
+def _file_block(path: str, text: str) -> str:
+    rule = "=" * 48
+    return f"{rule}\nFILE: {path}\n{rule}\n{text.rstrip()}\n"
+
+
+class RepoIngestCache(DocumentCache):
+    """Ingestion results as gzip-compressed JSON, memory LRU in front."""
+
+    suffix = ".json.gz"
+
+    def _encode(self, text: str) -> bytes:
+        return gzip.compress(text.encode("utf-8"))
+
+    def _decode(self, data: bytes) -> str:
+        return gzip.decompress(data).decode("utf-8")
+
+
+class RepoIngestor:
+    def __init__(
+        self,
+        client: GitHubClient = github_client,
+        cache: Optional[RepoIngestCache] = None,
+        mode: str = github_ingest_mode,
+        max_bytes: int = github_ingest_max_bytes,
+        max_files: int = github_ingest_max_files,
+        timeout: float = github_ingest_timeout,
+    ) -> None:
+        self.client = client
+        self.cache = cache
+        self.mode = mode if mode in ("budgeted", "full") else "budgeted"
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.timeout = timeout
+        self._flights = SingleFlight("repo_ingest")
+        self.budgeted_runs = 0
+        self.full_runs = 0
+        self.failures = 0
+
+    def cache_key(self, owner: str, repo: str, commit: str) -> str:
+        name = f"{owner}/{repo}@{commit}".lower()
+        return hashlib.sha256(
+            f"{name}:{self.mode}:{self.max_bytes}:{self.max_files}".encode("utf-8")
+        ).hexdigest()
+
+    async def resolve_commit(self, owner: str, repo: str) -> Optional[str]:
+        """SHA of the default branch head, or None if it can't be resolved."""
+        try:
+            response = await self.client.get(f"/repos/{owner}/{repo}")
+            if not response.ok:
+                return None
+            branch = response.data.get("default_branch") or "main"
+            response = await self.client.get(f"/repos/{owner}/{repo}/branches/{branch}")
+            return response.data["commit"]["sha"] if response.ok else None
+
+        except Exception as e:
+            logger.info("Could not resolve commit of %s/%s: %s", owner, repo, e)
+            return None
+
+    async def ingest(
+        self, owner: str, repo: str, url: str
+    ) -> Optional[IngestedContent]:
+        """Ingest ``owner/repo`` within the budget; None if unavailable."""
+        commit = await self.resolve_commit(owner, repo)
+        if commit is None:
+            # Without a commit there is no stable cache key (or API access).
+            return await self._ingest_full(url) if _HAS_GITINGEST else None
+
+        key = self.cache_key(owner, repo, commit)
+        return await self._flights.do(
+            key, self._cached_ingest, key, owner, repo, commit, url
+        )
+
+    async def _cached_ingest(
+        self, key: str, owner: str, repo: str, commit: str, url: str
+    ) -> Optional[IngestedContent]:
+        if self.cache is not None:
+            cached = await run_blocking(self.cache.get, key)
+            if cached is not None:
+                try:
+                    return IngestedContent.model_validate_json(cached)
+                except ValueError:
+                    pass
+
+        ingested = await self._ingest(owner, repo, commit, url)
+        if ingested is not None and self.cache is not None:
+            await run_blocking(self.cache.set, key, ingested.model_dump_json())
+        return ingested
+
+    async def _ingest(
+        self, owner: str, repo: str, commit: str, url: str
+    ) -> Optional[IngestedContent]:
+        if self.mode == "full" and _HAS_GITINGEST:
+            ingested = await self._ingest_full(url)
+            if ingested is not None:
+                ingested.commit = commit
+                return ingested
+
+        try:
+            return await asyncio.wait_for(
+                self._ingest_budgeted(owner, repo, commit), self.timeout
+            )
+
+        except Exception as e:
+            logger.info("Budgeted ingestion of %s/%s failed: %s", owner, repo, e)
+            if self.mode != "full" and _HAS_GITINGEST:
+                ingested = await self._ingest_full(url)
+                if ingested is not None:
+                    ingested.commit = commit
+                return ingested
+            self.failures += 1
+            return None
+
+    async def _ingest_budgeted(
+        self, owner: str, repo: str, commit: str
+    ) -> IngestedContent:
+        self.budgeted_runs += 1
+        response = await self.client.get(
+            f"/repos/{owner}/{repo}/git/trees/{commit}", params={"recursive": 1}
+        )
+        if not response.ok:
+            raise RuntimeError(f"Tree request failed: {response.status_code}")
+
+        entries = response.data.get("tree", [])
+        files = [
+            RepoFile(entry["path"], int(entry.get("size") or 0))
+            for entry in entries
+            if entry.get("type") == "blob"
+        ]
+        readme, selected = select_files(files, self.max_bytes, self.max_files)
+        ordered = ([readme] if readme else []) + selected
+
+        slots = asyncio.Semaphore(FILE_FETCH_CONCURRENCY)
+
+        readme_limit = self.max_bytes // 4
+
+        async def _fetch(file: RepoFile) -> Optional[str]:
+            # Only the budgeted prefix of an oversized README is downloaded.
+            headers = (
+                {"Range": f"bytes=0-{readme_limit - 1}"}
+                if file is readme and file.size > readme_limit
+                else None
+            )
+            async with slots:
+                try:
+                    file_response = await http.get(
+                        f"{RAW_CONTENT_BASE}/{owner}/{repo}/{commit}/{file.path}",
+                        headers=headers,
+                        timeout=10,
+                    )
+                except Exception:
+                    return None
+            if (
+                file_response.status_code not in (200, 206)
+                or b"\x00" in file_response.content
+            ):
+                return None
+            return file_response.content.decode("utf-8", errors="replace")
+
+        texts = await asyncio.gather(*(_fetch(file) for file in ordered))
+
+        blocks, included, used = [], [], 0
+        for file, text in zip(ordered, texts):
+            if text is None:
+                continue
+            if file is readme:
+                text = text[:readme_limit]
+            blocks.append(_file_block(file.path, text))
+            included.append(file.path)
+            used += len(text)
+
+        summary = (
+            f"Repository: {owner}/{repo}\n"
+            f"Commit: {commit}\n"
+            f"Files analyzed: {len(included)} of {len(files)}\n"
+            f"Content: {used} characters (budget {self.max_bytes})"
+            + ("\nTree: truncated by GitHub" if response.data.get("truncated") else "")
+        )
+        tree = render_tree(
+            repo,
+            [(entry["path"], entry.get("type") == "tree") for entry in entries],
+        )
+        return IngestedContent(
+            tree=tree,
+            summary=summary,
+            content="\n".join(blocks),
+            commit=commit,
+            files=included,
+            mode="budgeted",
+        )
+
+    async def _ingest_full(self, url: str) -> Optional[IngestedContent]:
+        """Ingest the repository with gitingest, truncated to the byte budget."""
+        if not _HAS_GITINGEST:
+            return None
+        self.full_runs += 1
+
+        async def _run_ingest() -> Tuple[str, str, str]:
+            if _HAS_GITINGEST_ASYNC:
+                return await _gitingest_async(url)  # summary, tree, content
+            # Run sync version in thread to avoid blocking event loop
+            return await run_blocking(_gitingest_sync, url)  # type: ignore
+
+        try:
+            summary, tree, content = await asyncio.wait_for(
+                _run_ingest(), timeout=self.timeout
+            )
+
+        except Exception as e:  # Broad except OK for optional feature
+            logger.info("gitingest skipped for %s: %s", url, e)
+            self.failures += 1
+            return None
+
+        if len(content) > self.max_bytes:
+            content = (
+                content[: self.max_bytes] + "\n...\n[repository content truncated]"
+            )
+        return IngestedContent(
+            tree=tree[: self.max_bytes],
+            summary=summary,
+            content=content,
+            mode="full",
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            "mode": self.mode,
+            "budgeted_runs": self.budgeted_runs,
+            "full_runs": self.full_runs,
+            "failures": self.failures,
+            "coalesced": self._flights.followers,
+        }
+        if self.cache is not None:
+            stats.update(self.cache.stats())
+        return stats
+
+
+repo_ingestor = RepoIngestor(
+    cache=RepoIngestCache(
+        cache_dir=github_ingest_cache_dir,
+        memory_entries=github_ingest_cache_memory_entries,
+        disk_max_bytes=github_ingest_cache_disk_max_bytes,
+    )
+)
+
+register_cache_stats("repo_ingest", repo_ingestor.stats)
+
+
+__all__ = [
+    "IngestedContent",
+    "RepoFile",
+    "RepoIngestCache",
+    "RepoIngestor",
+    "relevance",
+    "render_tree",
+    "repo_ingestor",
+    "select_files",
+]
@@ -1,14 +1,29 @@
-import requests
+from app.core import http
+from app.core.singleflight import web_flights
 
 
-def return_markdown(url: str, timeout: int = 5000) -> str:
-    """Fetches the markdown content from a given URL using the Jina AI service."""
+async def return_markdown(url: str, timeout: float = 30.0) -> str:
+    """Fetches the markdown content from a given URL using the Jina AI service.
+
+    ``timeout`` is the read timeout in seconds. Concurrent requests for the
+    same URL and timeout share one fetch; a shorter timeout may fail where a
+    longer one succeeds, so they are not mixed.
+    """
 
     if not url:
         return ""
 
+    return await web_flights.do(
+        ("markdown", url.strip(), timeout),
+        _fetch_markdown,
+        url,
+        timeout,
+    )
+
+
+async def _fetch_markdown(url: str, timeout: float) -> str:
     try:
-        res = requests.get(
+        res = await http.get(
             "https://r.jina.ai/" + url.lstrip("/"),
             timeout=timeout,
         )
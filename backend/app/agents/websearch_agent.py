@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-import random
-import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import requests
 from tavily import TavilyClient
 from dotenv import load_dotenv
 
 from app.agents.web_content_agent import return_markdown
+from app.core.concurrency import run_blocking
+from app.core.singleflight import flight_key, web_flights
+from app.core.config import (
+    web_fetch_concurrency,
+    web_fetch_min_chars,
+    web_fetch_timeout,
+)
 
 
 load_dotenv()
@@ -18,47 +23,6 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-REQUEST_TIMEOUT = 15
-MAX_RETRIES = 2
-BACKOFF_BASE = 0.7
-
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_4) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.4 Safari/605.1.15",
-    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
-]
-
-
-def _headers() -> Dict[str, str]:
-    return {
-        "User-Agent": random.choice(USER_AGENTS),
-    }
-
-
-def _get(url: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
-    last_exc: Optional[Exception] = None
-    for attempt in range(MAX_RETRIES + 1):
-        try:
-            resp = requests.get(
-                url,
-                params=params,
-                headers=_headers(),
-                timeout=REQUEST_TIMEOUT,
-            )
-
-            if resp.status_code in (429, 500, 502, 503, 504):
-                raise requests.HTTPError(f"Transient HTTP {resp.status_code} on {url}")
-
-            return resp
-
-        except Exception as e:
-            last_exc = e
-            time.sleep(BACKOFF_BASE * (2**attempt))
-
-    assert last_exc is not None
-    raise last_exc
-
-
 # Tavily search client
 _TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 _tavily: Optional[TavilyClient] = (
@@ -96,45 +60,102 @@ def search_and_get_urls(
         return []
 
 
-def get_cleaned_texts(urls: List[str]) -> List[Dict[str, str]]:
-    texts: List[Dict[str, str]] = []
-    for u in urls:
-        md = return_markdown(u)
-        if md and md.strip():
-            texts.append(
-                {
-                    "url": u,
-                    "md_body_content": md,
-                }
-            )
-    return texts
+async def asearch_and_get_urls(
+    query: str, num_results: int = 10, lang: str = "en"
+) -> List[str]:
+    """Tavily search without blocking the event loop.
+
+    Identical concurrent searches share one Tavily call.
+    """
+    return await web_flights.do(
+        ("search", flight_key(query, num_results, lang)),
+        run_blocking,
+        search_and_get_urls,
+        query,
+        num_results,
+        lang,
+    )
 
 
-def web_search_pipeline(query: str, max_results: int = 10) -> List[Dict[str, str]]:
-    urls = search_and_get_urls(
+async def get_cleaned_texts(
+    urls: List[str],
+    first_k: Optional[int] = None,
+    max_concurrency: int = web_fetch_concurrency,
+    per_url_timeout: float = web_fetch_timeout,
+    min_chars: int = web_fetch_min_chars,
+) -> List[Dict[str, str]]:
+    """Fetch the markdown of ``urls`` concurrently.
+
+    At most ``max_concurrency`` fetches run at once and each gets
+    ``per_url_timeout`` seconds. Pages shorter than ``min_chars`` characters
+    are dropped. With ``first_k``, fetching stops as soon as that many pages
+    are in and the stragglers are cancelled. Results keep the order of
+    ``urls``.
+    """
+    if not urls:
+        return []
+
+    slots = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _fetch(index: int, url: str) -> Tuple[int, str, str]:
+        async with slots:
+            try:
+                md = await asyncio.wait_for(return_markdown(url), per_url_timeout)
+            except asyncio.TimeoutError:
+                logger.info(f"[websearch] fetch timed out: {url}")
+                md = ""
+        return index, url, md
+
+    tasks = [asyncio.create_task(_fetch(i, u)) for i, u in enumerate(urls)]
+    gathered: List[Tuple[int, str, str]] = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, url, md = await next_done
+            if md and len(md.strip()) >= max(1, min_chars):
+                gathered.append((index, url, md))
+                if first_k and len(gathered) >= first_k:
+                    break
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return [
+        {
+            "url": url,
+            "md_body_content": md,
+        }
+        for _, url, md in sorted(gathered)
+    ]
+
+
+async def web_search_pipeline(
+    query: str, max_results: int = 10
+) -> List[Dict[str, str]]:
+    urls = await asearch_and_get_urls(
         query,
         num_results=max_results,
     )
     if not urls:
         return []
 
-    return get_cleaned_texts(urls)
+    return await get_cleaned_texts(urls)
 
 
 # Agents (same external API)
 from app.core.llm import llm
-import asyncio
+from app.core.model_router import routed_llm
+from app.core.singleflight import coalesced_ainvoke
+
+summary_llm = routed_llm("extraction", "web_research_summary")
+post_llm = routed_llm("creative", "web_research_post")
 
 
 class WebSearchAgent:
     def __init__(self, max_results: int = 10):
         self.max_results = max_results
 
-    def search_web(
-        self, query: str, max_results: Optional[int] = None
-    ) -> List[Dict[str, str]]:
-        max_r = max_results or self.max_results
-        urls = search_and_get_urls(query, num_results=max_r)
+    @staticmethod
+    def _results(urls: List[str]) -> List[Dict[str, str]]:
         return [
             {
                 "title": u,
@@ -144,17 +165,32 @@ class WebSearchAgent:
             for u in urls
         ]
 
-    def extract_page_content(self, url: str) -> str:
-        return return_markdown(url)
+    def search_web(
+        self, query: str, max_results: Optional[int] = None
+    ) -> List[Dict[str, str]]:
+        max_r = max_results or self.max_results
+        return self._results(search_and_get_urls(query, num_results=max_r))
+
+    async def asearch_web(
+        self, query: str, max_results: Optional[int] = None
+    ) -> List[Dict[str, str]]:
+        # Shares one Tavily call with identical concurrent searches.
+        max_r = max_results or self.max_results
+        return self._results(await asearch_and_get_urls(query, num_results=max_r))
+
+    async def extract_page_content(self, url: str) -> str:
+        return await return_markdown(url)
 
     async def research_topic(self, topic: str, context: str = "") -> Dict[str, Any]:
         query = f"{topic} trends insights latest news" if topic else context
-        results = self.search_web(query, max_results=3)
-        contents: List[str] = []
+        results = await self.asearch_web(query, max_results=3)
 
-        for r in results[:2]:
-            if r["url"].startswith("http"):
-                contents.append(self.extract_page_content(r["url"]))
+        # Fetch every result at once and keep the first two that answer.
+        pages = await get_cleaned_texts(
+            [r["url"] for r in results if r["url"].startswith("http")],
+            first_k=2,
+        )
+        contents: List[str] = [page["md_body_content"] for page in pages]
 
         summary = await self._summarize_research(
             topic,
@@ -195,7 +231,7 @@ class WebSearchAgent:
                 f"Summarize key insights, trends, and takeaways about '{topic}' for a professional LinkedIn post. "
                 f"Base it ONLY on the following material. Be concise (2-3 sentences).\n\n{research_text}\nSummary:"
             )
-            resp = await llm.ainvoke(prompt)
+            resp = await coalesced_ainvoke(summary_llm, prompt)
             return str(getattr(resp, "content", resp)).strip()
         except Exception as e:
             logger.warning(f"[websearch] summarization failed: {e}")
@@ -225,7 +261,7 @@ class LinkedInResearcher(WebSearchAgent):
                 "Avoid hashtags except at most 2 at end if they add clarity. Maintain professional, optimistic tone.\n\n"
                 f"SUMMARY:\n{summary}\n\nPOST:"
             )
-            resp = await llm.ainvoke(prompt)
+            resp = await coalesced_ainvoke(post_llm, prompt)
             research["linkedin_post"] = str(getattr(resp, "content", resp)).strip()
             return research
 
@@ -241,7 +277,7 @@ async def main() -> None:
     agent = WebSearchAgent(max_results=3)
     query = "Python typing improvements 2024"
     print(f"Searching for: {query}")
-    results = agent.search_web(query, max_results=3)
+    results = await agent.asearch_web(query, max_results=3)
     print("Search results:")
     for i, r in enumerate(results, 1):
         print(f"{i}. {r['url']}")
@@ -249,7 +285,7 @@ async def main() -> None:
     if results:
         first_url = results[0]["url"]
         print(f"\nFetching content for first result: {first_url}")
-        snippet = agent.extract_page_content(first_url)
+        snippet = await agent.extract_page_content(first_url)
         print("Content snippet:")
         print(snippet[:500] + ("..." if len(snippet) > 500 else ""))
 
@@ -263,8 +299,6 @@ async def main() -> None:
 
 if __name__ == "__main__":
     try:
-        import asyncio
-
         asyncio.run(main())
     except KeyboardInterrupt:
         pass
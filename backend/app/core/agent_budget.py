@@ -0,0 +1,240 @@
+"""Per-request budgets for tool-calling LangGraph agents.
+
+The ATS evaluator and the resume generator loop ``agent -> tools -> agent``
+until the model stops asking for tools. Without a cap, one request can run
+any number of Tavily searches and LLM turns. Each run now carries an
+:class:`AgentBudget` (max agent steps, max tool calls, a wall-clock deadline
+and a token ceiling, defaulting to the ``AGENT_*`` settings). Usage is
+tracked in :class:`AgentState`; once a budget runs out the graph routes to a
+final-answer node that calls the model without tools, and the name of the
+exhausted budget is recorded in ``budget_exhausted``.
+
+Budgets are passed per run through the graph config::
+
+    await graph.ainvoke(inputs, config=budget_config(AgentBudget(max_tool_calls=2)))
+
+Overrides are for server-side callers only (``evaluate_ats(budget=...)``,
+``run_resume_pipeline(budget=...)``); API requests always run with the
+``AGENT_*`` defaults so clients cannot raise their own limits.
+
+If the forced final answer itself times out, the last answer the model gave
+is returned instead and the run is marked ``budget_exhausted="deadline"``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, MessagesState
+
+from app.core.concurrency import ainvoke
+from app.core.config import (
+    agent_deadline,
+    agent_final_answer_timeout,
+    agent_max_steps,
+    agent_max_tokens,
+    agent_max_tool_calls,
+)
+
+FINAL_ANSWER_NODE = "final_answer"
+
+FINAL_ANSWER_INSTRUCTION = (
+    "The research budget for this request is exhausted ({reason}). Do not call "
+    "any more tools. Answer now using only the information gathered so far, in "
+    "exactly the output format requested above."
+)
+
+
+@dataclass
+class AgentBudget:
+    max_steps: int = agent_max_steps
+    max_tool_calls: int = agent_max_tool_calls
+    # Seconds from the first agent step.
+    deadline: float = agent_deadline
+    max_tokens: int = agent_max_tokens
+    final_answer_timeout: float = agent_final_answer_timeout
+
+
+class AgentState(MessagesState, total=False):
+    # Per-request system prompt, so one compiled graph serves every request.
+    system_messages: List[BaseMessage]
+    steps: int
+    tool_calls: int
+    tokens: int
+    deadline_at: float
+    budget_exhausted: Optional[str]
+
+
+def budget_config(
+    budget: Optional[AgentBudget] = None, config: Optional[RunnableConfig] = None
+) -> RunnableConfig:
+    """Return ``config`` with ``budget`` set for the run."""
+    config = dict(config or {})
+    config["configurable"] = {
+        **config.get("configurable", {}),
+        "agent_budget": budget or AgentBudget(),
+    }
+    return config  # type: ignore[return-value]
+
+
+def get_budget(config: Optional[RunnableConfig]) -> AgentBudget:
+    configurable = (config or {}).get("configurable") or {}
+    return configurable.get("agent_budget") or AgentBudget()
+
+
+def exhausted_budget(state: AgentState, budget: AgentBudget) -> Optional[str]:
+    """Name of the budget that is used up, or None."""
+    deadline_at = state.get("deadline_at")
+    if deadline_at is not None and time.monotonic() >= deadline_at:
+        return "deadline"
+    if state.get("tokens", 0) >= budget.max_tokens:
+        return "tokens"
+    if state.get("steps", 0) >= budget.max_steps:
+        return "steps"
+    if state.get("tool_calls", 0) > budget.max_tool_calls:
+        return "tool_calls"
+    return None
+
+
+def _token_usage(response: Any, prompt: List[BaseMessage]) -> int:
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+    # No usage reported: roughly four characters per token.
+    chars = sum(len(str(m.content)) for m in prompt) + len(str(response.content))
+    return chars // 4
+
+
+def _system_messages(
+    system_messages: Optional[List[BaseMessage]], state: AgentState
+) -> List[BaseMessage]:
+    if system_messages is not None:
+        return list(system_messages)
+    return list(state.get("system_messages") or [])
+
+
+async def agent_step(
+    llm_with_tools: Any,
+    llm: Any,
+    system_messages: Optional[List[BaseMessage]],
+    state: AgentState,
+    config: Optional[RunnableConfig] = None,
+) -> Dict[str, Any]:
+    """One budgeted agent turn; answers without tools if the budget is spent.
+
+    ``system_messages`` of None means the prompt is taken from the state.
+    """
+    system_messages = _system_messages(system_messages, state)
+    budget = get_budget(config)
+    deadline_at = state.get("deadline_at") or time.monotonic() + budget.deadline
+    state = {**state, "deadline_at": deadline_at}  # type: ignore[assignment]
+
+    reason = exhausted_budget(state, budget)
+    if reason is not None:
+        return await final_answer_step(llm, system_messages, state, config, reason)
+
+    prompt = [*system_messages, *state["messages"]]
+    try:
+        response = await asyncio.wait_for(
+            ainvoke(llm_with_tools, prompt),
+            max(0.0, deadline_at - time.monotonic()),
+        )
+
+    except asyncio.TimeoutError:
+        return await final_answer_step(llm, system_messages, state, config, "deadline")
+
+    # Tool calls are counted when requested; an over-budget request never runs.
+    requested = len(getattr(response, "tool_calls", None) or [])
+    return {
+        "messages": [response],
+        "steps": state.get("steps", 0) + 1,
+        "tool_calls": state.get("tool_calls", 0) + requested,
+        "tokens": state.get("tokens", 0) + _token_usage(response, prompt),
+        "deadline_at": deadline_at,
+    }
+
+
+async def final_answer_step(
+    llm: Any,
+    system_messages: Optional[List[BaseMessage]],
+    state: AgentState,
+    config: Optional[RunnableConfig] = None,
+    reason: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Force a final answer from ``llm`` (which must not have tools bound)."""
+    system_messages = _system_messages(system_messages, state)
+    budget = get_budget(config)
+    reason = reason or exhausted_budget(state, budget) or "tool_calls"
+
+    messages = list(state["messages"])
+    tool_calls = state.get("tool_calls", 0)
+    # A trailing tool request would never get its results; drop it.
+    if messages and isinstance(messages[-1], AIMessage) and messages[-1].tool_calls:
+        tool_calls -= len(messages.pop().tool_calls)
+    prompt = [
+        *system_messages,
+        *messages,
+        HumanMessage(content=FINAL_ANSWER_INSTRUCTION.format(reason=reason)),
+    ]
+
+    try:
+        response = await asyncio.wait_for(
+            ainvoke(llm, prompt), budget.final_answer_timeout
+        )
+
+    except asyncio.TimeoutError:
+        last = next(
+            (m for m in reversed(messages) if isinstance(m, AIMessage) and m.content),
+            None,
+        )
+        return {
+            "messages": [AIMessage(content=last.content if last else "")],
+            "tool_calls": max(0, tool_calls),
+            "budget_exhausted": "deadline",
+        }
+
+    return {
+        "messages": [response],
+        "tool_calls": max(0, tool_calls),
+        "tokens": state.get("tokens", 0) + _token_usage(response, prompt),
+        "budget_exhausted": reason,
+    }
+
+
+def route_tools(state: AgentState, config: Optional[RunnableConfig] = None) -> str:
+    """Like ``tools_condition``, but routes to the final answer over budget."""
+    messages = state["messages"]
+    last = messages[-1] if messages else None
+    if not getattr(last, "tool_calls", None):
+        return END
+
+    if exhausted_budget(state, get_budget(config)):
+        return FINAL_ANSWER_NODE
+    return "tools"
+
+
+def budget_report(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Usage summary of a finished run."""
+    return {
+        "steps": state.get("steps", 0),
+        "tool_calls": state.get("tool_calls", 0),
+        "tokens": state.get("tokens", 0),
+        "budget_exhausted": state.get("budget_exhausted"),
+    }
+
+
+__all__ = [
+    "FINAL_ANSWER_NODE",
+    "AgentBudget",
+    "AgentState",
+    "agent_step",
+    "budget_config",
+    "budget_report",
+    "exhausted_budget",
+    "final_answer_step",
+    "get_budget",
+    "route_tools",
+]
@@ -0,0 +1,154 @@
+"""In-process cache primitives shared by the backend's caching layers.
+
+:class:`LRUCache` is a thread-safe LRU with optional entry, byte and TTL
+limits. Caches register a stats provider with :func:`register_cache_stats`
+so ``GET /cache/stats`` can report hit/miss counters for every layer.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = asdict(self)
+        lookups = self.hits + self.misses
+        data["hit_rate"] = round(self.hits / lookups, 4) if lookups else 0.0
+        return data
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe LRU cache with optional entry, size and TTL bounds.
+
+    Args:
+        max_entries: maximum number of entries kept, ``None`` for unbounded.
+        max_bytes: maximum total size as reported by ``sizeof``.
+        ttl: seconds after which an entry expires, ``None`` to never expire.
+        sizeof: callable returning the size of a value; defaults to ``len``.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof or (lambda value: len(value))  # type: ignore[arg-type]
+        self._data: "OrderedDict[Hashable, Tuple[V, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.stats.misses += 1
+                return default
+
+            value, expires_at, _ = item  # type: ignore[misc]
+            if expires_at and expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + ttl if ttl else 0.0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            self._evict()
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            item = self._data.get(key)
+            return bool(item) and not (item[1] and item[1] <= time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def stats_dict(self) -> Dict[str, Any]:
+        data = self.stats.as_dict()
+        data["entries"] = len(self._data)
+        if self.max_bytes is not None:
+            data["bytes"] = self._bytes
+        return data
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        while self._data and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+
+_stats_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_cache_stats(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """Expose a cache's counters under ``name`` in :func:`collect_cache_stats`."""
+    _stats_providers[name] = provider
+
+
+def collect_cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: provider() for name, provider in sorted(_stats_providers.items())}
+
+
+__all__ = [
+    "CacheStats",
+    "LRUCache",
+    "register_cache_stats",
+    "collect_cache_stats",
+]
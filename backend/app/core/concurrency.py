@@ -0,0 +1,114 @@
+"""Shared async execution layer for LLM calls and blocking work.
+
+Services await LLM runnables through :func:`ainvoke` so a single worker can
+overlap many requests while capping how many model calls it keeps in flight.
+Blocking helpers (PyMuPDF parsing, ``requests`` based fetches, sync SDKs) go
+through :func:`run_blocking`, which uses a bounded thread pool instead of the
+event loop. CPU-heavy batch work can use :func:`run_in_process`.
+Local ATS scoring goes through :func:`run_scoring`, which caps how many
+pool threads scoring may hold so a large batch cannot starve parsing.
+"""
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+
+from app.core.config import (
+    blocking_max_workers,
+    llm_max_concurrency,
+    process_pool_workers,
+    scoring_max_concurrency,
+)
+
+T = TypeVar("T")
+
+_llm_semaphore = asyncio.Semaphore(llm_max_concurrency)
+_scoring_semaphore = asyncio.Semaphore(max(1, scoring_max_concurrency))
+_blocking_executor = ThreadPoolExecutor(
+    max_workers=blocking_max_workers,
+    thread_name_prefix="talentsync-blocking",
+)
+
+
+async def ainvoke(runnable: Any, inputs: Any, **kwargs: Any) -> Any:
+    """Await ``runnable.ainvoke(inputs)`` while holding a per-worker LLM slot."""
+    async with _llm_semaphore:
+        return await runnable.ainvoke(inputs, **kwargs)
+
+
+async def astream(runnable: Any, inputs: Any, **kwargs: Any) -> AsyncIterator[Any]:
+    """Iterate ``runnable.astream(inputs)`` while holding a per-worker LLM slot."""
+    async with _llm_semaphore:
+        async for chunk in runnable.astream(inputs, **kwargs):
+            yield chunk
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the shared thread pool and await its result.
+
+    The caller's context variables are copied into the worker thread so
+    request-scoped state stays visible to the callable.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_blocking_executor, call)
+
+
+async def run_scoring(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """:func:`run_blocking` for local scoring, holding a per-worker scoring slot."""
+    async with _scoring_semaphore:
+        return await run_blocking(func, *args, **kwargs)
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Spawn rather than fork: the parent runs threads (uvicorn, the
+            # blocking pool) that must not be duplicated mid-flight.
+            _process_pool = ProcessPoolExecutor(
+                max_workers=process_pool_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+async def run_in_process(func: Callable[..., T], *args: Any) -> T:
+    """Run a picklable, module-level callable on the shared process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_process_pool(), func, *args)
+
+
+def shutdown_executors() -> None:
+    """Release the worker pools; called when the application shuts down."""
+    global _process_pool
+    _blocking_executor.shutdown(wait=False, cancel_futures=True)
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def llm_slots_available() -> int:
+    """Return how many LLM slots are currently free in this worker."""
+    return _llm_semaphore._value
+
+
+__all__ = [
+    "ainvoke",
+    "astream",
+    "run_blocking",
+    "run_in_process",
+    "run_scoring",
+    "shutdown_executors",
+    "llm_slots_available",
+]
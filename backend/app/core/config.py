@@ -4,3 +4,180 @@ from dotenv import load_dotenv
 load_dotenv()
 
 google_api_key = os.getenv("GOOGLE_API_KEY")
+
+# Per-worker concurrency limits. Each uvicorn worker keeps at most
+# ``llm_max_concurrency`` model calls in flight and runs blocking work
+# (document parsing, legacy SDK calls) on ``blocking_max_workers`` threads,
+# of which local ATS scoring may hold at most ``scoring_max_concurrency``.
+llm_max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+blocking_max_workers = int(os.getenv("BLOCKING_MAX_WORKERS", "8"))
+scoring_max_concurrency = int(os.getenv("SCORING_MAX_CONCURRENCY", "2"))
+
+# Local storage root, shared with the services' temporary upload files.
+uploads_dir = os.getenv(
+    "UPLOADS_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "../../uploads")),
+)
+
+# Content-addressed cache of converted documents (see app/services/document_cache.py).
+document_cache_dir = os.getenv(
+    "DOCUMENT_CACHE_DIR",
+    os.path.join(uploads_dir, "cache", "documents"),
+)
+document_cache_memory_entries = int(os.getenv("DOCUMENT_CACHE_MEMORY_ENTRIES", "256"))
+document_cache_disk_max_bytes = int(
+    os.getenv("DOCUMENT_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024))
+)
+
+# Deterministic LLM response cache (see app/core/llm_cache.py).
+# LLM_CACHE_BACKEND is one of "memory", "sqlite" or "none".
+llm_cache_backend = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+llm_cache_ttl = float(os.getenv("LLM_CACHE_TTL", str(24 * 60 * 60)))
+llm_cache_max_bytes = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+llm_cache_path = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(uploads_dir, "cache", "llm_responses.sqlite3"),
+)
+
+# Task-aware model routing (see app/core/model_router.py).
+model_routes_path = os.getenv(
+    "MODEL_ROUTES_PATH",
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "../data/model_routes.json")
+    ),
+)
+# Latency samples kept per model / task class for the p50/p95 in cache stats.
+model_latency_samples = int(os.getenv("MODEL_LATENCY_SAMPLES", "512"))
+
+# Resume sessions: parsed/analysed resumes reused across features.
+resume_session_ttl = float(os.getenv("RESUME_SESSION_TTL", str(2 * 60 * 60)))
+resume_session_max_entries = int(os.getenv("RESUME_SESSION_MAX_ENTRIES", "1000"))
+
+# Bulk resume ingestion (see app/services/bulk_resume.py).
+process_pool_workers = int(os.getenv("PROCESS_POOL_WORKERS", str(os.cpu_count() or 2)))
+bulk_max_files = int(os.getenv("BULK_MAX_FILES", "500"))
+bulk_max_file_bytes = int(os.getenv("BULK_MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+bulk_max_total_bytes = int(os.getenv("BULK_MAX_TOTAL_BYTES", str(512 * 1024 * 1024)))
+bulk_llm_concurrency = int(os.getenv("BULK_LLM_CONCURRENCY", "8"))
+# fast=true resumes are classified in batches of this size as they parse.
+bulk_classify_batch_size = int(os.getenv("BULK_CLASSIFY_BATCH_SIZE", "32"))
+
+# Local embedding engine for semantic JD/resume scoring (see app/services/semantic_scorer.py).
+embedding_model_name = os.getenv(
+    "EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
+)
+embedding_batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+embedding_cache_entries = int(os.getenv("EMBEDDING_CACHE_ENTRIES", "20000"))
+# Seconds before retrying a model that failed to load (bad name, download error).
+embedding_retry_interval = float(os.getenv("EMBEDDING_RETRY_INTERVAL", "300"))
+semantic_chunk_max_chars = int(os.getenv("SEMANTIC_CHUNK_MAX_CHARS", "1200"))
+# Feed the semantic score into the ATS evaluator prompt when the model is available.
+ats_semantic_hint = os.getenv("ATS_SEMANTIC_HINT", "true").lower() in ("1", "true")
+
+# Batch JD-vs-many-resumes scoring (/ats/score-batch).
+ats_batch_max_resumes = int(os.getenv("ATS_BATCH_MAX_RESUMES", "500"))
+ats_batch_chunk_size = int(os.getenv("ATS_BATCH_CHUNK_SIZE", "25"))
+
+# Reference distribution of composite ATS scores behind ``percentile`` and
+# ``industry_average``. The defaults are a heuristic, not measured data;
+# calibrate them against real scores where available.
+ats_industry_average = float(os.getenv("ATS_INDUSTRY_AVERAGE", "62"))
+ats_industry_stddev = float(os.getenv("ATS_INDUSTRY_STDDEV", "15"))
+
+# One resume vs many JDs (/ats/match-jobs): local ranking, LLM evaluation of the top-k.
+job_match_max_jobs = int(os.getenv("JOB_MATCH_MAX_JOBS", "100"))
+job_match_top_k = int(os.getenv("JOB_MATCH_TOP_K", "3"))
+# Most full evaluations one request may ask for; each one is an LLM agent run.
+job_match_max_top_k = int(os.getenv("JOB_MATCH_MAX_TOP_K", "10"))
+job_match_llm_concurrency = int(os.getenv("JOB_MATCH_LLM_CONCURRENCY", "2"))
+job_match_resume_cache_entries = int(os.getenv("JOB_MATCH_RESUME_CACHE_ENTRIES", "256"))
+
+# Recruiter candidate search index (see app/services/candidate_index.py).
+candidate_index_enabled = os.getenv("CANDIDATE_INDEX_ENABLED", "true").lower() in (
+    "1",
+    "true",
+)
+candidate_index_dir = os.getenv(
+    "CANDIDATE_INDEX_DIR",
+    os.path.join(uploads_dir, "index", "candidates"),
+)
+candidate_index_hnsw_m = int(os.getenv("CANDIDATE_INDEX_HNSW_M", "32"))
+candidate_index_ef_search = int(os.getenv("CANDIDATE_INDEX_EF_SEARCH", "128"))
+# Seconds between FAISS snapshots; SQLite is written on every add.
+candidate_index_flush_interval = float(
+    os.getenv("CANDIDATE_INDEX_FLUSH_INTERVAL", "30")
+)
+
+# Shared outbound HTTP client (see app/core/http.py). Timeouts are in seconds.
+http_connect_timeout = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+http_read_timeout = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+http_max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+http_max_keepalive = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+http_per_host_limit = int(os.getenv("HTTP_PER_HOST_LIMIT", "8"))
+http_max_in_flight = int(os.getenv("HTTP_MAX_IN_FLIGHT", "64"))
+http_max_retries = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+http_backoff_base = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+
+# Web research fan-out (see app/agents/websearch_agent.py).
+web_fetch_concurrency = int(os.getenv("WEB_FETCH_CONCURRENCY", "4"))
+web_fetch_timeout = float(os.getenv("WEB_FETCH_TIMEOUT", "12"))
+# Fetched pages shorter than this are dropped from web search results.
+web_fetch_min_chars = int(os.getenv("WEB_FETCH_MIN_CHARS", "200"))
+
+# Company website content fetched through r.jina.ai (see
+# app/services/company_content.py). Fresh entries are served for
+# COMPANY_CACHE_TTL, stale ones for another COMPANY_CACHE_STALE_TTL while a
+# background refresh runs. Definite failures (4xx, empty page) are remembered
+# for COMPANY_CACHE_NEGATIVE_TTL, transient ones (timeouts, connection errors,
+# 429/5xx) only for COMPANY_CACHE_TRANSIENT_TTL.
+company_cache_path = os.getenv(
+    "COMPANY_CACHE_PATH",
+    os.path.join(uploads_dir, "cache", "company_content.sqlite3"),
+)
+company_cache_ttl = float(os.getenv("COMPANY_CACHE_TTL", str(24 * 60 * 60)))
+company_cache_stale_ttl = float(
+    os.getenv("COMPANY_CACHE_STALE_TTL", str(7 * 24 * 60 * 60))
+)
+company_cache_negative_ttl = float(os.getenv("COMPANY_CACHE_NEGATIVE_TTL", "600"))
+company_cache_transient_ttl = float(os.getenv("COMPANY_CACHE_TRANSIENT_TTL", "30"))
+company_fetch_timeout = float(os.getenv("COMPANY_FETCH_TIMEOUT", "20"))
+company_fetch_concurrency = int(os.getenv("COMPANY_FETCH_CONCURRENCY", "4"))
+
+# Hiring assistant: concurrent LLM calls per request in "parallel" mode.
+hiring_answer_concurrency = int(os.getenv("HIRING_ANSWER_CONCURRENCY", "4"))
+
+# LinkedIn post generation: concurrent post drafts per request.
+linkedin_post_concurrency = int(os.getenv("LINKEDIN_POST_CONCURRENCY", "5"))
+
+# GitHub REST API (see app/agents/github_client.py). GITHUB_TOKEN is optional
+# and raises the rate limit from 60 to 5000 requests per hour.
+github_token = os.getenv("GITHUB_TOKEN") or None
+github_cache_ttl = float(os.getenv("GITHUB_CACHE_TTL", "300"))
+github_cache_max_bytes = int(os.getenv("GITHUB_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+github_rate_limit_max_wait = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "10"))
+
+# Repository ingestion for the GitHub agent (see app/agents/repo_ingest.py).
+# GITHUB_INGEST_MODE is "budgeted" (tree, README and the most relevant files
+# within GITHUB_INGEST_MAX_BYTES) or "full" (gitingest, truncated to the budget).
+github_ingest_mode = os.getenv("GITHUB_INGEST_MODE", "budgeted").lower()
+github_ingest_max_bytes = int(os.getenv("GITHUB_INGEST_MAX_BYTES", "64000"))
+github_ingest_max_files = int(os.getenv("GITHUB_INGEST_MAX_FILES", "20"))
+github_ingest_timeout = float(os.getenv("GITHUB_INGEST_TIMEOUT", "60"))
+github_ingest_cache_dir = os.getenv(
+    "GITHUB_INGEST_CACHE_DIR",
+    os.path.join(uploads_dir, "cache", "repositories"),
+)
+github_ingest_cache_memory_entries = int(
+    os.getenv("GITHUB_INGEST_CACHE_MEMORY_ENTRIES", "64")
+)
+github_ingest_cache_disk_max_bytes = int(
+    os.getenv("GITHUB_INGEST_CACHE_DISK_MAX_BYTES", str(128 * 1024 * 1024))
+)
+
+# Per-request budgets for tool-calling LangGraph agents (see app/core/agent_budget.py).
+# When one runs out the agent is forced to answer with what it has.
+agent_max_steps = int(os.getenv("AGENT_MAX_STEPS", "6"))
+agent_max_tool_calls = int(os.getenv("AGENT_MAX_TOOL_CALLS", "4"))
+agent_deadline = float(os.getenv("AGENT_DEADLINE", "60"))
+agent_max_tokens = int(os.getenv("AGENT_MAX_TOKENS", "60000"))
+agent_final_answer_timeout = float(os.getenv("AGENT_FINAL_ANSWER_TIMEOUT", "30"))
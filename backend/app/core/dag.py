@@ -0,0 +1,188 @@
+"""Dependency-aware async stage executor.
+
+A pipeline is declared as named stages, each with the stages it depends on.
+:meth:`StageGraph.run` starts every stage as soon as its dependencies have
+finished, so independent stages (research, repository analysis, separate LLM
+calls) overlap instead of running back to back.
+
+Each stage may have a timeout and a fallback. A stage that fails or times out
+resolves to its fallback and the rest of the graph carries on with that
+partial result; only stages marked ``required`` abort the run. Every run
+reports per-stage timings.
+"""
+
+import asyncio
+import contextlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+_NO_FALLBACK = object()
+
+
+class StageFailed(RuntimeError):
+    """Raised when a required stage fails or times out."""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+@dataclass
+class Stage:
+    """One unit of work.
+
+    ``func`` is awaited with one keyword argument per dependency, holding
+    that dependency's result. ``fallback`` is used when the stage fails or
+    times out; a callable fallback is called with no arguments.
+    """
+
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    depends_on: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+    fallback: Any = _NO_FALLBACK
+    required: bool = False
+
+    def fallback_value(self) -> Any:
+        if self.fallback is _NO_FALLBACK:
+            return None
+        return self.fallback() if callable(self.fallback) else self.fallback
+
+
+@dataclass
+class StageTiming:
+    # "ok", "timeout" or "failed"; a fallback was used unless "ok".
+    status: str
+    started_ms: float
+    elapsed_ms: float
+    error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "started_ms": self.started_ms,
+            "elapsed_ms": self.elapsed_ms,
+            "error": self.error,
+        }
+
+
+@dataclass
+class GraphResult:
+    results: Dict[str, Any]
+    timings: Dict[str, StageTiming]
+    elapsed_ms: float
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+
+class StageGraph:
+    """A set of stages run concurrently in dependency order."""
+
+    def __init__(
+        self,
+        stages: Iterable[Stage] = (),
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        self.stages: Dict[str, Stage] = {}
+        self.max_concurrency = max_concurrency
+        for stage in stages:
+            self.add(stage)
+
+    def add(self, stage: Stage) -> "StageGraph":
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage '{stage.name}'.")
+        self.stages[stage.name] = stage
+        return self
+
+    def _validate(self) -> None:
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(
+                        f"Stage '{stage.name}' depends on unknown stage '{dependency}'."
+                    )
+
+        # Kahn's algorithm: anything left unvisited is on a cycle.
+        remaining = {name: len(stage.depends_on) for name, stage in self.stages.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for stage in self.stages.values():
+                if name in stage.depends_on:
+                    remaining[stage.name] -= 1
+                    if remaining[stage.name] == 0:
+                        ready.append(stage.name)
+        if visited != len(self.stages):
+            raise ValueError("Stage graph contains a cycle.")
+
+    async def run(self) -> GraphResult:
+        self._validate()
+        started = time.perf_counter()
+        slots = (
+            asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        )
+        results: Dict[str, Any] = {}
+        timings: Dict[str, StageTiming] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        def _ms(since: float) -> float:
+            return round((time.perf_counter() - since) * 1000, 2)
+
+        async def _execute(stage: Stage) -> None:
+            await asyncio.gather(*(tasks[name] for name in stage.depends_on))
+            kwargs = {name: results[name] for name in stage.depends_on}
+
+            stage_started = time.perf_counter()
+            offset = round((stage_started - started) * 1000, 2)
+            try:
+                async with slots or contextlib.nullcontext():
+                    result = await asyncio.wait_for(stage.func(**kwargs), stage.timeout)
+                timings[stage.name] = StageTiming("ok", offset, _ms(stage_started))
+
+            except asyncio.TimeoutError as e:
+                timings[stage.name] = StageTiming(
+                    "timeout",
+                    offset,
+                    _ms(stage_started),
+                    f"Timed out after {stage.timeout}s",
+                )
+                if stage.required:
+                    raise StageFailed(stage.name, e) from e
+                result = stage.fallback_value()
+
+            except Exception as e:
+                timings[stage.name] = StageTiming(
+                    "failed", offset, _ms(stage_started), str(e)
+                )
+                if stage.required:
+                    raise StageFailed(stage.name, e) from e
+                result = stage.fallback_value()
+
+            results[stage.name] = result
+
+        tasks.update(
+            (name, asyncio.ensure_future(_execute(stage)))
+            for name, stage in self.stages.items()
+        )
+        try:
+            await asyncio.gather(*tasks.values())
+
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        return GraphResult(results=results, timings=timings, elapsed_ms=_ms(started))
+
+
+__all__ = [
+    "Stage",
+    "StageFailed",
+    "StageGraph",
+    "StageTiming",
+    "GraphResult",
+]
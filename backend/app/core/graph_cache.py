@@ -0,0 +1,101 @@
+"""Process-wide cache of compiled LangGraph graphs.
+
+Building a graph (binding tools, creating the Tavily client, compiling the
+``StateGraph``) is per-process work, not per-request work. Graphs are
+registered under a key with their builder, compiled once (at startup by
+:meth:`GraphCache.warm`, or on first use) and shared by every request; the
+request context travels in the graph state and config instead.
+
+Builds and reuse counts are reported under ``graphs`` in
+``/api/v1/cache/stats``.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from app.core.cache import register_cache_stats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CompiledGraph:
+    graph: Any
+    build_ms: float
+    built_at: float
+    hits: int = 0
+
+
+class GraphCache:
+    def __init__(self) -> None:
+        self._builders: Dict[str, Callable[[], Any]] = {}
+        self._graphs: Dict[str, _CompiledGraph] = {}
+        self._lock = threading.Lock()
+
+    def register(self, key: str, build: Callable[[], Any]) -> None:
+        """Declare how to build ``key`` so :meth:`warm` can compile it."""
+        self._builders[key] = build
+
+    def get(self, key: str, build: Optional[Callable[[], Any]] = None) -> Any:
+        """Return the compiled graph for ``key``, building it on first use."""
+        entry = self._graphs.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._graphs.get(key)
+                if entry is None:
+                    build = build or self._builders.get(key)
+                    if build is None:
+                        raise KeyError(f"No graph registered under '{key}'.")
+                    self._builders.setdefault(key, build)
+                    started = time.perf_counter()
+                    graph = build()
+                    entry = _CompiledGraph(
+                        graph=graph,
+                        build_ms=round((time.perf_counter() - started) * 1000, 2),
+                        built_at=time.time(),
+                    )
+                    self._graphs[key] = entry
+                    return entry.graph
+
+        entry.hits += 1
+        return entry.graph
+
+    def warm(self) -> None:
+        """Compile every registered graph; failures are retried on first use."""
+        for key in list(self._builders):
+            try:
+                self.get(key)
+
+            except Exception as e:
+                logger.warning("Could not pre-compile graph %s: %s", key, e)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graphs.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "registered": sorted(self._builders),
+            "compiled": {
+                key: {
+                    "build_ms": entry.build_ms,
+                    "built_at": entry.built_at,
+                    "reuses": entry.hits,
+                }
+                for key, entry in self._graphs.items()
+            },
+        }
+
+
+graph_cache = GraphCache()
+
+register_cache_stats("graphs", graph_cache.stats)
+
+
+__all__ = [
+    "GraphCache",
+    "graph_cache",
+]
@@ -0,0 +1,164 @@
+"""Shared async HTTP client for every outbound fetch.
+
+All agents go through :func:`request` / :func:`get` instead of opening their
+own blocking ``requests`` sessions, so slow third-party sites only hold an
+async slot instead of an event-loop thread. The client keeps connections
+alive across requests and applies:
+
+* connect/read timeouts (``HTTP_CONNECT_TIMEOUT`` / ``HTTP_READ_TIMEOUT``),
+* a per-host concurrency limit (``HTTP_PER_HOST_LIMIT``) so one slow host
+  cannot take every connection,
+* a global in-flight cap (``HTTP_MAX_IN_FLIGHT``), taken only once a
+  per-host slot is held so requests queued behind a slow host do not
+  occupy global slots,
+* retries with full-jitter exponential backoff on connection errors and
+  429/5xx responses, honouring ``Retry-After``.
+
+The client is created lazily per event loop and closed from the
+application lifespan via :func:`aclose_http_client`.
+"""
+
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+import httpx
+
+from app.core.config import (
+    http_backoff_base,
+    http_connect_timeout,
+    http_max_connections,
+    http_max_in_flight,
+    http_max_keepalive,
+    http_max_retries,
+    http_per_host_limit,
+    http_read_timeout,
+)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_AFTER = 10.0
+
+DEFAULT_HEADERS = {
+    "User-Agent": "TalentSync/1.0",
+}
+
+
+class _HostSlots:
+    """Per-host semaphore, dropped once no request uses it."""
+
+    def __init__(self) -> None:
+        self.semaphore = asyncio.Semaphore(http_per_host_limit)
+        self.users = 0
+
+
+class _ClientState:
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                http_read_timeout,
+                connect=http_connect_timeout,
+            ),
+            limits=httpx.Limits(
+                max_connections=http_max_connections,
+                max_keepalive_connections=http_max_keepalive,
+                keepalive_expiry=30.0,
+            ),
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+        )
+        self.in_flight = asyncio.Semaphore(http_max_in_flight)
+        self.per_host: Dict[str, _HostSlots] = {}
+
+    @asynccontextmanager
+    async def host_slot(self, host: str) -> AsyncIterator[None]:
+        slots = self.per_host.get(host)
+        if slots is None:
+            slots = self.per_host[host] = _HostSlots()
+        slots.users += 1
+        try:
+            async with slots.semaphore:
+                yield
+
+        finally:
+            slots.users -= 1
+            if not slots.users:
+                del self.per_host[host]
+
+
+_state: Optional[_ClientState] = None
+
+
+def _get_state() -> _ClientState:
+    global _state
+    loop = asyncio.get_running_loop()
+    if _state is None or _state.loop is not loop or _state.client.is_closed:
+        _state = _ClientState(loop)
+    return _state
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER)
+    return random.uniform(0, http_backoff_base * (2**attempt))
+
+
+async def request(
+    method: str,
+    url: str,
+    *,
+    retries: int = http_max_retries,
+    retry_statuses: Iterable[int] = RETRY_STATUSES,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Send a request through the shared client with limits and retries.
+
+    Returns the last response even when its status is retryable so callers
+    can inspect it; raises ``httpx.HTTPError`` if every attempt failed to
+    get a response at all.
+    """
+    state = _get_state()
+    host = httpx.URL(url).host
+    retry_statuses = frozenset(retry_statuses)
+    if timeout is not None:
+        kwargs["timeout"] = httpx.Timeout(timeout, connect=http_connect_timeout)
+
+    for attempt in range(retries + 1):
+        response: Optional[httpx.Response] = None
+        try:
+            async with state.host_slot(host), state.in_flight:
+                response = await state.client.request(method, url, **kwargs)
+
+            if response.status_code not in retry_statuses or attempt == retries:
+                return response
+
+        except (httpx.TransportError, httpx.DecodingError):
+            if attempt == retries:
+                raise
+
+        await asyncio.sleep(_retry_delay(attempt, response))
+
+    raise AssertionError("unreachable")
+
+
+async def get(url: str, **kwargs: Any) -> httpx.Response:
+    return await request("GET", url, **kwargs)
+
+
+async def aclose_http_client() -> None:
+    global _state
+    if _state is not None and not _state.client.is_closed:
+        await _state.client.aclose()
+    _state = None
+
+
+__all__ = [
+    "RETRY_STATUSES",
+    "request",
+    "get",
+    "aclose_http_client",
+]
@@ -0,0 +1,296 @@
+"""Deterministic response cache for prompt chains.
+
+Chains in ``app/data/prompt`` are built with :func:`cached_chain`, which keys
+each call by (prompt template id, model name, normalized inputs) and stores
+the model's text response. Backends are pluggable:
+
+- ``memory``: in-process LRU bounded by ``LLM_CACHE_MAX_BYTES``.
+- ``sqlite``: file-backed store at ``LLM_CACHE_PATH`` shared by all workers.
+- ``none``: caching disabled.
+
+Entries expire after ``LLM_CACHE_TTL`` seconds. A request can skip cache
+reads by sending ``Cache-Control: no-cache`` or ``X-LLM-Cache: bypass``; the
+fresh response still replaces the cached one.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Mapping, Optional
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+from app.core.cache import LRUCache, register_cache_stats
+from app.core.concurrency import run_blocking
+from app.core.config import (
+    llm_cache_backend,
+    llm_cache_max_bytes,
+    llm_cache_path,
+    llm_cache_ttl,
+)
+from app.core.llm import MODEL_NAME
+
+logger = logging.getLogger(__name__)
+
+BYPASS_HEADER = "x-llm-cache"
+
+_cache_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+def wants_cache_bypass(headers: Mapping[str, str]) -> bool:
+    """Return True if the request headers ask to skip cached LLM responses."""
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return True
+    return headers.get(BYPASS_HEADER, "").strip().lower() in {"bypass", "off", "0"}
+
+
+def set_cache_bypass(bypass: bool) -> Token:
+    return _cache_bypass.set(bypass)
+
+
+def reset_cache_bypass(token: Token) -> None:
+    _cache_bypass.reset(token)
+
+
+def cache_bypassed() -> bool:
+    """Whether the current request skips cached LLM responses."""
+    return _cache_bypass.get()
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, Mapping):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def response_cache_key(template_id: str, model_name: str, inputs: Any) -> str:
+    """Build the cache key for one chain call."""
+    payload = json.dumps(
+        [template_id, model_name, _normalize(inputs)],
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryResponseCache:
+    """In-process backend; each worker keeps its own copy."""
+
+    blocking = False
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self._cache = LRUCache[str](
+            max_bytes=max_bytes,
+            ttl=ttl,
+            sizeof=lambda value: len(value.encode("utf-8")),
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self._cache.set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self._cache.stats_dict()}
+
+
+class SQLiteResponseCache:
+    """File-backed backend shared by every worker on the host."""
+
+    blocking = True
+
+    def __init__(self, path: str, max_bytes: int, ttl: float) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_responses_accessed "
+                "ON llm_responses (accessed_at)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute(
+                        "DELETE FROM llm_responses WHERE key = ?", (key,)
+                    )
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_responses SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now + self.ttl, now),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE expires_at <= ?", (now,)
+            )
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(total)
+
+    def _evict(self, total: int) -> None:
+        rows = self._conn.execute(
+            "SELECT key, size FROM llm_responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "backend": "sqlite",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total,
+        }
+
+
+def _build_response_cache() -> Optional[Any]:
+    if llm_cache_backend in {"none", "off", "disabled"}:
+        return None
+
+    if llm_cache_backend == "sqlite":
+        try:
+            return SQLiteResponseCache(
+                path=llm_cache_path,
+                max_bytes=llm_cache_max_bytes,
+                ttl=llm_cache_ttl,
+            )
+        except sqlite3.Error as e:
+            logger.warning(
+                "SQLite LLM cache unavailable (%s); falling back to memory.", e
+            )
+
+    return MemoryResponseCache(max_bytes=llm_cache_max_bytes, ttl=llm_cache_ttl)
+
+
+response_cache = _build_response_cache()
+
+if response_cache is not None:
+    register_cache_stats("llm_responses", response_cache.stats)
+
+
+def _response_text(result: Any) -> Optional[str]:
+    content = getattr(result, "content", result)
+    return content if isinstance(content, str) and content.strip() else None
+
+
+def cached_chain(template_id: str, prompt: Runnable, llm: Any) -> Runnable:
+    """Return ``prompt | llm`` wrapped with the shared response cache.
+
+    Cache hits are returned as an ``AIMessage`` so callers can keep reading
+    ``.content`` exactly as they do for live responses.
+    """
+    chain = prompt | llm
+
+    def _lookup_key(inputs: Any) -> Optional[str]:
+        if response_cache is None:
+            return None
+        # Read per call: a routed model can differ between requests.
+        model_name = getattr(llm, "model", None) or MODEL_NAME
+        return response_cache_key(template_id, model_name, inputs)
+
+    def _invoke(inputs: Any, config: RunnableConfig) -> Any:
+        key = _lookup_key(inputs)
+        if key is not None and not _cache_bypass.get():
+            cached = response_cache.get(key)
+            if cached is not None:
+                return AIMessage(content=cached)
+
+        result = chain.invoke(inputs, config)
+        text = _response_text(result)
+        if key is not None and text is not None:
+            response_cache.set(key, text)
+        return result
+
+    async def _ainvoke(inputs: Any, config: RunnableConfig) -> Any:
+        key = _lookup_key(inputs)
+        if key is not None and not _cache_bypass.get():
+            if response_cache.blocking:
+                cached = await run_blocking(response_cache.get, key)
+            else:
+                cached = response_cache.get(key)
+            if cached is not None:
+                return AIMessage(content=cached)
+
+        result = await chain.ainvoke(inputs, config)
+        text = _response_text(result)
+        if key is not None and text is not None:
+            if response_cache.blocking:
+                await run_blocking(response_cache.set, key, text)
+            else:
+                response_cache.set(key, text)
+        return result
+
+    return RunnableLambda(_invoke, afunc=_ainvoke, name=template_id)
+
+
+__all__ = [
+    "cached_chain",
+    "response_cache",
+    "response_cache_key",
+    "wants_cache_bypass",
+    "set_cache_bypass",
+    "reset_cache_bypass",
+    "cache_bypassed",
+]
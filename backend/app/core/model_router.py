@@ -0,0 +1,339 @@
+"""Task-aware routing of LLM calls to models.
+
+Every chain and agent declares a task class and a task name::
+
+    chain = cached_chain("txt_processor", prompt, routed_llm("formatting", "txt_processor"))
+
+The model for a call is resolved from the JSON file at ``MODEL_ROUTES_PATH``
+(default ``app/data/model_routes.json``), most specific entry first:
+
+- ``routes``: per API route overrides, keyed by path prefix, then by task
+  name, task class or ``"*"``, e.g.
+  ``{"/api/v1/linkedin": {"creative": "gemini-2.0-flash"}}``;
+- ``tasks``: per task name, e.g. ``{"tips_generator": "gemini-2.0-flash-lite"}``;
+- ``classes``: the default model of each task class.
+
+Anything unresolved uses ``MODEL_NAME``. The routed model is resolved when
+the call is made, so route overrides apply per request and
+:func:`~app.core.llm_cache.cached_chain` keys its cache on the model that
+actually answers. Latency per model and per task class is reported under
+``models`` in ``/api/v1/cache/stats``.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    Literal,
+    Optional,
+    Tuple,
+)
+
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from app.core.cache import register_cache_stats
+from app.core.config import google_api_key, model_latency_samples, model_routes_path
+from app.core.llm import FASTER_MODEL_NAME, MODEL_NAME, faster_llm, llm
+
+logger = logging.getLogger(__name__)
+
+TaskClass = Literal["extraction", "formatting", "creative", "reasoning"]
+
+TASK_CLASSES = ("extraction", "formatting", "creative", "reasoning")
+
+DEFAULT_ROUTES: Dict[str, Any] = {
+    "classes": {
+        "extraction": FASTER_MODEL_NAME,
+        "formatting": FASTER_MODEL_NAME,
+        "creative": MODEL_NAME,
+        "reasoning": MODEL_NAME,
+    },
+    "tasks": {},
+    "routes": {},
+}
+
+_current_route: ContextVar[Optional[str]] = ContextVar("model_route", default=None)
+
+
+def set_current_route(path: Optional[str]) -> Token:
+    return _current_route.set(path)
+
+
+def reset_current_route(token: Token) -> None:
+    _current_route.reset(token)
+
+
+def current_route() -> Optional[str]:
+    """API route of the current request, used to pick route overrides."""
+    return _current_route.get()
+
+
+def load_routes(path: str) -> Dict[str, Any]:
+    """Read the routing file, falling back to :data:`DEFAULT_ROUTES`."""
+    routes = {key: dict(value) for key, value in DEFAULT_ROUTES.items()}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+
+    except FileNotFoundError:
+        return routes
+
+    except (OSError, ValueError) as e:
+        logger.warning("Invalid model routes file %s (%s); using defaults.", path, e)
+        return routes
+
+    for key in routes:
+        if isinstance(loaded.get(key), dict):
+            routes[key].update(loaded[key])
+    return routes
+
+
+class _Latency:
+    def __init__(self, samples: int) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.samples: Deque[float] = deque(maxlen=samples)
+
+    def add(self, elapsed_ms: float, ok: bool) -> None:
+        self.calls += 1
+        self.errors += not ok
+        self.total_ms += elapsed_ms
+        self.samples.append(elapsed_ms)
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+
+        def quantile(q: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else None,
+            "p50_ms": quantile(0.5),
+            "p95_ms": quantile(0.95),
+        }
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        routes_path: str = model_routes_path,
+        latency_samples: int = model_latency_samples,
+    ) -> None:
+        self.routes_path = routes_path
+        self.routes = load_routes(routes_path)
+        self._latency_samples = latency_samples
+        self._models: Dict[str, Any] = {}
+        if llm is not None:
+            self._models[MODEL_NAME] = llm
+        if faster_llm is not None:
+            self._models[FASTER_MODEL_NAME] = faster_llm
+        self._latency: Dict[str, _Latency] = {}
+        self._by_class: Dict[str, _Latency] = {}
+        self._lock = threading.Lock()
+
+    def reload(self) -> None:
+        self.routes = load_routes(self.routes_path)
+
+    def resolve(
+        self,
+        task_class: TaskClass,
+        task: Optional[str] = None,
+        route: Optional[str] = None,
+    ) -> str:
+        """Name of the model for ``task`` in the current (or given) API route."""
+        route = route if route is not None else _current_route.get()
+        if route:
+            prefixes = [p for p in self.routes["routes"] if route.startswith(p)]
+            for prefix in sorted(prefixes, key=len, reverse=True):
+                overrides = self.routes["routes"][prefix]
+                if isinstance(overrides, str):
+                    return overrides
+                for key in (task, task_class, "*"):
+                    if key and key in overrides:
+                        return overrides[key]
+
+        if task and task in self.routes["tasks"]:
+            return self.routes["tasks"][task]
+        return self.routes["classes"].get(task_class) or MODEL_NAME
+
+    def model(self, name: str) -> Any:
+        """The chat model called ``name`` (created once), or None without a key."""
+        model = self._models.get(name)
+        if model is None and google_api_key:
+            with self._lock:
+                model = self._models.get(name)
+                if model is None:
+                    model = ChatGoogleGenerativeAI(
+                        model=name,
+                        google_api_key=google_api_key,
+                        temperature=0.1,
+                    )
+                    self._models[name] = model
+        return model
+
+    def chat_model(self, task_class: TaskClass, task: Optional[str] = None) -> Any:
+        """Resolve and return the chat model for ``task`` right now.
+
+        For callers that need the concrete model, e.g. to bind tools.
+        """
+        return self.model(self.resolve(task_class, task))
+
+    def record(
+        self, model_name: str, task_class: str, elapsed_ms: float, ok: bool = True
+    ) -> None:
+        with self._lock:
+            for stats, key in (
+                (self._latency, model_name),
+                (self._by_class, task_class),
+            ):
+                if key not in stats:
+                    stats[key] = _Latency(self._latency_samples)
+                stats[key].add(elapsed_ms, ok)
+
+    @contextmanager
+    def timed(self, model_name: str, task_class: str) -> Iterator[None]:
+        """Record the latency of the enclosed model call."""
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+
+        finally:
+            self.record(
+                model_name, task_class, (time.perf_counter() - started) * 1000, ok
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "routes_path": self.routes_path,
+                "classes": dict(self.routes["classes"]),
+                "models": {k: v.as_dict() for k, v in self._latency.items()},
+                "task_classes": {k: v.as_dict() for k, v in self._by_class.items()},
+            }
+
+
+model_router = ModelRouter()
+
+register_cache_stats("models", model_router.stats)
+
+
+class RoutedLLM(Runnable):
+    """A chat model stand-in that picks the real model on every call."""
+
+    def __init__(
+        self,
+        task_class: TaskClass,
+        task: Optional[str] = None,
+        router: ModelRouter = model_router,
+        adapt: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        self.task_class = task_class
+        self.task = task
+        self.router = router
+        self.name = f"{task or task_class}:routed"
+        # Applied to the resolved model, e.g. to bind tools; one per model.
+        self._adapt = adapt
+        self._adapted: Dict[str, Any] = {}
+
+    @property
+    def model(self) -> str:
+        """Name of the model this call would go to (read by ``cached_chain``)."""
+        return self.router.resolve(self.task_class, self.task)
+
+    def _resolved(self) -> Tuple[str, Any]:
+        name = self.model
+        model = self.router.model(name)
+        if model is None:
+            raise RuntimeError(f"LLM is not configured; cannot call model {name}.")
+        if self._adapt is not None:
+            if name not in self._adapted:
+                self._adapted[name] = self._adapt(model)
+            model = self._adapted[name]
+        return name, model
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "RoutedLLM":
+        return RoutedLLM(
+            self.task_class,
+            self.task,
+            self.router,
+            adapt=lambda model: model.bind_tools(tools, **kwargs),
+        )
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> "RoutedLLM":
+        return RoutedLLM(
+            self.task_class,
+            self.task,
+            self.router,
+            adapt=lambda model: model.with_structured_output(schema, **kwargs),
+        )
+
+    def invoke(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Any:
+        name, model = self._resolved()
+        with self.router.timed(name, self.task_class):
+            return model.invoke(input, config, **kwargs)
+
+    async def ainvoke(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Any:
+        name, model = self._resolved()
+        with self.router.timed(name, self.task_class):
+            return await model.ainvoke(input, config, **kwargs)
+
+    def stream(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Iterator[Any]:
+        name, model = self._resolved()
+        with self.router.timed(name, self.task_class):
+            yield from model.stream(input, config, **kwargs)
+
+    async def astream(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        name, model = self._resolved()
+        with self.router.timed(name, self.task_class):
+            async for chunk in model.astream(input, config, **kwargs):
+                yield chunk
+
+
+def routed_llm(
+    task_class: TaskClass, task: Optional[str] = None
+) -> Optional[RoutedLLM]:
+    """Routed model for ``task``; None when no LLM is configured, like ``llm``."""
+    if llm is None:
+        return None
+    return RoutedLLM(task_class, task)
+
+
+__all__ = [
+    "DEFAULT_ROUTES",
+    "TASK_CLASSES",
+    "ModelRouter",
+    "RoutedLLM",
+    "TaskClass",
+    "current_route",
+    "load_routes",
+    "model_router",
+    "reset_current_route",
+    "routed_llm",
+    "set_current_route",
+]
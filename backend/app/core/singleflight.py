@@ -0,0 +1,185 @@
+"""Single-flight coalescing of identical in-flight calls.
+
+When a burst of requests asks for the same thing at the same time (the same
+tips prompt, the same page through r.jina.ai, the same resume through the
+formatter), only the first caller runs the work; everyone else with the same
+key awaits that one shared task. Nothing is kept once the call finishes: this is not a
+cache, it only removes duplicate concurrent work. Results and exceptions are
+delivered to every waiter.
+
+Calls are grouped so their counters show up separately in
+``/api/v1/cache/stats`` under ``singleflight``.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Mapping, TypeVar
+
+from app.core.cache import register_cache_stats
+from app.core.concurrency import ainvoke
+from app.core.llm_cache import cache_bypassed
+from app.core.model_router import current_route
+
+T = TypeVar("T")
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, Mapping):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def flight_key(*parts: Any) -> str:
+    """Stable key for ``parts`` (whitespace-insensitive for strings)."""
+    payload = json.dumps(
+        _normalize(list(parts)),
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Group of calls where concurrent callers with one key share a task."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        # Waiter counts for tasks started through ``do``; tasks started with
+        # ``start`` belong to their caller and are never cancelled here.
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def start(
+        self,
+        key: Hashable,
+        func: Callable[..., Awaitable[T]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> "asyncio.Task[T]":
+        """Return the task running ``key``, starting ``func`` if there is none."""
+        task = self._calls.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.followers += 1
+            return task
+
+        self.leaders += 1
+        task = asyncio.ensure_future(func(*args, **kwargs))
+        self._calls[key] = task
+
+        def _forget(done: asyncio.Task) -> None:
+            if self._calls.get(key) is done:
+                del self._calls[key]
+
+        task.add_done_callback(_forget)
+        return task
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[..., Awaitable[T]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> T:
+        """Await ``func(*args, **kwargs)``, sharing it with callers of ``key``.
+
+        The shared task is shielded, so a caller that is cancelled (client
+        disconnect, timeout) doesn't abort the work for the others; it is
+        only cancelled once every caller waiting on it has gone away.
+        """
+        leader = not self.in_flight(key)
+        task = self.start(key, func, *args, **kwargs)
+        if leader:
+            self._waiters[task] = 0
+        if task in self._waiters:
+            self._waiters[task] += 1
+
+        try:
+            return await asyncio.shield(task)
+
+        finally:
+            if task in self._waiters:
+                self._waiters[task] -= 1
+                if self._waiters[task] == 0:
+                    del self._waiters[task]
+                    if not task.done():
+                        task.cancel()
+                        # Unregister now so a new caller starts a fresh call
+                        # instead of joining the cancelled one.
+                        if self._calls.get(key) is task:
+                            del self._calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.followers
+        return {
+            "calls": calls,
+            "executed": self.leaders,
+            "coalesced": self.followers,
+            "coalesced_rate": round(self.followers / calls, 4) if calls else 0.0,
+            "in_flight": len(self),
+        }
+
+
+_groups: List[SingleFlight] = []
+
+
+def flight_group(name: str) -> SingleFlight:
+    """Create a named group whose counters are reported with the cache stats."""
+    group = SingleFlight(name)
+    _groups.append(group)
+    return group
+
+
+register_cache_stats(
+    "singleflight",
+    lambda: {group.name: group.stats() for group in _groups},
+)
+
+llm_flights = flight_group("llm")
+web_flights = flight_group("web")
+
+
+async def coalesced_ainvoke(runnable: Any, inputs: Any, **kwargs: Any) -> Any:
+    """:func:`~app.core.concurrency.ainvoke`, shared by identical callers.
+
+    Calls are keyed by the runnable, its normalized inputs and the request
+    context that changes the answer: the API route (route overrides pick the
+    model, including inside a ``cached_chain``) and whether the request
+    bypasses the LLM response cache, so a bypassing caller never joins a
+    leader that may answer from the cache. Calls that pass extra invocation
+    options (callbacks, config) are not coalesced.
+    """
+    if kwargs:
+        return await ainvoke(runnable, inputs, **kwargs)
+
+    key = (
+        id(runnable),
+        getattr(runnable, "model", None),
+        current_route(),
+        cache_bypassed(),
+        flight_key(inputs),
+    )
+    return await llm_flights.do(key, ainvoke, runnable, inputs)
+
+
+__all__ = [
+    "SingleFlight",
+    "flight_group",
+    "flight_key",
+    "llm_flights",
+    "web_flights",
+    "coalesced_ainvoke",
+]
@@ -0,0 +1,54 @@
+"""Helpers for streaming ``StreamingEvent`` objects to clients.
+
+Two wire formats are supported:
+
+- ``ndjson``: one JSON-encoded event per line (``application/x-ndjson``).
+- ``sse``: Server-Sent Events with the event ``type`` as the SSE event name.
+"""
+
+from typing import AsyncIterator, Literal
+
+from fastapi.responses import StreamingResponse
+
+from app.models.schemas import StreamingEvent
+
+StreamFormat = Literal["ndjson", "sse"]
+
+_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def format_event(event: StreamingEvent, stream_format: StreamFormat = "ndjson") -> str:
+    data = event.model_dump_json()
+    if stream_format == "sse":
+        return f"event: {event.type}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+def event_stream_response(
+    events: AsyncIterator[StreamingEvent],
+    stream_format: StreamFormat = "ndjson",
+) -> StreamingResponse:
+    """Wrap an async iterator of events in a ``StreamingResponse``."""
+
+    async def _body() -> AsyncIterator[str]:
+        async for event in events:
+            yield format_event(event, stream_format)
+
+    return StreamingResponse(
+        _body(),
+        media_type=_MEDIA_TYPES[stream_format],
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+__all__ = [
+    "StreamFormat",
+    "format_event",
+    "event_stream_response",
+]
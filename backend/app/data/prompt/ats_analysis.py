@@ -1,14 +1,11 @@
 from langchain_core.prompts import PromptTemplate
-from app.core.llm import llm
+from app.core.model_router import routed_llm
+from app.core.llm_cache import cached_chain
 
 ats_analysis_prompt_template_str = """
 You are an expert ATS (Applicant Tracking System) and resume analysis assistant.
-Given a candidate's resume and a job description, analyze the resume for:
-- Required and optional keyword coverage
-- Contact information completeness
-- Content quality and structure
-- ATS compatibility (fields present, formatting, etc.)
-- Recommendations for improvement
+The measurable ATS metrics below were already computed exactly by a program.
+Do not recompute or restate them; use them to give qualitative feedback.
 
 **Job Description:**
 {jd_text}
@@ -18,39 +15,22 @@ Given a candidate's resume and a job description, analyze the resume for:
 {resume_text}
 ```
 
+**Computed ATS metrics (0-1 unless noted):**
+{metrics}
+
 Instructions:
-1. Extract and list found and missing required/optional keywords from the JD.
-2. Score the resume (0-1) for:
-   - ATS compatibility (fields: name, email, phone, education, experience, skills)
-   - Contact info (valid email, phone, LinkedIn)
-   - Content quality (clarity, achievements, metrics)
-   - Structure/formatting (sections, order, readability)
-   - Required/optional keyword coverage
-   - Keyword density (keywords per 100 words)
-3. Provide a composite score (0-100) blending the above.
-4. List strengths and areas for improvement.
-5. Suggest actionable recommendations (title, description, category, priority, impact).
-6. Output a summary sentence.
+1. List the resume's strengths for this job.
+2. List the main areas for improvement, referring to the metrics where relevant
+   (missing keywords, absent sections or contact details, weak bullet points).
+3. Suggest up to 5 actionable recommendations (id, title, description, category,
+   priority: high/medium/low, impact: high/medium/low).
+4. Write one summary sentence.
 
 **Output:**
 Return only a JSON object with these keys:
-- composite (float, 0-100)
-- semantic (float, 0-1, semantic similarity to JD)
-- compatibility (float, 0-1)
-- contact (float, 0-1)
-- content (float, 0-1)
-- req_keyword_cov (float, 0-1)
-- opt_keyword_cov (float, 0-1)
-- formatting (float, 0-1)
-- keyword_density (float)
-- found_keywords (list of str)
-- missing_keywords (list of str)
-- recommended_keywords (list of str)
-- recommendations (list of objects: id, title, description, category, priority, impact)
 - strengths (list of str)
 - areas_for_improvement (list of str)
-- industry_average (float)
-- percentile (int)
+- recommendations (list of objects: id, title, description, category, priority, impact)
 - summary (str)
 """
 
@@ -58,8 +38,11 @@ ats_analysis_prompt = PromptTemplate(
     input_variables=[
         "resume_text",
         "jd_text",
+        "metrics",
     ],
     template=ats_analysis_prompt_template_str,
 )
 
-ats_analysis_chain = ats_analysis_prompt | llm
+ats_analysis_chain = cached_chain(
+    "ats_analysis", ats_analysis_prompt, routed_llm("reasoning", "ats_analysis")
+)
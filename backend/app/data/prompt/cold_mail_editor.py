@@ -1,4 +1,5 @@
-from app.core.llm import llm
+from app.core.model_router import routed_llm
+from app.core.llm_cache import cached_chain
 from langchain_core.prompts import PromptTemplate
 
 
@@ -130,4 +131,8 @@ cold_mail_edit_prompt = PromptTemplate(
     template=cold_mail_edit_prompt_template_str,
 )
 
-cold_mail_edit_chain = cold_mail_edit_prompt | llm
+cold_mail_edit_chain = cached_chain(
+    "cold_mail_editor",
+    cold_mail_edit_prompt,
+    routed_llm("creative", "cold_mail_editor"),
+)
@@ -1,5 +1,6 @@
 from langchain_core.prompts import PromptTemplate
-from app.core.llm import llm
+from app.core.model_router import routed_llm
+from app.core.llm_cache import cached_chain
 
 
 cold_mail_prompt_template_str = """
@@ -112,4 +113,6 @@ cold_mail_prompt = PromptTemplate(
 )
 
 
-cold_main_generator_chain = cold_mail_prompt | llm
+cold_main_generator_chain = cached_chain(
+    "cold_mail_gen", cold_mail_prompt, routed_llm("creative", "cold_mail_gen")
+)
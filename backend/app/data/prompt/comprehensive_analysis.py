@@ -1,5 +1,6 @@
 from langchain_core.prompts import PromptTemplate
-from app.core.llm import llm
+from app.core.model_router import routed_llm
+from app.core.llm_cache import cached_chain
 
 
 comprehensive_analysis_prompt_template_str = """
@@ -88,6 +89,9 @@ Input:
 {extracted_resume_text}
 ```
 
+- Skills detected by a keyword scan (use as hints; verify against the text):
+{detected_skills}
+
 Instructions:
 1.  Extarct these fields accurately:
     - name
@@ -163,7 +167,12 @@ comprehensive_analysis_prompt = PromptTemplate(
     input_variables=[
         "extracted_resume_text",
     ],
+    partial_variables={"detected_skills": "None detected"},
     template=comprehensive_analysis_prompt_template_str,
 )
 
-comprensive_analysis_chain = comprehensive_analysis_prompt | llm
+comprensive_analysis_chain = cached_chain(
+    "comprehensive_analysis",
+    comprehensive_analysis_prompt,
+    routed_llm("reasoning", "comprehensive_analysis"),
+)
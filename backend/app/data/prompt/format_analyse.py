@@ -1,5 +1,6 @@
 from langchain_core.prompts import PromptTemplate
-from app.core.llm import llm
+from app.core.model_router import routed_llm
+from app.core.llm_cache import cached_chain
 
 
 format_analyse_prompt_template_str = """
@@ -88,6 +89,9 @@ Input:
 {extracted_resume_text}
 ```
 
+- Skills detected by a keyword scan (use as hints; verify against the text):
+{detected_skills}
+
 Instructions:
 1.  Extarct these fields accurately:
     - name
@@ -164,7 +168,10 @@ format_analyse_prompt = PromptTemplate(
     input_variables=[
         "extracted_resume_text",
     ],
+    partial_variables={"detected_skills": "None detected"},
     template=format_analyse_prompt_template_str,
 )
 
-format_analyse_chain = format_analyse_prompt | llm
+format_analyse_chain = cached_chain(
+    "format_analyse", format_analyse_prompt, routed_llm("reasoning", "format_analyse")
+)
@@ -1,5 +1,6 @@
 from langchain_core.prompts import PromptTemplate
-from app.core.llm import llm
+from app.core.model_router import routed_llm
+from app.core.llm_cache import cached_chain
 
 
 hiring_assistant_prompt_template_str = """
@@ -43,4 +44,65 @@ hiring_assistant_prompt_template = PromptTemplate(
     template=hiring_assistant_prompt_template_str,
 )
 
-hiring_assistant_chain = hiring_assistant_prompt_template | llm
+hiring_assistant_chain = cached_chain(
+    "hiring_assistant",
+    hiring_assistant_prompt_template,
+    routed_llm("creative", "hiring_assistant"),
+)
+
+# Uncached: used when answers are streamed token by token.
+hiring_assistant_stream_chain = hiring_assistant_prompt_template | routed_llm(
+    "creative", "hiring_assistant"
+)
+
+
+hiring_assistant_batch_prompt_template_str = """
+You are an expert interview coach and career advisor.
+
+Below is the candidate's résumé (Markdown):
+```
+{resume}
+```
+
+They are applying for the role of **{role}** at **{company}**{company_context}.
+
+Your task: craft a clear, concise answer (≤ {word_limit} words each) to EVERY interview question below.
+
+Note: always use the first person to answer the questions. act as the candidate. also use the resume supplemented with your own knowledge.
+
+Questions:
+{questions}
+
+Formatting guidelines for each answer:
+1. Start with a one-sentence summary of why this candidate is a great fit.
+2. Then use 3–4 bullet points that each:
+    - Reference a specific skill or achievement from the résumé
+    - Include metrics or outcomes whenever possible
+    - Tie back to the company's mission, values or culture
+3. Maintain a professional, confident tone.
+4. If no {company_context} is provided, skip references to company culture.
+5. Do not repeat the same achievement across answers unless the question requires it.
+
+Output:
+Return ONLY a single JSON object of the form
+{{"answers": [{{"index": 1, "answer": "..."}}, ...]}}
+with exactly one entry per question, where `index` is the question's number above and `answer` is the Markdown answer.
+"""
+
+hiring_assistant_batch_prompt_template = PromptTemplate(
+    input_variables=[
+        "resume",
+        "role",
+        "company",
+        "company_context",
+        "questions",
+        "word_limit",
+    ],
+    template=hiring_assistant_batch_prompt_template_str,
+)
+
+hiring_assistant_batch_chain = cached_chain(
+    "hiring_assistant_batch",
+    hiring_assistant_batch_prompt_template,
+    routed_llm("creative", "hiring_assistant_batch"),
+)
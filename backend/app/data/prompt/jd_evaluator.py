@@ -185,12 +185,21 @@ Job Description:
 Resume:
 {resume}
 
+Skills detected in the resume by a keyword scan (hints only; confirm usage context in the resume):
+{detected_skills}
+
+Semantic similarity from a local embedding model (a signal, not a substitute for the rubric):
+{semantic_match}
+
 Now process the above using the framework and output only the JSON object matching the schema.
 """
 
 
 jd_evaluator_prompt_template = ChatPromptTemplate.from_template(
     jd_evaluator_prompt_template_str,
+).partial(
+    detected_skills="None detected",
+    semantic_match="Not computed",
 )
 
 # to be used in ats thingy
@@ -1,5 +1,6 @@
 from langchain_core.prompts import PromptTemplate
-from app.core.llm import llm
+from app.core.model_router import routed_llm
+from app.core.llm_cache import cached_chain
 
 
 formatting_template_str = """
@@ -74,6 +75,8 @@ formatting_template = PromptTemplate(
     template=formatting_template_str,
 )
 
-josn_formatter_chain = formatting_template | llm
+josn_formatter_chain = cached_chain(
+    "json_extractor", formatting_template, routed_llm("extraction", "json_extractor")
+)
 
 # to be used in analuse resume
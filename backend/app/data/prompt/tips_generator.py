@@ -1,4 +1,5 @@
-from app.core.llm import llm
+from app.core.model_router import routed_llm
+from app.core.llm_cache import cached_chain
 from langchain_core.prompts import PromptTemplate
 
 
@@ -42,4 +43,6 @@ tips_generator_prompt = PromptTemplate(
     template=tips_generator_prompt_template_str,
 )
 
-tips_generator_chain = tips_generator_prompt | llm
+tips_generator_chain = cached_chain(
+    "tips_generator", tips_generator_prompt, routed_llm("creative", "tips_generator")
+)
@@ -1,5 +1,6 @@
 from langchain_core.prompts import PromptTemplate
-from app.core.llm import llm
+from app.core.model_router import routed_llm
+from app.core.llm_cache import cached_chain
 
 text_formater_template_str = """
 You are an expert resume text processing assistant.
@@ -32,4 +33,6 @@ text_formater_template = PromptTemplate(
     template=text_formater_template_str,
 )
 
-text_formater_chain = text_formater_template | llm
+text_formater_chain = cached_chain(
+    "txt_processor", text_formater_template, routed_llm("formatting", "txt_processor")
+)
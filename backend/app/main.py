@@ -1,10 +1,36 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.concurrency import shutdown_executors
+from app.core.graph_cache import graph_cache
+from app.core.http import aclose_http_client
+from app.core.llm_cache import (
+    reset_cache_bypass,
+    set_cache_bypass,
+    wants_cache_bypass,
+)
+from app.core.model_router import reset_current_route, set_current_route
+from app.services.candidate_index import candidate_index
+from app.services.skill_matcher import get_skill_matcher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_skill_matcher()
+    graph_cache.warm()
+    yield
+    candidate_index.flush(force=True)
+    await aclose_http_client()
+    shutdown_executors()
+
+
 app = FastAPI(
     title="TalentSync Normies API",
     description="API for analyzing resumes, extracting structured data, and providing tips for improvement.",
     version="1.5.8",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -16,6 +42,29 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def llm_cache_bypass_middleware(request: Request, call_next):
+    """Honour per-request LLM cache bypass headers for every chain call."""
+    token = set_cache_bypass(wants_cache_bypass(request.headers))
+    try:
+        return await call_next(request)
+
+    finally:
+        reset_cache_bypass(token)
+
+
+@app.middleware("http")
+async def model_route_middleware(request: Request, call_next):
+    """Expose the request path to the model router for per-route overrides."""
+    token = set_current_route(request.url.path)
+    try:
+        return await call_next(request)
+
+    finally:
+        reset_current_route(token)
+
+
+from app.routes.cache import router as cache_router
 from app.routes.linkedin import router as linkedin_router
 from app.routes.postgres import router as postgres_router
 from app.routes.tips import router as tips_router
@@ -146,3 +195,11 @@ app.include_router(
         "Tailored Resume",
     ],
 )
+
+app.include_router(
+    cache_router,
+    prefix="/api/v1",
+    tags=[
+        "System",
+    ],
+)
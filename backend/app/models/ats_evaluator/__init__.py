@@ -1,8 +1,27 @@
 """ATS evaluator package exposing request/response models."""
 
-from .response import ATSEvaluationRequest, ATSEvaluationResponse
+from .response import (
+    ATSEvaluationRequest,
+    ATSEvaluationResponse,
+    JobMatchRequest,
+    JobMatchResponse,
+    JobMatchResult,
+    JobPosting,
+    SectionSimilarity,
+    SemanticPreScoreRequest,
+    SemanticPreScoreResponse,
+    SemanticScoreResult,
+)
 
 __all__ = [
     "ATSEvaluationRequest",
     "ATSEvaluationResponse",
+    "JobMatchRequest",
+    "JobMatchResponse",
+    "JobMatchResult",
+    "JobPosting",
+    "SectionSimilarity",
+    "SemanticPreScoreRequest",
+    "SemanticPreScoreResponse",
+    "SemanticScoreResult",
 ]
@@ -1,7 +1,10 @@
 """ATS evaluation models."""
 
-from typing import Optional, Dict, Any
-from pydantic import BaseModel
+from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field
+
+from app.core.config import job_match_max_top_k
+from app.models.jd_evaluator.response import JDEvaluatorResponse
 
 
 class ATSEvaluationRequest(BaseModel):
@@ -16,3 +19,81 @@ class ATSEvaluationResponse(BaseModel):
     message: str = "ATS evaluation completed successfully"
     analysis: Dict[str, Any]
     narrative: str
+
+
+class SemanticPreScoreRequest(BaseModel):
+    jd_text: str = Field(..., min_length=1)
+    resume_texts: List[str] = Field(default_factory=list)
+    session_ids: List[str] = Field(default_factory=list)
+    top_k: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Return only the k best matching resumes.",
+    )
+
+
+class SectionSimilarity(BaseModel):
+    jd_section: str
+    resume_section: Optional[str] = None
+    similarity: float
+
+
+class SemanticScoreResult(BaseModel):
+    index: int
+    session_id: Optional[str] = None
+    score: float
+    document_similarity: float
+    sections: List[SectionSimilarity] = Field(default_factory=list)
+
+
+class SemanticPreScoreResponse(BaseModel):
+    success: bool = True
+    message: str = "Semantic pre-score completed"
+    model: str
+    elapsed_ms: float
+    results: List[SemanticScoreResult] = Field(default_factory=list)
+
+
+class JobPosting(BaseModel):
+    jd_text: str = Field(..., min_length=1)
+    id: Optional[str] = Field(
+        default=None, description="Client identifier echoed back in the results."
+    )
+    title: Optional[str] = None
+    company_name: Optional[str] = None
+
+
+class JobMatchRequest(BaseModel):
+    resume_text: Optional[str] = None
+    session_id: Optional[str] = None
+    jobs: List[JobPosting] = Field(..., min_length=1)
+    top_k: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=job_match_max_top_k,
+        description="How many of the best matches get a full ATS evaluation "
+        "(LLM); defaults to JOB_MATCH_TOP_K, at most JOB_MATCH_MAX_TOP_K, "
+        "0 ranks only.",
+    )
+
+
+class JobMatchResult(BaseModel):
+    index: int
+    rank: int
+    id: Optional[str] = None
+    title: Optional[str] = None
+    company_name: Optional[str] = None
+    score: float
+    semantic: float
+    req_keyword_cov: float
+    found_keywords: List[str] = Field(default_factory=list)
+    missing_keywords: List[str] = Field(default_factory=list)
+    evaluation: Optional[JDEvaluatorResponse] = None
+    evaluation_error: Optional[str] = None
+
+
+class JobMatchResponse(BaseModel):
+    success: bool = True
+    message: str = "Job matching completed"
+    elapsed_ms: float
+    results: List[JobMatchResult] = Field(default_factory=list)
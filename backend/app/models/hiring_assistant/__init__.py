@@ -1,8 +1,9 @@
 """Hiring assistant package exposing request/response models."""
 
-from .request import HiringAssistantRequest, HiringAssistantResponse
+from .request import HiringAnswerMode, HiringAssistantRequest, HiringAssistantResponse
 
 __all__ = [
+    "HiringAnswerMode",
     "HiringAssistantRequest",
     "HiringAssistantResponse",
 ]
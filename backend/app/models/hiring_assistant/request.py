@@ -1,9 +1,12 @@
 """Hiring assistant request and response models."""
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Literal, Optional
 from pydantic import BaseModel, Field
 
 
+HiringAnswerMode = Literal["parallel", "batched"]
+
+
 class HiringAssistantRequest(BaseModel):
     role: str = Field(
         ...,
@@ -33,9 +36,22 @@ class HiringAssistantRequest(BaseModel):
         le=500,
         description="Word limit for each answer.",
     )
+    mode: HiringAnswerMode = Field(
+        "parallel",
+        description=(
+            "'parallel' answers every question with its own concurrent LLM "
+            "call; 'batched' asks for all answers in one structured call."
+        ),
+    )
 
 
 class HiringAssistantResponse(BaseModel):
     success: bool = True
     message: str = "Answers generated successfully."
     data: Dict[str, str]
+    mode: Optional[HiringAnswerMode] = None
+    elapsed_ms: Optional[float] = None
+    timings: Optional[Dict[str, float]] = Field(
+        None,
+        description="Milliseconds spent generating each answer, keyed by question.",
+    )
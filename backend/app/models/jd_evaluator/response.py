@@ -28,3 +28,8 @@ class JDEvaluatorResponse(BaseModel):
     score: int
     reasons_for_the_score: List[str] = Field(default_factory=list)
     suggestions: List[str] = Field(default_factory=list)
+    budget_exhausted: Optional[str] = Field(
+        default=None,
+        description="Agent budget (steps, tool_calls, deadline or tokens) that "
+        "forced the final answer, if any.",
+    )
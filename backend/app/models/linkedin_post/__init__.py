@@ -3,6 +3,7 @@
 from .response import (
     PostGenerationRequest,
     Source,
+    LinkedInPostDraft,
     GeneratedPost,
     StreamingEvent,
     PostGenerationResponse,
@@ -11,6 +12,7 @@ from .response import (
 __all__ = [
     "PostGenerationRequest",
     "Source",
+    "LinkedInPostDraft",
     "GeneratedPost",
     "StreamingEvent",
     "PostGenerationResponse",
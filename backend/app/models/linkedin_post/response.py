@@ -27,6 +27,19 @@ class Source(BaseModel):
     link: str
 
 
+class LinkedInPostDraft(BaseModel):
+    """Structured LLM output: a post with its hashtags and call to action."""
+
+    text: str = Field(
+        ..., description="The post text exactly as it would be published."
+    )
+    hashtags: List[str] = Field(
+        default_factory=list,
+        description="Up to 3 simple hashtags without the # symbol.",
+    )
+    cta: str = Field("", description="A concise call to action for the post.")
+
+
 class GeneratedPost(BaseModel):
     text: str
     hashtags: Optional[List[str]] = None
@@ -9,12 +9,17 @@ from .response import (
     ResumeListResponse,
     ResumeCategoryResponse,
     ScoreRequest,
+    ResumeScoreRequest,
     RecommendationItem,
     ResumeResult,
     ScoreResponse,
     ResumeAnalyzerResponse,
     CompareToJDResponse,
     FormattedAndAnalyzedResumeResponse,
+    ResumeSessionResponse,
+    CandidateSearchRequest,
+    CandidateHit,
+    CandidateSearchResponse,
 )
 
 __all__ = [
@@ -24,10 +29,15 @@ __all__ = [
     "ResumeListResponse",
     "ResumeCategoryResponse",
     "ScoreRequest",
+    "ResumeScoreRequest",
     "RecommendationItem",
     "ResumeResult",
     "ScoreResponse",
     "ResumeAnalyzerResponse",
     "CompareToJDResponse",
     "FormattedAndAnalyzedResumeResponse",
+    "ResumeSessionResponse",
+    "CandidateSearchRequest",
+    "CandidateHit",
+    "CandidateSearchResponse",
 ]
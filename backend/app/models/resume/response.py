@@ -44,6 +44,15 @@ class ScoreRequest(BaseModel):
     jd_text: Optional[str]
     resume_texts: List[str]
     career_level: Optional[str] = "mid"
+    top_k: Optional[int] = Field(
+        None, ge=1, description="Only return the k highest-scoring resumes."
+    )
+
+
+class ResumeScoreRequest(BaseModel):
+    resume_text: Optional[str] = None
+    session_id: Optional[str] = None
+    jd_text: str = Field(..., min_length=1)
 
 
 class RecommendationItem(BaseModel):
@@ -74,6 +83,9 @@ class ResumeResult(BaseModel):
     industry_average: float
     percentile: int
     summary: str
+    # Set by batch scoring: position in the request and rank within the batch.
+    index: Optional[int] = None
+    batch_percentile: Optional[int] = None
 
 
 class ScoreResponse(BaseModel):
@@ -81,6 +93,11 @@ class ScoreResponse(BaseModel):
     career_level: str
     overall_score: float
     results: List[ResumeResult]
+    total: int = 0
+    industry_average: Optional[float] = None
+    # Composite score distribution of the batch (p25, p50, p75, p90, max).
+    percentiles: Dict[str, float] = Field(default_factory=dict)
+    elapsed_ms: Optional[float] = None
 
 
 class ResumeAnalyzerResponse(BaseModel):
@@ -108,3 +125,54 @@ class FormattedAndAnalyzedResumeResponse(BaseModel):
     message: str = "Resume formatted and analyzed successfully"
     cleaned_text: str
     analysis: Any  # ComprehensiveAnalysisData, imported separately
+    session_id: Optional[str] = None
+
+
+class ResumeSessionResponse(BaseModel):
+    success: bool = True
+    message: str = "Resume session ready"
+    session_id: str
+    cleaned_text: str
+    analysis: Any  # ComprehensiveAnalysisData, imported separately
+    expires_at: datetime
+
+
+class CandidateSearchRequest(BaseModel):
+    query: Optional[str] = Field(
+        default=None,
+        description="Job description or free text to rank candidates against.",
+    )
+    predicted_field: Optional[str] = None
+    skills: List[str] = Field(
+        default_factory=list,
+        description="Candidates must have every listed skill.",
+    )
+    page: int = Field(default=1, ge=1)
+    page_size: int = Field(default=20, ge=1, le=100)
+
+
+class CandidateHit(BaseModel):
+    candidate_id: str
+    session_id: Optional[str] = None
+    score: float
+    name: Optional[str] = None
+    email: Optional[str] = None
+    predicted_field: Optional[str] = None
+    skills: List[str] = Field(default_factory=list)
+    matched_skills: List[str] = Field(default_factory=list)
+    analysis: Any  # ComprehensiveAnalysisData, imported separately
+    indexed_at: datetime
+
+
+class CandidateSearchResponse(BaseModel):
+    success: bool = True
+    message: str = "Candidate search completed"
+    total: int
+    page: int
+    page_size: int
+    elapsed_ms: float
+    semantic: bool = Field(
+        default=False,
+        description="Whether ranking used embeddings (false: keyword-only).",
+    )
+    results: List[CandidateHit] = Field(default_factory=list)
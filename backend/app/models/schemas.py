@@ -2,6 +2,8 @@ from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime, timezone
 from pydantic import BaseModel, Field, HttpUrl
 
+from app.core.config import job_match_max_top_k
+
 
 class WorkExperienceEntry(BaseModel):
     role: Optional[str] = None
@@ -139,6 +141,11 @@ class ComprehensiveAnalysisResponse(BaseModel):
     message: str = "Comprehensive analysis successful"
     data: ComprehensiveAnalysisData
     cleaned_text: Optional[str] = None
+    budget_exhausted: Optional[str] = Field(
+        default=None,
+        description="Agent budget (steps, tool_calls, deadline or tokens) that "
+        "forced the final answer, if any.",
+    )
 
 
 class Tip(BaseModel):
@@ -201,6 +208,9 @@ class ErrorResponse(BaseModel):
     error_detail: Optional[str] = None
 
 
+HiringAnswerMode = Literal["parallel", "batched"]
+
+
 class HiringAssistantRequest(BaseModel):
     role: str = Field(
         ...,
@@ -230,12 +240,25 @@ class HiringAssistantRequest(BaseModel):
         le=500,
         description="Word limit for each answer.",
     )
+    mode: HiringAnswerMode = Field(
+        "parallel",
+        description=(
+            "'parallel' answers every question with its own concurrent LLM "
+            "call; 'batched' asks for all answers in one structured call."
+        ),
+    )
 
 
 class HiringAssistantResponse(BaseModel):
     success: bool = True
     message: str = "Answers generated successfully."
     data: Dict[str, str]
+    mode: Optional[HiringAnswerMode] = None
+    elapsed_ms: Optional[float] = None
+    timings: Optional[Dict[str, float]] = Field(
+        None,
+        description="Milliseconds spent generating each answer, keyed by question.",
+    )
 
 
 class ColdMailRequest(BaseModel):
@@ -291,12 +314,31 @@ class FormattedAndAnalyzedResumeResponse(BaseModel):
     message: str = "Resume formatted and analyzed successfully"
     cleaned_text: str
     analysis: ComprehensiveAnalysisData
+    session_id: Optional[str] = None
+
+
+class ResumeSessionResponse(BaseModel):
+    success: bool = True
+    message: str = "Resume session ready"
+    session_id: str
+    cleaned_text: str
+    analysis: ComprehensiveAnalysisData
+    expires_at: datetime
 
 
 class ScoreRequest(BaseModel):
     jd_text: Optional[str]
     resume_texts: List[str]
     career_level: Optional[str] = "mid"
+    top_k: Optional[int] = Field(
+        None, ge=1, description="Only return the k highest-scoring resumes."
+    )
+
+
+class ResumeScoreRequest(BaseModel):
+    resume_text: Optional[str] = None
+    session_id: Optional[str] = None
+    jd_text: str = Field(..., min_length=1)
 
 
 class RecommendationItem(BaseModel):
@@ -327,6 +369,9 @@ class ResumeResult(BaseModel):
     industry_average: float
     percentile: int
     summary: str
+    # Set by batch scoring: position in the request and rank within the batch.
+    index: Optional[int] = None
+    batch_percentile: Optional[int] = None
 
 
 class ScoreResponse(BaseModel):
@@ -334,6 +379,11 @@ class ScoreResponse(BaseModel):
     career_level: str
     overall_score: float
     results: List[ResumeResult]
+    total: int = 0
+    industry_average: Optional[float] = None
+    # Composite score distribution of the batch (p25, p50, p75, p90, max).
+    percentiles: Dict[str, float] = Field(default_factory=dict)
+    elapsed_ms: Optional[float] = None
 
 
 class ResumeAnalyzerResponse(BaseModel):
@@ -379,6 +429,19 @@ class Source(BaseModel):
     link: str
 
 
+class LinkedInPostDraft(BaseModel):
+    """Structured LLM output: a post with its hashtags and call to action."""
+
+    text: str = Field(
+        ..., description="The post text exactly as it would be published."
+    )
+    hashtags: List[str] = Field(
+        default_factory=list,
+        description="Up to 3 simple hashtags without the # symbol.",
+    )
+    cta: str = Field("", description="A concise call to action for the post.")
+
+
 class GeneratedPost(BaseModel):
     text: str
     hashtags: Optional[List[str]] = None
@@ -496,3 +559,127 @@ class JDEvaluatorResponse(BaseModel):
     score: int
     reasons_for_the_score: List[str] = Field(default_factory=list)
     suggestions: List[str] = Field(default_factory=list)
+    budget_exhausted: Optional[str] = Field(
+        default=None,
+        description="Agent budget (steps, tool_calls, deadline or tokens) that "
+        "forced the final answer, if any.",
+    )
+
+
+class SemanticPreScoreRequest(BaseModel):
+    jd_text: str = Field(..., min_length=1)
+    resume_texts: List[str] = Field(default_factory=list)
+    session_ids: List[str] = Field(default_factory=list)
+    top_k: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Return only the k best matching resumes.",
+    )
+
+
+class SectionSimilarity(BaseModel):
+    jd_section: str
+    resume_section: Optional[str] = None
+    similarity: float
+
+
+class SemanticScoreResult(BaseModel):
+    index: int
+    session_id: Optional[str] = None
+    score: float
+    document_similarity: float
+    sections: List[SectionSimilarity] = Field(default_factory=list)
+
+
+class SemanticPreScoreResponse(BaseModel):
+    success: bool = True
+    message: str = "Semantic pre-score completed"
+    model: str
+    elapsed_ms: float
+    results: List[SemanticScoreResult] = Field(default_factory=list)
+
+
+class JobPosting(BaseModel):
+    jd_text: str = Field(..., min_length=1)
+    id: Optional[str] = Field(
+        default=None, description="Client identifier echoed back in the results."
+    )
+    title: Optional[str] = None
+    company_name: Optional[str] = None
+
+
+class JobMatchRequest(BaseModel):
+    resume_text: Optional[str] = None
+    session_id: Optional[str] = None
+    jobs: List[JobPosting] = Field(..., min_length=1)
+    top_k: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=job_match_max_top_k,
+        description="How many of the best matches get a full ATS evaluation "
+        "(LLM); defaults to JOB_MATCH_TOP_K, at most JOB_MATCH_MAX_TOP_K, "
+        "0 ranks only.",
+    )
+
+
+class JobMatchResult(BaseModel):
+    index: int
+    rank: int
+    id: Optional[str] = None
+    title: Optional[str] = None
+    company_name: Optional[str] = None
+    score: float
+    semantic: float
+    req_keyword_cov: float
+    found_keywords: List[str] = Field(default_factory=list)
+    missing_keywords: List[str] = Field(default_factory=list)
+    evaluation: Optional[JDEvaluatorResponse] = None
+    evaluation_error: Optional[str] = None
+
+
+class JobMatchResponse(BaseModel):
+    success: bool = True
+    message: str = "Job matching completed"
+    elapsed_ms: float
+    results: List[JobMatchResult] = Field(default_factory=list)
+
+
+class CandidateSearchRequest(BaseModel):
+    query: Optional[str] = Field(
+        default=None,
+        description="Job description or free text to rank candidates against.",
+    )
+    predicted_field: Optional[str] = None
+    skills: List[str] = Field(
+        default_factory=list,
+        description="Candidates must have every listed skill.",
+    )
+    page: int = Field(default=1, ge=1)
+    page_size: int = Field(default=20, ge=1, le=100)
+
+
+class CandidateHit(BaseModel):
+    candidate_id: str
+    session_id: Optional[str] = None
+    score: float
+    name: Optional[str] = None
+    email: Optional[str] = None
+    predicted_field: Optional[str] = None
+    skills: List[str] = Field(default_factory=list)
+    matched_skills: List[str] = Field(default_factory=list)
+    analysis: ComprehensiveAnalysisData
+    indexed_at: datetime
+
+
+class CandidateSearchResponse(BaseModel):
+    success: bool = True
+    message: str = "Candidate search completed"
+    total: int
+    page: int
+    page_size: int
+    elapsed_ms: float
+    semantic: bool = Field(
+        default=False,
+        description="Whether ranking used embeddings (false: keyword-only).",
+    )
+    results: List[CandidateHit] = Field(default_factory=list)
@@ -55,3 +55,8 @@ class ComprehensiveAnalysisResponse(BaseModel):
     message: str = "Comprehensive analysis successful"
     data: ComprehensiveAnalysisData
     cleaned_text: Optional[str] = None
+    budget_exhausted: Optional[str] = Field(
+        default=None,
+        description="Agent budget (steps, tool_calls, deadline or tokens) that "
+        "forced the final answer, if any.",
+    )
@@ -1,12 +1,37 @@
 from typing import Optional
 import logging
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
 from pydantic import BaseModel, Field, model_validator
 
-from app.models.schemas import JDEvaluatorResponse
-from app.services.ats import ats_evaluate_service
+from app.core.streaming import StreamFormat, event_stream_response
+from app.models.schemas import (
+    JDEvaluatorResponse,
+    JobMatchRequest,
+    JobMatchResponse,
+    ResumeResult,
+    ResumeScoreRequest,
+    ScoreRequest,
+    ScoreResponse,
+    SemanticPreScoreRequest,
+    SemanticPreScoreResponse,
+)
+from app.services.ats import (
+    ats_evaluate_service,
+    ats_score_batch_service,
+    ats_score_service,
+    ats_score_batch_stream,
+    prepare_score_batch,
+    semantic_pre_score_service,
+)
+from app.services.job_match import (
+    job_match_service,
+    job_match_stream,
+    prepare_job_match,
+)
+from app.core.concurrency import run_blocking
 from app.services.process_resume import process_document
+from app.services.resume_session import resolve_resume_text
 
 file_based_router = APIRouter()
 text_based_router = APIRouter()
@@ -14,8 +39,13 @@ logger = logging.getLogger(__name__)
 
 
 class ATSEvaluationPayload(BaseModel):
-    resume_text: str = Field(
-        ..., min_length=1, description="Resume content to evaluate"
+    resume_text: Optional[str] = Field(
+        default=None,
+        description="Resume content to evaluate. Required if session_id is not provided.",
+    )
+    session_id: Optional[str] = Field(
+        default=None,
+        description="Resume session handle returned by /resume/session.",
     )
     jd_text: Optional[str] = Field(
         default=None,
@@ -38,6 +68,8 @@ class ATSEvaluationPayload(BaseModel):
     def ensure_job_description_source(self) -> "ATSEvaluationPayload":
         if not (self.jd_text or self.jd_link):
             raise ValueError("Either jd_text or jd_link must be provided.")
+        if not ((self.resume_text and self.resume_text.strip()) or self.session_id):
+            raise ValueError("Either resume_text or session_id must be provided.")
         return self
 
 
@@ -47,9 +79,11 @@ class ATSEvaluationPayload(BaseModel):
     summary="Evaluate resume against a job description.",
 )
 async def evaluate_ats(payload: ATSEvaluationPayload) -> JDEvaluatorResponse:
+    resume_text = resolve_resume_text(payload.resume_text, payload.session_id)
+
     try:
         return await ats_evaluate_service(
-            resume_text=payload.resume_text,
+            resume_text=resume_text,
             jd_text=payload.jd_text,
             jd_link=payload.jd_link,
             company_name=payload.company_name,
@@ -68,6 +102,103 @@ async def evaluate_ats(payload: ATSEvaluationPayload) -> JDEvaluatorResponse:
         raise
 
 
+@text_based_router.post(
+    "/ats/pre-score",
+    response_model=SemanticPreScoreResponse,
+    summary="Semantic pre-score of resumes against a job description.",
+    description=(
+        "Ranks resumes (texts and/or session ids) against one JD using a local "
+        "embedding model. No LLM call is made; use it to shortlist candidates "
+        "before running /ats/evaluate on the top-k."
+    ),
+)
+async def semantic_pre_score(
+    payload: SemanticPreScoreRequest,
+) -> SemanticPreScoreResponse:
+    return await semantic_pre_score_service(payload)
+
+
+@text_based_router.post(
+    "/ats/score",
+    response_model=ResumeResult,
+    summary="Score one resume against a job description.",
+    description=(
+        "Computes the same local ATS metrics as /ats/score-batch for one resume "
+        "(text or session id); an LLM then writes the strengths, improvement "
+        "areas, recommendations and summary from those numbers."
+    ),
+)
+async def score_resume(payload: ResumeScoreRequest) -> ResumeResult:
+    return await ats_score_service(payload)
+
+
+@text_based_router.post(
+    "/ats/score-batch",
+    response_model=ScoreResponse,
+    summary="Score many resumes against one job description.",
+    description=(
+        "Computes the local ATS metrics (keyword coverage, semantic match, "
+        "contact, content and formatting scores) of every resume against one "
+        "JD, which is parsed once for the whole batch. No LLM call is made. "
+        "Results are ranked by composite score with percentiles within the batch."
+    ),
+)
+async def score_batch(payload: ScoreRequest) -> ScoreResponse:
+    return await ats_score_batch_service(payload)
+
+
+@text_based_router.post(
+    "/ats/score-batch/stream",
+    summary="Score many resumes against one job description (streaming).",
+    description=(
+        "Same as /ats/score-batch, streamed as NDJSON (default) or SSE events: "
+        "start, one partial event per scored chunk, then complete with the batch "
+        "percentiles and the ranking."
+    ),
+)
+async def score_batch_stream(
+    payload: ScoreRequest,
+    stream_format: StreamFormat = Query("ndjson"),
+):
+    jd, chunks = await prepare_score_batch(payload)
+    return event_stream_response(
+        ats_score_batch_stream(payload, jd, chunks), stream_format
+    )
+
+
+@text_based_router.post(
+    "/ats/match-jobs",
+    response_model=JobMatchResponse,
+    summary="Rank many job descriptions for one resume.",
+    description=(
+        "Scores the resume (text or session id) against every job with the "
+        "local ATS metrics, then runs the full ATS evaluation only on the top_k "
+        "matches. Results are ordered by rank."
+    ),
+)
+async def match_jobs(payload: JobMatchRequest) -> JobMatchResponse:
+    return await job_match_service(payload)
+
+
+@text_based_router.post(
+    "/ats/match-jobs/stream",
+    summary="Rank many job descriptions for one resume (streaming).",
+    description=(
+        "Same as /ats/match-jobs, streamed as NDJSON (default) or SSE events: "
+        "ranking (all jobs, local scores), one evaluation per top_k job in rank "
+        "order, then complete."
+    ),
+)
+async def match_jobs_stream(
+    payload: JobMatchRequest,
+    stream_format: StreamFormat = Query("ndjson"),
+):
+    resume_text, ranking = await prepare_job_match(payload)
+    return event_stream_response(
+        job_match_stream(payload, resume_text, ranking), stream_format
+    )
+
+
 @file_based_router.post(
     "/ats/evaluate",
     response_model=JDEvaluatorResponse,
@@ -85,7 +216,9 @@ async def evaluate_ats_file_based(
 ) -> JDEvaluatorResponse:
     # Read and process resume file
     resume_bytes = await resume_file.read()
-    resume_text = process_document(resume_bytes, resume_file.filename)
+    resume_text = await run_blocking(
+        process_document, resume_bytes, resume_file.filename
+    )
     if not resume_text:
         raise HTTPException(status_code=400, detail="Failed to process resume file.")
 
@@ -93,7 +226,7 @@ async def evaluate_ats_file_based(
     jd_text: Optional[str] = None
     if jd_file is not None:
         jd_bytes = await jd_file.read()
-        jd_text = process_document(jd_bytes, jd_file.filename)
+        jd_text = await run_blocking(process_document, jd_bytes, jd_file.filename)
         if not jd_text:
             raise HTTPException(status_code=400, detail="Failed to process JD file.")
 
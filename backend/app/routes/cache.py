@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from app.core.cache import collect_cache_stats
+
+router = APIRouter()
+
+
+@router.get(
+    "/cache/stats",
+    summary="Cache Statistics",
+    description="Hit/miss counters for the backend's caching layers.",
+)
+async def get_cache_stats():
+    return {
+        "success": True,
+        "caches": collect_cache_stats(),
+    }
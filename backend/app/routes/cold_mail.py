@@ -2,6 +2,7 @@ from fastapi import APIRouter, File, UploadFile, Form
 from typing import Optional
 from app.models.schemas import ColdMailResponse
 from app.services import cold_mail
+from app.services.resume_session import resolve_resume_text
 
 
 file_based_router = APIRouter()
@@ -23,7 +24,7 @@ async def cold_mail_generator(
     additional_info_for_llm: Optional[str] = Form(""),
     company_url: Optional[str] = Form(None),
 ):
-    return cold_mail.cold_mail_generator_service(
+    return await cold_mail.cold_mail_generator_service(
         file,
         recipient_name,
         recipient_designation,
@@ -55,7 +56,7 @@ async def cold_mail_editor(
     generated_email_body: str = Form(""),
     edit_inscription: str = Form(""),
 ):
-    return cold_mail.cold_mail_editor_service(
+    return await cold_mail.cold_mail_editor_service(
         file,
         recipient_name,
         recipient_designation,
@@ -80,7 +81,8 @@ text_based_router = APIRouter()
     description="Generates a cold email based on the provided resume text and user inputs.",
 )
 async def cold_mail_generator_v2(
-    resume_text: str = Form(...),
+    resume_text: Optional[str] = Form(None),
+    session_id: Optional[str] = Form(None),
     recipient_name: str = Form(...),
     recipient_designation: str = Form(...),
     company_name: str = Form(...),
@@ -91,7 +93,7 @@ async def cold_mail_generator_v2(
     company_url: Optional[str] = Form(None),
 ):
     return await cold_mail.cold_mail_generator_v2_service(
-        resume_text,
+        resolve_resume_text(resume_text, session_id),
         recipient_name,
         recipient_designation,
         company_name,
@@ -109,7 +111,8 @@ async def cold_mail_generator_v2(
     description="Edit a cold email based on the provided resume text and user inputs.",
 )
 async def cold_mail_editor_v2(
-    resume_text: str = Form(...),
+    resume_text: Optional[str] = Form(None),
+    session_id: Optional[str] = Form(None),
     recipient_name: str = Form(...),
     recipient_designation: str = Form(...),
     company_name: str = Form(...),
@@ -123,7 +126,7 @@ async def cold_mail_editor_v2(
     edit_inscription: str = Form(""),
 ):
     return await cold_mail.cold_mail_editor_v2_service(
-        resume_text,
+        resolve_resume_text(resume_text, session_id),
         recipient_name,
         recipient_designation,
         company_name,
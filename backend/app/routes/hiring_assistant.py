@@ -1,7 +1,20 @@
 from fastapi import APIRouter, File, UploadFile, Form
 from typing import Optional
-from app.models.schemas import HiringAssistantResponse
+from app.core.streaming import StreamFormat, event_stream_response
+from app.models.schemas import HiringAnswerMode, HiringAssistantResponse
 from app.services import hiring_assiatnat
+from app.services.resume_session import resolve_resume_text
+
+ANSWER_MODE_DESCRIPTION = (
+    "'parallel' answers the questions concurrently, one LLM call each; "
+    "'batched' asks for every answer in a single structured call."
+)
+
+STREAM_DESCRIPTION = (
+    "Streams NDJSON (default) or SSE events: start, one answer per question as "
+    "soon as it is ready (with its index, timing and progress), then complete. "
+    "With stream_tokens=true each answer is also streamed as token deltas."
+)
 
 
 file_based_router = APIRouter()
@@ -20,8 +33,37 @@ async def hiring_assistant(
     user_knowledge: Optional[str] = Form(""),
     company_url: Optional[str] = Form(None),
     word_limit: Optional[int] = Form(150),
+    mode: HiringAnswerMode = Form("parallel", description=ANSWER_MODE_DESCRIPTION),
+):
+    return await hiring_assiatnat.hiring_assistant_service(
+        file,
+        role,
+        questions,
+        company_name,
+        user_knowledge,
+        company_url,
+        word_limit,
+        mode,
+    )
+
+
+@file_based_router.post(
+    "/hiring-assistant/stream",
+    description="Generates answers to interview questions and streams each one as it completes. "
+    + STREAM_DESCRIPTION,
+)
+async def hiring_assistant_stream(
+    file: UploadFile = File(...),
+    role: str = Form(...),
+    questions: str = Form(...),
+    company_name: str = Form(...),
+    user_knowledge: Optional[str] = Form(""),
+    company_url: Optional[str] = Form(None),
+    word_limit: Optional[int] = Form(150),
+    stream_format: StreamFormat = Form("ndjson"),
+    stream_tokens: bool = Form(False),
 ):
-    return hiring_assiatnat.hiring_assistant_service(
+    events = await hiring_assiatnat.hiring_assistant_stream_service(
         file,
         role,
         questions,
@@ -29,7 +71,9 @@ async def hiring_assistant(
         user_knowledge,
         company_url,
         word_limit,
+        stream_tokens,
     )
+    return event_stream_response(events, stream_format)
 
 
 text_based_router = APIRouter()
@@ -41,20 +85,53 @@ text_based_router = APIRouter()
     response_model=HiringAssistantResponse,
 )
 async def hiring_assistant2(
-    resume_text: str = Form(...),
+    resume_text: Optional[str] = Form(None),
+    session_id: Optional[str] = Form(None),
     role: str = Form(...),
     questions: str = Form(...),
     company_name: str = Form(...),
     user_knowledge: Optional[str] = Form(""),
     company_url: Optional[str] = Form(None),
     word_limit: Optional[int] = Form(150),
+    mode: HiringAnswerMode = Form("parallel", description=ANSWER_MODE_DESCRIPTION),
 ):
     return await hiring_assiatnat.hiring_assistant_v2_service(
-        resume_text,
+        resolve_resume_text(resume_text, session_id),
+        role,
+        questions,
+        company_name,
+        user_knowledge,
+        company_url,
+        word_limit,
+        mode,
+    )
+
+
+@text_based_router.post(
+    "/hiring-assistant/stream",
+    description="Generates answers to interview questions from resume text and streams each one as it completes. "
+    + STREAM_DESCRIPTION,
+)
+async def hiring_assistant2_stream(
+    resume_text: Optional[str] = Form(None),
+    session_id: Optional[str] = Form(None),
+    role: str = Form(...),
+    questions: str = Form(...),
+    company_name: str = Form(...),
+    user_knowledge: Optional[str] = Form(""),
+    company_url: Optional[str] = Form(None),
+    word_limit: Optional[int] = Form(150),
+    stream_format: StreamFormat = Form("ndjson"),
+    stream_tokens: bool = Form(False),
+):
+    events = await hiring_assiatnat.hiring_assistant_v2_stream_service(
+        resolve_resume_text(resume_text, session_id),
         role,
         questions,
         company_name,
         user_knowledge,
         company_url,
         word_limit,
+        stream_tokens,
     )
+    return event_stream_response(events, stream_format)
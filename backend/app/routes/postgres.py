@@ -1,8 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from app.services import resume_analysis
+from app.services.candidate_index import search_candidates_service
 from app.models.schemas import (
     ResumeListResponse,
     ResumeCategoryResponse,
+    CandidateSearchRequest,
+    CandidateSearchResponse,
 )
 
 router = APIRouter()
@@ -11,10 +14,25 @@ router = APIRouter()
 @router.get(
     "/resumes/",
     response_model=ResumeListResponse,
-    description="Fetch all resumes from the database.",
+    description="Fetch analysed resumes from the candidate index, newest first.",
 )
-async def get_resumes():
-    return resume_analysis.get_resumes_service()
+async def get_resumes(
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    return await resume_analysis.get_resumes_service(limit, offset)
+
+
+@router.post(
+    "/resumes/search",
+    response_model=CandidateSearchResponse,
+    description=(
+        "Rank indexed candidates against a job description or free text, "
+        "filtered by predicted field and required skills, with pagination."
+    ),
+)
+async def search_resumes(payload: CandidateSearchRequest):
+    return await search_candidates_service(payload)
 
 
 @router.get(
@@ -22,5 +40,11 @@ async def get_resumes():
     response_model=ResumeCategoryResponse,
     description="Fetch resumes by category. The category is the predicted field from the resume analysis.",
 )
-async def get_resumes_by_category(category: str):
-    return resume_analysis.get_resumes_by_category_service(category)
+async def get_resumes_by_category(
+    category: str,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    return await resume_analysis.get_resumes_by_category_service(
+        category, limit, offset
+    )
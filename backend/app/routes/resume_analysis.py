@@ -1,23 +1,33 @@
-from fastapi import APIRouter, File, UploadFile, Form
-from app.services import resume_analysis
+from typing import List, Optional
+from fastapi import APIRouter, File, UploadFile, Form, Query
+from app.core.streaming import StreamFormat, event_stream_response
+from app.services import bulk_resume, resume_analysis, resume_session
 from app.models.schemas import (
     ResumeUploadResponse,
     ComprehensiveAnalysisResponse,
     FormattedAndAnalyzedResumeResponse,
     ComprehensiveAnalysisData,
+    ResumeSessionResponse,
 )
 
-
 file_based_router = APIRouter()
 
+FAST_MODE_DESCRIPTION = (
+    "Skip the LLM: fill predicted_field from the local classifier and contact "
+    "details from regex extraction."
+)
+
 
 @file_based_router.post(
     "/resume/analysis",
     summary="Analyze Resume",
     response_model=ResumeUploadResponse,
 )
-async def analyze_resume(file: UploadFile = File(...)):
-    return resume_analysis.analyze_resume_service(file)
+async def analyze_resume(
+    file: UploadFile = File(...),
+    fast: bool = Query(False, description=FAST_MODE_DESCRIPTION),
+):
+    return await resume_analysis.analyze_resume_service(file, fast)
 
 
 @file_based_router.post(
@@ -25,8 +35,11 @@ async def analyze_resume(file: UploadFile = File(...)):
     response_model=ComprehensiveAnalysisResponse,
     description="Performs a comprehensive analysis of the uploaded resume using LLM.",
 )
-async def comprehensive_resume_analysis(file: UploadFile = File(...)):
-    return await resume_analysis.comprehensive_resume_analysis_service(file)
+async def comprehensive_resume_analysis(
+    file: UploadFile = File(...),
+    fast: bool = Query(False, description=FAST_MODE_DESCRIPTION),
+):
+    return await resume_analysis.comprehensive_resume_analysis_service(file, fast)
 
 
 text_based_router = APIRouter()
@@ -37,8 +50,11 @@ text_based_router = APIRouter()
     summary="Format, Clean, and Analyze Resume from File V2",
     response_model=FormattedAndAnalyzedResumeResponse,
 )
-async def format_and_analyze_resume_v2(file: UploadFile = File(...)):
-    return await resume_analysis.format_and_analyze_resume_service(file)
+async def format_and_analyze_resume_v2(
+    file: UploadFile = File(...),
+    fast: bool = Query(False, description=FAST_MODE_DESCRIPTION),
+):
+    return await resume_analysis.format_and_analyze_resume_service(file, fast)
 
 
 @text_based_router.post(
@@ -47,9 +63,78 @@ async def format_and_analyze_resume_v2(file: UploadFile = File(...)):
     response_model=ComprehensiveAnalysisData,
 )
 async def analyze_resume_v2(
-    formated_resume: str = Form(
-        ...,
-        description="Formatted resume text",
+    formated_resume: Optional[str] = Form(
+        None,
+        description="Formatted resume text. Required if session_id is not provided.",
+    ),
+    session_id: Optional[str] = Form(
+        None,
+        description="Resume session handle returned by /resume/session.",
+    ),
+    fast: bool = Query(False, description=FAST_MODE_DESCRIPTION),
+):
+    return await resume_analysis.analyze_resume_v2_service(
+        formated_resume,
+        session_id,
+        fast,
+    )
+
+
+@text_based_router.post(
+    "/resume/session",
+    summary="Create Resume Session",
+    response_model=ResumeSessionResponse,
+    description=(
+        "Parse and analyze a resume once and return a session handle that other "
+        "endpoints accept in place of resume_text."
+    ),
+)
+async def create_resume_session(
+    file: UploadFile = File(...),
+    fast: bool = Query(False, description=FAST_MODE_DESCRIPTION),
+):
+    return await resume_session.create_resume_session_service(file, fast)
+
+
+@text_based_router.get(
+    "/resume/session/{session_id}",
+    summary="Get Resume Session",
+    response_model=ResumeSessionResponse,
+)
+async def get_resume_session(session_id: str):
+    return await resume_session.get_resume_session_service(session_id)
+
+
+@text_based_router.delete(
+    "/resume/session/{session_id}",
+    summary="Delete Resume Session",
+)
+async def delete_resume_session(session_id: str):
+    return await resume_session.delete_resume_session_service(session_id)
+
+
+@text_based_router.post(
+    "/resume/bulk",
+    summary="Bulk Resume Analysis",
+    description=(
+        "Upload many resumes (files and/or ZIP archives). Each file is parsed and "
+        "analyzed concurrently and streamed back as NDJSON (default) or SSE "
+        "events: start, one result per file with progress, then complete."
+    ),
+)
+async def bulk_resume_analysis(
+    files: List[UploadFile] = File(...),
+    stream_format: StreamFormat = Form("ndjson"),
+    max_concurrency: Optional[int] = Form(
+        None,
+        ge=1,
+        le=32,
+        description="Maximum concurrent LLM extractions for this upload.",
     ),
+    fast: bool = Query(False, description=FAST_MODE_DESCRIPTION),
 ):
-    return await resume_analysis.analyze_resume_v2_service(formated_resume)
+    documents = await bulk_resume.collect_bulk_documents(files)
+    return event_stream_response(
+        bulk_resume.bulk_analyze_stream(documents, max_concurrency, fast),
+        stream_format,
+    )
@@ -1,11 +1,13 @@
 from typing import Optional
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.schemas import ComprehensiveAnalysisResponse
 from app.services.tailored_resume import tailor_resume
+from app.core.concurrency import run_blocking
 from app.services.process_resume import process_document
+from app.services.resume_session import resolve_resume_text
 
 
 file_based_router = APIRouter()
@@ -13,7 +15,14 @@ text_based_router = APIRouter()
 
 
 class TailoredResumePayload(BaseModel):
-    resume_text: str = Field(..., min_length=1, description="Resume content to tailor")
+    resume_text: Optional[str] = Field(
+        default=None,
+        description="Resume content to tailor. Required if session_id is not provided.",
+    )
+    session_id: Optional[str] = Field(
+        default=None,
+        description="Resume session handle returned by /resume/session.",
+    )
     job_role: str = Field(..., min_length=1, description="Target job role")
     company_name: Optional[str] = Field(
         default=None,
@@ -28,6 +37,12 @@ class TailoredResumePayload(BaseModel):
         description="Optional job description text for deeper alignment.",
     )
 
+    @model_validator(mode="after")
+    def ensure_resume_source(self) -> "TailoredResumePayload":
+        if not ((self.resume_text and self.resume_text.strip()) or self.session_id):
+            raise ValueError("Either resume_text or session_id must be provided.")
+        return self
+
 
 @text_based_router.post(
     "/resume/tailor",
@@ -38,7 +53,7 @@ async def generate_tailored_resume(
     payload: TailoredResumePayload,
 ) -> ComprehensiveAnalysisResponse:
     return await tailor_resume(
-        resume_text=payload.resume_text,
+        resume_text=resolve_resume_text(payload.resume_text, payload.session_id),
         job_role=payload.job_role,
         company_name=payload.company_name,
         company_website=payload.company_website,
@@ -60,7 +75,9 @@ async def generate_tailored_resume_file_based(
     job_description: Optional[str] = Form(None),
 ) -> ComprehensiveAnalysisResponse:
     resume_bytes = await resume_file.read()
-    resume_text = process_document(resume_bytes, resume_file.filename)
+    resume_text = await run_blocking(
+        process_document, resume_bytes, resume_file.filename
+    )
     if not resume_text:
         raise HTTPException(status_code=400, detail="Failed to process resume file.")
 
@@ -35,4 +35,4 @@ async def get_career_tips(
     else:
         skills_param = skills
 
-    return tips.get_career_tips_service(job_category, skills_param)
+    return await tips.get_career_tips_service(job_category, skills_param)
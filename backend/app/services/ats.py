@@ -5,9 +5,12 @@ Dependencies:
 - Optional Tavily tool if configured.
 """
 
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
 import json
 import logging
+import time
 
 from fastapi import HTTPException
 from pydantic import ValidationError
@@ -16,6 +19,39 @@ from app.services.ats_evaluator import evaluate_ats
 
 from app.models.schemas import JDEvaluatorRequest
 from app.models.schemas import JDEvaluatorResponse
+from app.models.schemas import (
+    ResumeResult,
+    ResumeScoreRequest,
+    ScoreRequest,
+    ScoreResponse,
+    SemanticPreScoreRequest,
+    SemanticPreScoreResponse,
+    SemanticScoreResult,
+    StreamingEvent,
+)
+from app.core.concurrency import run_scoring
+from app.core.config import (
+    ats_batch_chunk_size,
+    ats_batch_max_resumes,
+    ats_semantic_hint,
+)
+from app.services.ats_metrics import (
+    INDUSTRY_AVERAGE,
+    PreparedJD,
+    batch_percentiles,
+    compute_ats_metrics,
+    local_feedback,
+    prepare_jd,
+    score_distribution,
+)
+from app.services.data_processor import ats_analysis_llm, metrics_result
+from app.services.resume_session import get_resume_session, resolve_resume_text
+from app.services.semantic_scorer import (
+    EmbeddingModelUnavailable,
+    embedding_engine,
+    score_resumes,
+    score_resumes_async,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -44,7 +80,7 @@ async def ats_evaluate_service(
             import app.agents.web_content_agent as web_agent
 
             try:
-                jd_text = web_agent.return_markdown(jd_link)
+                jd_text = await web_agent.return_markdown(jd_link)
 
             except Exception as retrieval_error:
                 logger.exception(
@@ -104,7 +140,7 @@ async def ats_evaluate_service(
             },
         )
 
-        analysis_output = evaluate_ats(
+        analysis_output = await evaluate_ats(
             resume_text=resume_text,
             jd_text=jd_text,
             company_name=company_name,
@@ -177,6 +213,7 @@ async def ats_evaluate_service(
             "score": score,
             "reasons_for_the_score": reasons_for_the_score,
             "suggestions": suggestions,
+            "budget_exhausted": analysis_json.get("budget_exhausted"),
         }
 
         logger.debug(
@@ -211,3 +248,228 @@ async def ats_evaluate_service(
             status_code=500,
             detail=f"ATS evaluation failed: {e}",
         )
+
+
+async def semantic_pre_score_service(
+    payload: SemanticPreScoreRequest,
+) -> SemanticPreScoreResponse:
+    """Rank resumes against one JD with the local embedding model (no LLM)."""
+
+    started = time.perf_counter()
+    resumes = [(None, text) for text in payload.resume_texts if text.strip()]
+    resumes.extend(
+        (session_id, get_resume_session(session_id).cleaned_text)
+        for session_id in payload.session_ids
+    )
+    if not resumes:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide at least one resume_text or session_id.",
+        )
+
+    scores = await score_resumes_async(
+        payload.jd_text,
+        [text for _, text in resumes],
+    )
+
+    results = sorted(
+        (
+            SemanticScoreResult(
+                index=index,
+                session_id=session_id,
+                score=score.score,
+                document_similarity=score.document_similarity,
+                sections=score.sections,
+            )
+            for index, ((session_id, _), score) in enumerate(zip(resumes, scores))
+        ),
+        key=lambda result: result.score,
+        reverse=True,
+    )
+    if payload.top_k:
+        results = results[: payload.top_k]
+
+    return SemanticPreScoreResponse(
+        model=embedding_engine.model_name,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        results=results,
+    )
+
+
+# (index in the request, resume text)
+ScoreBatchChunk = List[Tuple[int, str]]
+
+
+async def prepare_score_batch(
+    payload: ScoreRequest,
+) -> Tuple[PreparedJD, List[ScoreBatchChunk]]:
+    """Validate a batch and preprocess its JD once for every resume."""
+    if not (payload.jd_text and payload.jd_text.strip()):
+        raise HTTPException(status_code=400, detail="jd_text is required.")
+
+    resumes = [
+        (index, text)
+        for index, text in enumerate(payload.resume_texts)
+        if text and text.strip()
+    ]
+    if not resumes:
+        raise HTTPException(
+            status_code=400, detail="Provide at least one non-empty resume_text."
+        )
+    if len(resumes) > ats_batch_max_resumes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {ats_batch_max_resumes} resumes can be scored per batch.",
+        )
+
+    jd = await run_scoring(prepare_jd, payload.jd_text)
+    size = max(1, ats_batch_chunk_size)
+    chunks = [resumes[start : start + size] for start in range(0, len(resumes), size)]
+    return jd, chunks
+
+
+def _score_chunk(jd: PreparedJD, chunk: ScoreBatchChunk) -> List[ResumeResult]:
+    semantic: List[Optional[float]] = [None] * len(chunk)
+    if ats_semantic_hint:
+        try:
+            # The JD embeddings are cached after the first chunk.
+            scores = score_resumes(jd.text, [text for _, text in chunk])
+            semantic = [score.score for score in scores]
+
+        except EmbeddingModelUnavailable:
+            pass
+
+    results = []
+    for (index, text), hint in zip(chunk, semantic):
+        metrics = compute_ats_metrics(text, jd, semantic=hint)
+        results.append(metrics_result(metrics, local_feedback(metrics), index=index))
+    return results
+
+
+async def _scored_chunks(
+    jd: PreparedJD, chunks: List[ScoreBatchChunk]
+) -> AsyncIterator[List[ResumeResult]]:
+    """Score chunks concurrently, yielding each as soon as it is done.
+
+    At most ``SCORING_MAX_CONCURRENCY`` chunks (across all requests) hold a
+    thread of the shared blocking pool at once.
+    """
+    tasks = [
+        asyncio.create_task(run_scoring(_score_chunk, jd, chunk)) for chunk in chunks
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _ranked_response(
+    results: List[ResumeResult],
+    payload: ScoreRequest,
+    started: float,
+) -> ScoreResponse:
+    composites = [result.composite for result in results]
+    for result, percentile in zip(results, batch_percentiles(composites)):
+        result.batch_percentile = percentile
+    ranked = sorted(results, key=lambda result: (-result.composite, result.index))
+
+    return ScoreResponse(
+        timestamp=datetime.now(timezone.utc),
+        career_level=payload.career_level or "mid",
+        overall_score=round(sum(composites) / len(composites), 2),
+        results=ranked[: payload.top_k] if payload.top_k else ranked,
+        total=len(results),
+        industry_average=INDUSTRY_AVERAGE,
+        percentiles=score_distribution(composites),
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+
+
+async def ats_score_service(payload: ResumeScoreRequest) -> ResumeResult:
+    """Score one resume against one JD with LLM-written feedback.
+
+    The numbers are the same local metrics as :func:`ats_score_batch_service`;
+    strengths, improvement areas, recommendations and the summary come from
+    the LLM, or from the rule-based feedback if the LLM call fails.
+    """
+    resume_text = resolve_resume_text(payload.resume_text, payload.session_id)
+    result = await ats_analysis_llm(resume_text, payload.jd_text)
+    if not result:
+        raise HTTPException(
+            status_code=400,
+            detail="Both the resume and the job description must have content.",
+        )
+    return ResumeResult(**result)
+
+
+async def ats_score_batch_service(payload: ScoreRequest) -> ScoreResponse:
+    """Score many resumes against one JD locally (no LLM) and rank them."""
+
+    started = time.perf_counter()
+    jd, chunks = await prepare_score_batch(payload)
+    results: List[ResumeResult] = []
+    async for chunk_results in _scored_chunks(jd, chunks):
+        results.extend(chunk_results)
+    return _ranked_response(results, payload, started)
+
+
+async def ats_score_batch_stream(
+    payload: ScoreRequest,
+    jd: PreparedJD,
+    chunks: List[ScoreBatchChunk],
+) -> AsyncIterator[StreamingEvent]:
+    """Like :func:`ats_score_batch_service`, streaming each chunk as it finishes.
+
+    ``partial`` events carry the full results of one chunk (with the
+    industry-based ``percentile``); the final ``complete`` event carries the
+    batch percentiles and the ranking by index.
+    """
+    started = time.perf_counter()
+    total = sum(len(chunk) for chunk in chunks)
+    results: List[ResumeResult] = []
+
+    yield StreamingEvent(
+        type="start",
+        message=f"Scoring {total} resumes",
+        payload={"total": total, "chunks": len(chunks)},
+    )
+
+    try:
+        async for chunk_results in _scored_chunks(jd, chunks):
+            results.extend(chunk_results)
+            yield StreamingEvent(
+                type="partial",
+                message=f"Scored {len(results)}/{total} resumes",
+                payload={
+                    "results": [result.model_dump() for result in chunk_results],
+                    "progress": {"completed": len(results), "total": total},
+                },
+            )
+
+        response = _ranked_response(results, payload, started)
+        yield StreamingEvent(
+            type="complete",
+            message=f"Scored {total} resumes",
+            payload={
+                **response.model_dump(mode="json", exclude={"results"}),
+                "ranking": [
+                    {
+                        "index": result.index,
+                        "composite": result.composite,
+                        "batch_percentile": result.batch_percentile,
+                    }
+                    for result in response.results
+                ],
+            },
+        )
+
+    except Exception as e:
+        logger.exception("Batch ATS scoring failed")
+        yield StreamingEvent(
+            type="error",
+            message="Batch scoring failed",
+            payload={"error": str(e), "completed": len(results)},
+        )
@@ -1,6 +1,7 @@
-from .graph import evaluate_ats, ATSEvaluatorGraph
+from .graph import evaluate_ats, get_ats_graph, ATSEvaluatorGraph
 
 __all__ = [
     "ATSEvaluatorGraph",
     "evaluate_ats",
+    "get_ats_graph",
 ]
@@ -6,16 +6,32 @@ from dataclasses import dataclass
 from dotenv import load_dotenv
 from fastapi import HTTPException
 from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.graph import MessagesState, START, END, StateGraph
-from langgraph.prebuilt import ToolNode, tools_condition
-
-from app.agents.web_content_agent import return_markdown
+from langgraph.graph import START, END, StateGraph
+from langgraph.prebuilt import ToolNode
+
+from app.services.company_content import company_markdown
+from app.core.agent_budget import (
+    FINAL_ANSWER_NODE,
+    AgentBudget,
+    AgentState,
+    agent_step,
+    budget_config,
+    final_answer_step,
+    route_tools,
+)
 from app.data.prompt.jd_evaluator import jd_evaluator_prompt_template as ATS_PROMPT
+from app.core.graph_cache import graph_cache
 from app.core.llm import MODEL_NAME
+from app.core.config import ats_semantic_hint
+from app.services.semantic_scorer import format_semantic_hint, semantic_hint
+from app.services.skill_matcher import format_detected_skills
 
 try:
-    from app.core.llm import llm as default_llm
+    from app.core.model_router import routed_llm
+
+    default_llm = routed_llm("reasoning", "ats_evaluator")
 
 except Exception:
     default_llm = None
@@ -45,13 +61,39 @@ class GraphConfig:
     temperature: float = 0.1
 
 
+def ats_system_messages(
+    resume_text: str,
+    jd_text: str,
+    company_name: str | None = None,
+    company_website_content: str | None = None,
+    semantic_match: str | None = None,
+) -> list:
+    """The evaluator's per-request system prompt (carried in graph state)."""
+    return ATS_PROMPT.format_messages(
+        resume=resume_text.strip(),
+        jd=(jd_text or "").strip(),
+        company_name=(company_name or "the company"),
+        company_website_content=company_website_content or "",
+        detected_skills=format_detected_skills(resume_text),
+        semantic_match=semantic_match or "Not computed",
+    )
+
+
 class ATSEvaluatorGraph:
+    """Tool-enabled ATS evaluator.
+
+    Without ``resume_text`` the graph is request-independent: the system
+    prompt is read from the ``system_messages`` state key, which is how the
+    shared compiled graph from :func:`get_ats_graph` is used.
+    """
+
     def __init__(
         self,
-        resume_text: str,
-        jd_text: str,
+        resume_text: str | None = None,
+        jd_text: str | None = None,
         company_name: str | None = None,
-        company_website: str | None = None,
+        company_website_content: str | None = None,
+        semantic_match: str | None = None,
         llm: ChatGoogleGenerativeAI | None = None,
         config: GraphConfig | None = None,
     ) -> None:
@@ -79,37 +121,47 @@ class ATSEvaluatorGraph:
             else self.llm
         )
 
-        site_md = return_markdown(company_website) if company_website else ""
-
-        self.system_prompt = ATS_PROMPT.format_messages(
-            resume=resume_text.strip(),
-            jd=(jd_text or "").strip(),
-            company_name=(company_name or "the company"),
-            company_website_content=site_md,
+        self.system_prompt = (
+            ats_system_messages(
+                resume_text,
+                jd_text or "",
+                company_name,
+                company_website_content,
+                semantic_match,
+            )
+            if resume_text is not None
+            else None
         )
         self.graph = None
 
-    def agent(self, state: MessagesState):
-        msgs = state["messages"]
-        inp = [*self.system_prompt] + msgs
-        response = self.llm_with_tools.invoke(inp)
-        return {"messages": [response]}
+    async def agent(self, state: AgentState, config: RunnableConfig):
+        return await agent_step(
+            self.llm_with_tools, self.llm, self.system_prompt, state, config
+        )
+
+    async def final_answer(self, state: AgentState, config: RunnableConfig):
+        return await final_answer_step(self.llm, self.system_prompt, state, config)
 
     def build(self):
-        g = StateGraph(MessagesState)
+        g = StateGraph(AgentState)
 
         g.add_node("agent", self.agent)
 
         if self.tools:
             g.add_node("tools", ToolNode(tools=self.tools))
+            g.add_node(FINAL_ANSWER_NODE, self.final_answer)
 
         g.add_edge(START, "agent")
 
         if self.tools:
-            g.add_conditional_edges("agent", tools_condition)
+            g.add_conditional_edges(
+                "agent", route_tools, ["tools", FINAL_ANSWER_NODE, END]
+            )
             g.add_edge("tools", "agent")
+            g.add_edge(FINAL_ANSWER_NODE, END)
 
-        g.add_edge("agent", END)
+        else:
+            g.add_edge("agent", END)
 
         self.graph = g.compile()
 
@@ -119,32 +171,58 @@ class ATSEvaluatorGraph:
         return self.build()
 
 
-def evaluate_ats(
+# The model is routed per call, so one graph serves every model.
+ATS_GRAPH_KEY = "ats_evaluator"
+
+graph_cache.register(ATS_GRAPH_KEY, lambda: ATSEvaluatorGraph().build())
+
+
+def get_ats_graph():
+    """The shared compiled evaluator graph (built once per process)."""
+    return graph_cache.get(ATS_GRAPH_KEY)
+
+
+async def evaluate_ats(
     resume_text: str,
     jd_text: str,
     company_name: str | None = None,
     company_website: str | None = None,
+    budget: AgentBudget | None = None,
 ) -> dict:
     """Run ATS evaluation and return (structured_json, narrative_text).
 
     The model is prompted to return JSON first and then a narrative. We parse the JSON
     from the top of the response and return both components.
+
+    ``budget`` caps the agent's tool loop; when it runs out the model is forced
+    to answer and ``budget_exhausted`` in the result names the budget.
     """
-    graph = ATSEvaluatorGraph(
-        resume_text=resume_text,
-        jd_text=jd_text,
-        company_name=company_name,
-        company_website=company_website,
-    )()
-
-    resp = graph.invoke(
+    semantic_match = None
+    if ats_semantic_hint:
+        semantic_match = format_semantic_hint(
+            await semantic_hint(resume_text, jd_text or "")
+        )
+
+    company_website_content = await company_markdown(company_website)
+
+    graph = get_ats_graph()
+
+    resp = await graph.ainvoke(
         {
             "messages": [
                 HumanMessage(
                     content=("Return JSON first (no preamble)."),
                 )
-            ]
-        }
+            ],
+            "system_messages": ats_system_messages(
+                resume_text=resume_text,
+                jd_text=jd_text,
+                company_name=company_name,
+                company_website_content=company_website_content,
+                semantic_match=semantic_match,
+            ),
+        },
+        config=budget_config(budget),
     )
     content = resp.get("messages", [])[-1].content if resp else ""
     if not isinstance(content, str):
@@ -203,10 +281,14 @@ def evaluate_ats(
                 detail="Failed to parse ATS evaluation JSON output.",
             )
 
+    if isinstance(json_obj, dict):
+        json_obj["budget_exhausted"] = resp.get("budget_exhausted") if resp else None
     return json_obj
 
 
 __all__ = [
     "ATSEvaluatorGraph",
+    "ats_system_messages",
     "evaluate_ats",
+    "get_ats_graph",
 ]
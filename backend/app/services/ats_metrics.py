@@ -0,0 +1,496 @@
+"""Deterministic ATS metrics computed locally from resume and JD text.
+
+Keyword coverage, keyword density, contact completeness, section presence
+and formatting are things a program can measure exactly, so they are no
+longer asked of the LLM. :func:`compute_ats_metrics` fills every numeric
+field of :class:`~app.models.schemas.ResumeResult` in a few milliseconds;
+the LLM is only asked for the qualitative parts (strengths, improvement
+areas, recommendations, summary) with these numbers passed in.
+
+Keywords are the known skills (see :mod:`app.services.skill_matcher`) that
+the JD mentions. Skills that only appear in "preferred" / "nice to have"
+sections or lines are optional, everything else is required.
+"""
+
+import bisect
+import math
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from app.core.config import ats_industry_average, ats_industry_stddev
+from app.services.semantic_scorer import split_sections
+from app.services.skill_matcher import get_skill_matcher
+
+# Composite weights (sum to 1). ``semantic`` is a local lexical similarity
+# unless an embedding score is supplied.
+WEIGHTS = {
+    "req_keyword_cov": 0.30,
+    "opt_keyword_cov": 0.05,
+    "semantic": 0.15,
+    "compatibility": 0.15,
+    "contact": 0.10,
+    "content": 0.15,
+    "formatting": 0.10,
+}
+
+# Heuristic reference composite for the percentile estimate (scores are
+# assumed to be roughly normal around it); set by ATS_INDUSTRY_AVERAGE and
+# ATS_INDUSTRY_STDDEV.
+INDUSTRY_AVERAGE = ats_industry_average
+INDUSTRY_STDDEV = max(ats_industry_stddev, 1e-6)
+
+MAX_RECOMMENDED_KEYWORDS = 10
+
+_OPTIONAL_MARKERS = re.compile(
+    r"\b(preferred|nice[- ]to[- ]have|bonus|a plus|desired|desirable|optional|"
+    r"good to have|advantage)\b",
+    re.IGNORECASE,
+)
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_RE = re.compile(r"(?:\+?\d[\s().-]?){9,14}\d")
+_LINKEDIN_RE = re.compile(r"linkedin\.com/(?:in|pub)/[\w%-]+", re.IGNORECASE)
+_PROFILE_RE = re.compile(
+    r"(github\.com/[\w-]+|gitlab\.com/[\w-]+|https?://[\w.-]+\.\w+)", re.IGNORECASE
+)
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z+#.-]*")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•●▪]|\d+[.)])\s+")
+_METRIC_RE = re.compile(r"\d+(?:[.,]\d+)?\s*(?:%|\+|x\b|k\b|m\b)?|\$\s?\d", re.I)
+_FIRST_PERSON_RE = re.compile(r"\b(I|me|my)\b")
+
+_SECTIONS = {
+    "experience": ("experience", "employment", "work history", "internship"),
+    "education": ("education", "academic", "qualification"),
+    "skills": ("skill", "technologies", "tech stack", "competencies"),
+    "projects": ("project",),
+    "summary": ("summary", "objective", "profile", "about"),
+}
+_ACTION_VERBS = frozenset(
+    "accelerated achieved analyzed architected automated built collaborated "
+    "created decreased delivered deployed designed developed drove engineered "
+    "established executed expanded implemented improved increased initiated "
+    "integrated launched led maintained managed mentored migrated modernized "
+    "optimized orchestrated owned pioneered reduced refactored resolved "
+    "scaled shipped simplified spearheaded streamlined tested trained "
+    "transformed upgraded wrote".split()
+)
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our "
+    "that the their this to was we were will with you your who what which "
+    "about into than then them they using use used work working team role "
+    "experience years year strong ability skills including etc".split()
+)
+
+
+@dataclass
+class ATSMetrics:
+    composite: float
+    semantic: float
+    compatibility: float
+    contact: float
+    content: float
+    req_keyword_cov: float
+    opt_keyword_cov: float
+    formatting: float
+    keyword_density: float
+    found_keywords: List[str] = field(default_factory=list)
+    missing_keywords: List[str] = field(default_factory=list)
+    recommended_keywords: List[str] = field(default_factory=list)
+    industry_average: float = INDUSTRY_AVERAGE
+    percentile: int = 50
+    # Inputs behind the scores, passed to the LLM as context.
+    checks: Dict[str, bool] = field(default_factory=dict)
+    word_count: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _round(value: float) -> float:
+    return round(max(0.0, min(1.0, value)), 4)
+
+
+def jd_keywords(jd_text: str) -> Tuple[List[str], List[str]]:
+    """Split the skills named in the JD into (required, optional)."""
+    matcher = get_skill_matcher()
+    required: Dict[str, None] = {}
+    optional: Dict[str, None] = {}
+
+    for title, body in split_sections(jd_text):
+        section_optional = bool(_OPTIONAL_MARKERS.search(title))
+        for line in body.splitlines():
+            target = (
+                optional
+                if section_optional or _OPTIONAL_MARKERS.search(line)
+                else required
+            )
+            for skill in matcher.extract(line):
+                target.setdefault(skill, None)
+
+    # A skill that is required anywhere is required.
+    return list(required), [s for s in optional if s not in required]
+
+
+def _find_sections(resume_text: str) -> Set[str]:
+    # The untitled opening text is not a section, whatever it contains.
+    titles = [
+        title.lower()
+        for title, _ in split_sections(resume_text, preamble_title="")
+        if title
+    ]
+    return {
+        name
+        for name, markers in _SECTIONS.items()
+        if any(marker in title for title in titles for marker in markers)
+    }
+
+
+def _has_name(resume_text: str) -> bool:
+    for line in resume_text.splitlines():
+        line = line.strip().strip("#* ")
+        if not line:
+            continue
+        words = line.split()
+        return 2 <= len(words) <= 5 and all(w[:1].isalpha() for w in words)
+    return False
+
+
+def _bag(text: str) -> Counter:
+    return Counter(
+        word
+        for word in (w.lower() for w in _WORD_RE.findall(text))
+        if len(word) > 2 and word not in _STOPWORDS
+    )
+
+
+def _norm(bag: Counter) -> float:
+    return math.sqrt(sum(v * v for v in bag.values()))
+
+
+@dataclass
+class PreparedJD:
+    """Everything derived from the JD alone, computed once per batch."""
+
+    text: str
+    required: List[str]
+    optional: List[str]
+    bag: Counter
+    norm: float
+
+
+def prepare_jd(jd_text: str) -> PreparedJD:
+    jd_text = jd_text or ""
+    required, optional = jd_keywords(jd_text)
+    bag = _bag(jd_text)
+    return PreparedJD(jd_text, required, optional, bag, _norm(bag))
+
+
+def _percentile(composite: float) -> int:
+    z = (composite - INDUSTRY_AVERAGE) / INDUSTRY_STDDEV
+    return int(round(50 * (1 + math.erf(z / math.sqrt(2)))))
+
+
+@dataclass
+class PreparedResume:
+    """Everything derived from the resume alone, reused across JDs."""
+
+    text: str
+    skills: Dict[str, int]
+    word_count: int
+    checks: Dict[str, bool]
+    contact: float
+    compatibility: float
+    content: float
+    formatting: float
+    bag: Counter
+    norm: float
+
+
+def prepare_resume(resume_text: str) -> PreparedResume:
+    resume_text = resume_text or ""
+    matcher = get_skill_matcher()
+    skills = {m.skill: m.count for m in matcher.match(resume_text)}
+    word_count = len(_WORD_RE.findall(resume_text))
+
+    sections = _find_sections(resume_text)
+    checks = {
+        "name": _has_name(resume_text),
+        "email": bool(_EMAIL_RE.search(resume_text)),
+        "phone": bool(_PHONE_RE.search(resume_text)),
+        "linkedin": bool(_LINKEDIN_RE.search(resume_text)),
+        "profile_link": bool(_PROFILE_RE.search(resume_text)),
+        **{f"{name}_section": name in sections for name in _SECTIONS},
+    }
+
+    contact = (
+        checks["email"] + checks["phone"] + checks["linkedin"]
+    ) / 3 + 0.1 * checks["profile_link"]
+    compatibility = (
+        sum(
+            checks[key]
+            for key in (
+                "name",
+                "email",
+                "phone",
+                "education_section",
+                "experience_section",
+                "skills_section",
+            )
+        )
+        / 6
+    )
+
+    lines = [line for line in resume_text.splitlines() if line.strip()]
+    bullets = [line for line in lines if _BULLET_RE.match(line)]
+    bullet_text = [_BULLET_RE.sub("", line).strip() for line in bullets]
+    with_metrics = sum(bool(_METRIC_RE.search(line)) for line in bullet_text)
+    with_verbs = sum(
+        bool(line) and line.split()[0].lower().strip(",.") in _ACTION_VERBS
+        for line in bullet_text
+    )
+    first_person = len(_FIRST_PERSON_RE.findall(resume_text))
+    if bullet_text:
+        content = (
+            0.5 * with_metrics / len(bullet_text)
+            + 0.5 * with_verbs / len(bullet_text)
+            - min(0.2, 0.02 * first_person)
+        )
+    else:
+        content = 0.2 if word_count else 0.0
+
+    long_lines = sum(len(line) > 200 for line in lines)
+    formatting_checks = [
+        len(sections) >= 3,
+        bool(bullets),
+        300 <= word_count <= 1200,
+        not lines or long_lines / len(lines) < 0.1,
+        # Contact details near the top, where parsers look for them.
+        bool(_EMAIL_RE.search("\n".join(lines[:8]))),
+    ]
+    formatting = sum(formatting_checks) / len(formatting_checks)
+
+    bag = _bag(resume_text)
+    return PreparedResume(
+        text=resume_text,
+        skills=skills,
+        word_count=word_count,
+        checks=checks,
+        contact=contact,
+        compatibility=compatibility,
+        content=content,
+        formatting=formatting,
+        bag=bag,
+        norm=_norm(bag),
+    )
+
+
+def _lexical_similarity(resume: PreparedResume, jd: PreparedJD) -> float:
+    dot = sum(count * resume.bag[word] for word, count in jd.bag.items())
+    norm = resume.norm * jd.norm
+    return dot / norm if norm else 0.0
+
+
+def compute_ats_metrics(
+    resume: Union[str, PreparedResume],
+    jd: Union[str, PreparedJD],
+    semantic: Optional[float] = None,
+) -> ATSMetrics:
+    """Score a resume against a JD without calling an LLM.
+
+    ``resume`` and ``jd`` are texts or, when one side is scored against many
+    others, the results of :func:`prepare_resume` / :func:`prepare_jd`.
+    ``semantic`` overrides the local lexical similarity, e.g. with the
+    embedding score from :mod:`app.services.semantic_scorer`.
+    """
+    if not isinstance(resume, PreparedResume):
+        resume = prepare_resume(resume)
+    if not isinstance(jd, PreparedJD):
+        jd = prepare_jd(jd)
+    required, optional = jd.required, jd.optional
+
+    found = [s for s in required + optional if s in resume.skills]
+    missing_required = [s for s in required if s not in resume.skills]
+    missing_optional = [s for s in optional if s not in resume.skills]
+
+    req_cov = (
+        (len(required) - len(missing_required)) / len(required) if required else 1.0
+    )
+    opt_cov = (
+        (len(optional) - len(missing_optional)) / len(optional) if optional else 1.0
+    )
+
+    keyword_hits = sum(resume.skills[s] for s in found)
+    density = 100 * keyword_hits / resume.word_count if resume.word_count else 0.0
+
+    if semantic is None:
+        semantic = _lexical_similarity(resume, jd)
+
+    scores = {
+        "req_keyword_cov": _round(req_cov),
+        "opt_keyword_cov": _round(opt_cov),
+        "semantic": _round(semantic),
+        "compatibility": _round(resume.compatibility),
+        "contact": _round(resume.contact),
+        "content": _round(resume.content),
+        "formatting": _round(resume.formatting),
+    }
+    composite = round(100 * sum(WEIGHTS[k] * v for k, v in scores.items()), 2)
+
+    return ATSMetrics(
+        composite=composite,
+        keyword_density=round(density, 2),
+        found_keywords=found,
+        missing_keywords=missing_required + missing_optional,
+        recommended_keywords=(missing_required + missing_optional)[
+            :MAX_RECOMMENDED_KEYWORDS
+        ],
+        percentile=_percentile(composite),
+        checks=dict(resume.checks),
+        word_count=resume.word_count,
+        **scores,
+    )
+
+
+_CHECK_FEEDBACK = {
+    "email": (
+        "Contact",
+        "Add an email address",
+        "Recruiters and ATS parsers need a reachable email.",
+    ),
+    "phone": (
+        "Contact",
+        "Add a phone number",
+        "Most application systems expect a phone number.",
+    ),
+    "linkedin": (
+        "Contact",
+        "Add your LinkedIn profile",
+        "A LinkedIn URL is a commonly parsed field.",
+    ),
+    "experience_section": (
+        "Structure",
+        "Add an Experience section",
+        "ATS parsers look for a clearly titled experience section.",
+    ),
+    "education_section": (
+        "Structure",
+        "Add an Education section",
+        "ATS parsers look for a clearly titled education section.",
+    ),
+    "skills_section": (
+        "Structure",
+        "Add a Skills section",
+        "A dedicated skills section makes keywords easy to match.",
+    ),
+}
+
+
+def local_feedback(metrics: ATSMetrics) -> dict:
+    """Rule-based strengths, improvement areas and recommendations.
+
+    Used when no LLM feedback is requested (batch scoring) or available.
+    """
+    strengths, areas, recommendations = [], [], []
+
+    if metrics.req_keyword_cov >= 0.8:
+        strengths.append(
+            f"Covers {metrics.req_keyword_cov:.0%} of the required keywords."
+        )
+    if metrics.contact >= 1.0:
+        strengths.append("Complete contact details.")
+    if metrics.content >= 0.6:
+        strengths.append("Bullet points are action-led and quantified.")
+    if metrics.formatting >= 0.8:
+        strengths.append("Clear, ATS-friendly structure.")
+
+    if metrics.recommended_keywords:
+        keywords = ", ".join(metrics.recommended_keywords)
+        areas.append(f"Missing JD keywords: {keywords}.")
+        recommendations.append(
+            {
+                "title": "Cover the missing JD keywords",
+                "description": f"Where accurate, mention {keywords} in your "
+                "skills or experience.",
+                "category": "Keywords",
+                "priority": "high" if metrics.req_keyword_cov < 0.6 else "medium",
+                "impact": "high",
+            }
+        )
+    for check, (category, title, description) in _CHECK_FEEDBACK.items():
+        if not metrics.checks.get(check, True):
+            areas.append(title.replace("Add", "Missing", 1) + ".")
+            recommendations.append(
+                {
+                    "title": title,
+                    "description": description,
+                    "category": category,
+                    "priority": "high" if category == "Contact" else "medium",
+                    "impact": "medium",
+                }
+            )
+    if metrics.content < 0.5:
+        areas.append("Few bullet points start with action verbs or show metrics.")
+        recommendations.append(
+            {
+                "title": "Quantify achievements",
+                "description": "Start bullets with an action verb and add numbers "
+                "(scale, %, time or money saved).",
+                "category": "Content",
+                "priority": "medium",
+                "impact": "high",
+            }
+        )
+
+    for index, item in enumerate(recommendations):
+        item["id"] = f"rec-{index + 1}"
+
+    return {
+        "strengths": strengths,
+        "areas_for_improvement": areas,
+        "recommendations": recommendations,
+        "summary": (
+            f"Composite ATS score {metrics.composite:.0f}/100 with "
+            f"{metrics.req_keyword_cov:.0%} of the required keywords covered."
+        ),
+    }
+
+
+def batch_percentiles(composites: Sequence[float]) -> List[int]:
+    """Percentile rank of each score within the batch (ties share a rank)."""
+    ordered = sorted(composites)
+    total = len(ordered)
+    return [
+        int(round(100 * bisect.bisect_right(ordered, score) / total))
+        for score in composites
+    ]
+
+
+def score_distribution(composites: Sequence[float]) -> Dict[str, float]:
+    """Nearest-rank p25/p50/p75/p90 and max of a batch of composite scores."""
+    ordered = sorted(composites)
+    if not ordered:
+        return {}
+    total = len(ordered)
+    distribution = {
+        f"p{q}": ordered[max(0, math.ceil(q / 100 * total) - 1)]
+        for q in (25, 50, 75, 90)
+    }
+    distribution["max"] = ordered[-1]
+    return distribution
+
+
+__all__ = [
+    "ATSMetrics",
+    "INDUSTRY_AVERAGE",
+    "PreparedJD",
+    "PreparedResume",
+    "WEIGHTS",
+    "batch_percentiles",
+    "compute_ats_metrics",
+    "jd_keywords",
+    "local_feedback",
+    "prepare_jd",
+    "prepare_resume",
+    "score_distribution",
+]
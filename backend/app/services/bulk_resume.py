@@ -0,0 +1,337 @@
+"""Bulk resume ingestion for recruiters.
+
+Accepts many resumes (individual uploads and/or ZIP archives), parses them
+on the shared process pool, runs LLM extraction under a per-request
+concurrency cap and streams one ``StreamingEvent`` per file as soon as it is
+done, followed by a summary matching the ``BulkUpload`` counters
+(``totalFiles``, ``succeeded``, ``failed``).
+
+Every successfully analysed resume is stored as a resume session so the
+recruiter can run ATS or other features on it without re-uploading.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import time
+import zipfile
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.concurrency import run_in_process
+from app.core.config import (
+    bulk_classify_batch_size,
+    bulk_llm_concurrency,
+    bulk_max_file_bytes,
+    bulk_max_files,
+    bulk_max_total_bytes,
+)
+from app.models.schemas import (
+    ComprehensiveAnalysisData,
+    ErrorResponse,
+    StreamingEvent,
+)
+from app.services.data_processor import format_and_analyse_resumes
+from app.services.fast_analysis import fast_comprehensive_analyses
+from app.services.process_resume import is_valid_resume, process_document
+from app.services.resume_analysis import build_comprehensive_analysis
+from app.services.resume_session import create_resume_session
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {".pdf", ".doc", ".docx", ".txt", ".md"}
+
+BulkDocument = Tuple[str, bytes]
+
+
+def _bulk_error(message: str, status_code: int = 400) -> HTTPException:
+    return HTTPException(
+        status_code=status_code,
+        detail=ErrorResponse(message=message).model_dump(),
+    )
+
+
+def extract_documents_from_zip(zip_bytes: bytes) -> List[BulkDocument]:
+    """Return ``(file_name, bytes)`` for every supported resume in a ZIP.
+
+    Archives are read in memory; entries are size-checked before they are
+    decompressed so a malicious archive cannot exhaust memory.
+    """
+    documents: List[BulkDocument] = []
+    total_bytes = 0
+
+    try:
+        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as archive:
+            for info in archive.infolist():
+                name = info.filename
+                base_name = os.path.basename(name)
+                if (
+                    info.is_dir()
+                    or "__MACOSX" in name
+                    or not base_name
+                    or base_name.startswith(".")
+                ):
+                    continue
+
+                if os.path.splitext(base_name)[1].lower() not in SUPPORTED_EXTENSIONS:
+                    continue
+
+                if info.file_size > bulk_max_file_bytes:
+                    logger.warning("Skipping oversized ZIP entry %s", name)
+                    continue
+
+                total_bytes += info.file_size
+                if total_bytes > bulk_max_total_bytes:
+                    raise _bulk_error("ZIP archive exceeds the bulk upload size limit.")
+
+                documents.append((base_name, archive.read(info)))
+
+    except zipfile.BadZipFile:
+        raise _bulk_error("Invalid ZIP file.")
+
+    return documents
+
+
+async def collect_bulk_documents(files: List[UploadFile]) -> List[BulkDocument]:
+    """Flatten uploaded files and ZIP archives into a list of documents.
+
+    ``BULK_MAX_TOTAL_BYTES`` applies to all documents of the upload together,
+    whether they were sent as files or inside archives.
+    """
+    documents: List[BulkDocument] = []
+    total_bytes = 0
+    for upload in files:
+        file_name = upload.filename or "resume"
+        file_bytes = await upload.read()
+        if os.path.splitext(file_name)[1].lower() == ".zip":
+            extracted = extract_documents_from_zip(file_bytes)
+        else:
+            extracted = [(file_name, file_bytes)]
+        documents.extend(extracted)
+
+        total_bytes += sum(len(data) for _, data in extracted)
+        if total_bytes > bulk_max_total_bytes:
+            raise _bulk_error("Upload exceeds the bulk upload size limit.")
+
+        if len(documents) > bulk_max_files:
+            raise _bulk_error(
+                f"Too many files; a bulk upload accepts at most {bulk_max_files}."
+            )
+
+    if not documents:
+        raise _bulk_error("No supported resume files were found in the upload.")
+
+    return documents
+
+
+def _new_result(index: int, file_name: str) -> dict:
+    return {
+        "index": index,
+        "file_name": file_name,
+        "success": False,
+    }
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _extract_text(file_name: str, file_bytes: bytes) -> str:
+    if len(file_bytes) > bulk_max_file_bytes:
+        raise ValueError("File exceeds the bulk upload size limit.")
+
+    resume_text = await run_in_process(process_document, file_bytes, file_name)
+    if resume_text is None:
+        raise ValueError("Unsupported file type or error processing file.")
+
+    if not is_valid_resume(resume_text):
+        raise ValueError("Invalid resume format or content.")
+
+    return resume_text
+
+
+def _store_analysis(
+    result: dict,
+    resume_text: str,
+    analysis: ComprehensiveAnalysisData,
+) -> None:
+    session = create_resume_session(
+        cleaned_text=resume_text,
+        analysis=analysis,
+        file_name=result["file_name"],
+    )
+    result.update(
+        success=True,
+        session_id=session.session_id,
+        analysis=analysis.model_dump(),
+    )
+
+
+async def _analyze_document(
+    index: int,
+    file_name: str,
+    file_bytes: bytes,
+    llm_slots: asyncio.Semaphore,
+) -> dict:
+    started = time.perf_counter()
+    result = _new_result(index, file_name)
+
+    try:
+        resume_text = await _extract_text(file_name, file_bytes)
+        async with llm_slots:
+            analysis_dict = await format_and_analyse_resumes(raw_text=resume_text)
+
+        if not analysis_dict:
+            raise ValueError("LLM returned no analysis for this resume.")
+
+        analysis = build_comprehensive_analysis(analysis_dict)
+        _store_analysis(result, resume_text, analysis)
+
+    except Exception as e:
+        result["error"] = str(e)
+
+    result["elapsed_ms"] = _elapsed_ms(started)
+    return result
+
+
+async def _parse_document(
+    index: int, file_name: str, file_bytes: bytes
+) -> Tuple[dict, Optional[str], float]:
+    """Parse one document for fast mode; returns (result, text or None, start)."""
+    started = time.perf_counter()
+    result = _new_result(index, file_name)
+    try:
+        return result, await _extract_text(file_name, file_bytes), started
+
+    except Exception as e:
+        result.update(error=str(e), elapsed_ms=_elapsed_ms(started))
+        return result, None, started
+
+
+async def _fast_analyzed(
+    parsed: List[Tuple[dict, str, float]],
+) -> List[dict]:
+    """Classify a batch of parsed resumes with one classifier call."""
+    analyses = await fast_comprehensive_analyses([text for _, text, _ in parsed])
+    results = []
+    for (result, resume_text, started), analysis in zip(parsed, analyses):
+        try:
+            _store_analysis(result, resume_text, analysis)
+
+        except Exception as e:
+            result["error"] = str(e)
+
+        result["elapsed_ms"] = _elapsed_ms(started)
+        results.append(result)
+    return results
+
+
+async def _fast_results(
+    tasks: List["asyncio.Task[Tuple[dict, Optional[str], float]]"],
+) -> AsyncIterator[dict]:
+    """Yield fast-mode results, classifying parsed resumes in batches."""
+    pending: List[Tuple[dict, str, float]] = []
+    remaining = len(tasks)
+    for next_done in asyncio.as_completed(tasks):
+        result, resume_text, started = await next_done
+        remaining -= 1
+        if resume_text is None:
+            yield result
+        else:
+            pending.append((result, resume_text, started))
+
+        if pending and (
+            len(pending) >= max(1, bulk_classify_batch_size) or not remaining
+        ):
+            for analysed in await _fast_analyzed(pending):
+                yield analysed
+            pending = []
+
+
+async def _llm_results(
+    tasks: List["asyncio.Task[dict]"],
+) -> AsyncIterator[dict]:
+    for next_done in asyncio.as_completed(tasks):
+        yield await next_done
+
+
+async def bulk_analyze_stream(
+    documents: List[BulkDocument],
+    max_concurrency: Optional[int] = None,
+    fast: bool = False,
+) -> AsyncIterator[StreamingEvent]:
+    """Analyse ``documents`` concurrently, yielding events as files finish.
+
+    In fast mode the parsed resumes are classified in batches of
+    ``BULK_CLASSIFY_BATCH_SIZE`` rather than one classifier call per file.
+    """
+    total = len(documents)
+    llm_slots = asyncio.Semaphore(max(1, max_concurrency or bulk_llm_concurrency))
+    started = time.perf_counter()
+    succeeded = failed = 0
+
+    yield StreamingEvent(
+        type="start",
+        message=f"Processing {total} resumes",
+        payload={"totalFiles": total},
+    )
+
+    if fast:
+        tasks = [
+            asyncio.create_task(_parse_document(index, name, data))
+            for index, (name, data) in enumerate(documents)
+        ]
+        results = _fast_results(tasks)
+    else:
+        tasks = [
+            asyncio.create_task(_analyze_document(index, name, data, llm_slots))
+            for index, (name, data) in enumerate(documents)
+        ]
+        results = _llm_results(tasks)
+
+    try:
+        async for result in results:
+            if result["success"]:
+                succeeded += 1
+            else:
+                failed += 1
+
+            yield StreamingEvent(
+                type="result",
+                message=f"{result['file_name']}: "
+                + ("analyzed" if result["success"] else "failed"),
+                payload={
+                    **result,
+                    "progress": {
+                        "completed": succeeded + failed,
+                        "totalFiles": total,
+                        "succeeded": succeeded,
+                        "failed": failed,
+                    },
+                },
+            )
+
+        yield StreamingEvent(
+            type="complete",
+            message=f"Processed {total} resumes",
+            payload={
+                "totalFiles": total,
+                "succeeded": succeeded,
+                "failed": failed,
+                "elapsed_ms": _elapsed_ms(started),
+            },
+        )
+
+    finally:
+        # The client may disconnect mid-stream; don't leave work running.
+        for task in tasks:
+            task.cancel()
+
+
+__all__ = [
+    "extract_documents_from_zip",
+    "collect_bulk_documents",
+    "bulk_analyze_stream",
+]
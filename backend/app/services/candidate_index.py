@@ -0,0 +1,737 @@
+"""Recruiter candidate search over every analysed resume.
+
+Each analysed resume becomes a candidate keyed by the hash of its cleaned
+text, so re-uploading the same resume updates one record instead of adding
+a duplicate. Three structures back the search:
+
+* SQLite (``candidates.sqlite3``) is the source of truth. It holds the
+  analysis, skills and embedding of every candidate and is written on every
+  add.
+* A FAISS ``IndexIDMap2(IndexHNSWFlat)`` over the embeddings answers
+  semantic queries in about a millisecond at 100k candidates. It is
+  snapshotted to ``candidates.faiss`` every
+  ``CANDIDATE_INDEX_FLUSH_INTERVAL`` seconds and on shutdown. HNSW cannot
+  delete, so replaced vectors stay in the graph as tombstones and are
+  skipped at query time until the next snapshot rebuilds the graph without
+  them; on load the snapshot is reconciled with SQLite (missing rows are
+  added, unknown ids become tombstones).
+* An in-memory inverted index (skill / predicted field -> ids) resolves
+  the filters by set intersection and the keyword part of the score.
+
+The FAISS graph and postings live in each worker process. With several
+uvicorn workers, every worker checks SQLite's ``data_version`` before a
+search and loads the rows other workers committed since, so a candidate
+indexed by one worker is searchable from all of them.
+
+Embeddings come from :mod:`app.services.semantic_scorer`. Without a model,
+candidates are still indexed and searches fall back to keyword ranking
+(skill overlap with the query, then recency).
+"""
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.concurrency import run_blocking
+from app.core.config import (
+    candidate_index_dir,
+    candidate_index_ef_search,
+    candidate_index_enabled,
+    candidate_index_flush_interval,
+    candidate_index_hnsw_m,
+)
+from app.models.schemas import (
+    CandidateHit,
+    CandidateSearchRequest,
+    CandidateSearchResponse,
+    ComprehensiveAnalysisData,
+)
+from app.services.semantic_scorer import (
+    EmbeddingModelUnavailable,
+    embedding_engine,
+    split_sections,
+)
+from app.services.skill_matcher import get_skill_matcher
+
+# Below this many filtered candidates, score them exactly instead of via HNSW.
+EXACT_SEARCH_LIMIT = 4096
+
+# Weight of query/candidate skill overlap in the hybrid score.
+KEYWORD_WEIGHT = 0.2
+
+
+def _norm(value: str) -> str:
+    return " ".join(value.split()).lower()
+
+
+def candidate_key(cleaned_text: str) -> str:
+    return hashlib.sha256(cleaned_text.strip().encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class CandidateRecord:
+    row_id: int
+    candidate_id: str
+    predicted_field: Optional[str]
+    skills: Tuple[str, ...]
+    indexed_at: float
+
+
+def candidate_skills(
+    cleaned_text: str, analysis: ComprehensiveAnalysisData
+) -> List[str]:
+    """Skills from the LLM analysis plus the local skill matcher, deduplicated."""
+    skills: Dict[str, str] = {}
+    for entry in analysis.skills_analysis:
+        if entry.skill_name:
+            skills.setdefault(_norm(entry.skill_name), entry.skill_name.strip())
+    for skill in get_skill_matcher().extract(cleaned_text):
+        skills.setdefault(_norm(skill), skill)
+    return list(skills.values())
+
+
+def _document_vector(cleaned_text: str) -> np.ndarray:
+    """Mean of the section embeddings, re-normalised for inner-product search."""
+    sections = split_sections(cleaned_text) or [("Resume", cleaned_text)]
+    vectors = embedding_engine.embed([f"{title}: {body}" for title, body in sections])
+    vector = vectors.mean(axis=0)
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm else vector).astype(np.float32)
+
+
+class CandidateIndex:
+    """Persistent hybrid (vector + keyword) index of analysed resumes."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.db_path = os.path.join(directory, "candidates.sqlite3")
+        self.faiss_path = os.path.join(directory, "candidates.faiss")
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._faiss = None
+        self._dim: Optional[int] = None
+        self._records: Dict[int, CandidateRecord] = {}
+        self._by_candidate: Dict[str, int] = {}
+        self._skill_postings: Dict[str, Set[int]] = defaultdict(set)
+        self._field_postings: Dict[str, Set[int]] = defaultdict(set)
+        self._vector_ids: Set[int] = set()
+        self._tombstones: Set[int] = set()
+        self._max_row_id = 0
+        self._data_version: Optional[int] = None
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._compacting = threading.Lock()
+        # Searches read SQLite on their own connection, outside ``_lock``.
+        self._readers = threading.local()
+
+    # -- storage -----------------------------------------------------------
+
+    def _open(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+
+        os.makedirs(self.directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+        with conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS candidates ("
+                "row_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "candidate_id TEXT UNIQUE NOT NULL, session_id TEXT, "
+                "predicted_field TEXT, skills TEXT NOT NULL, analysis TEXT NOT NULL, "
+                "embedding BLOB, indexed_at REAL NOT NULL)"
+            )
+        self._conn = conn
+        self._load()
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            self._readers.conn = conn
+        return conn
+
+    def _rows_after(self, row_id: int) -> List[Tuple[CandidateRecord, Optional[bytes]]]:
+        assert self._conn is not None
+        return [
+            (
+                CandidateRecord(
+                    row_id=rid,
+                    candidate_id=candidate_id,
+                    predicted_field=field,
+                    skills=tuple(json.loads(skills)),
+                    indexed_at=indexed_at,
+                ),
+                blob,
+            )
+            for rid, candidate_id, field, skills, indexed_at, blob in self._conn.execute(
+                "SELECT row_id, candidate_id, predicted_field, skills, indexed_at, "
+                "embedding FROM candidates WHERE row_id > ? ORDER BY row_id",
+                (row_id,),
+            )
+        ]
+
+    def _current_data_version(self) -> int:
+        assert self._conn is not None
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _load(self) -> None:
+        self._data_version = self._current_data_version()
+        vectors: List[Tuple[int, bytes]] = []
+        for record, blob in self._rows_after(0):
+            self._max_row_id = record.row_id
+            self._remember(record)
+            if blob:
+                vectors.append((record.row_id, blob))
+
+        if not vectors:
+            return
+
+        import faiss
+
+        self._dim = len(np.frombuffer(vectors[0][1], dtype=np.float32))
+        index = None
+        if os.path.exists(self.faiss_path):
+            try:
+                index = faiss.read_index(self.faiss_path)
+                if index.d != self._dim:
+                    index = None
+
+            except Exception as e:
+                print(f"Rebuilding candidate index, snapshot unreadable: {e}")
+                index = None
+
+        if index is None:
+            index = self._new_faiss(self._dim)
+        snapshot_ids = set(faiss.vector_to_array(index.id_map).tolist())
+
+        # Rows written after the last snapshot.
+        missing = [(rid, blob) for rid, blob in vectors if rid not in snapshot_ids]
+        if missing:
+            index.add_with_ids(
+                np.vstack(
+                    [np.frombuffer(blob, dtype=np.float32) for _, blob in missing]
+                ),
+                np.array([rid for rid, _ in missing], dtype=np.int64),
+            )
+            self._dirty = True
+
+        self._faiss = index
+        self._vector_ids = {rid for rid, _ in vectors}
+        self._tombstones = snapshot_ids - self._vector_ids
+
+    @staticmethod
+    def _new_faiss(dim: int):
+        import faiss
+
+        hnsw = faiss.IndexHNSWFlat(
+            dim, candidate_index_hnsw_m, faiss.METRIC_INNER_PRODUCT
+        )
+        hnsw.hnsw.efSearch = candidate_index_ef_search
+        return faiss.IndexIDMap2(hnsw)
+
+    def _sync(self) -> None:
+        """Load rows committed by other workers since the last check."""
+        version = self._current_data_version()
+        if version == self._data_version:
+            return
+        self._data_version = version
+
+        for record, blob in self._rows_after(self._max_row_id):
+            self._max_row_id = record.row_id
+            if record.row_id in self._records:
+                continue
+            # Another worker re-indexed this resume under a new row.
+            existing = self._by_candidate.get(record.candidate_id)
+            if existing is not None:
+                self._forget(existing)
+            self._remember(record)
+            if blob:
+                self._add_vector(record.row_id, np.frombuffer(blob, dtype=np.float32))
+
+    def _add_vector(self, row_id: int, vector: np.ndarray) -> None:
+        if self._faiss is None:
+            self._dim = len(vector)
+            self._faiss = self._new_faiss(self._dim)
+        self._faiss.add_with_ids(
+            vector.reshape(1, -1), np.array([row_id], dtype=np.int64)
+        )
+        self._vector_ids.add(row_id)
+        self._dirty = True
+
+    def _remember(self, record: CandidateRecord) -> None:
+        self._records[record.row_id] = record
+        self._by_candidate[record.candidate_id] = record.row_id
+        for skill in record.skills:
+            self._skill_postings[_norm(skill)].add(record.row_id)
+        if record.predicted_field:
+            self._field_postings[_norm(record.predicted_field)].add(record.row_id)
+
+    def _forget(self, row_id: int) -> None:
+        record = self._records.pop(row_id, None)
+        if record is None:
+            return
+        self._by_candidate.pop(record.candidate_id, None)
+        for skill in record.skills:
+            self._skill_postings[_norm(skill)].discard(row_id)
+        if record.predicted_field:
+            self._field_postings[_norm(record.predicted_field)].discard(row_id)
+        if row_id in self._vector_ids:
+            self._vector_ids.discard(row_id)
+            self._tombstones.add(row_id)
+
+    def _compact(self) -> None:
+        """Rebuild the HNSW graph without tombstones.
+
+        The graph is built from a copy outside ``_lock`` so searches keep
+        running; vectors added or replaced meanwhile are applied before the
+        new graph is swapped in.
+        """
+        if not self._compacting.acquire(blocking=False):
+            return
+
+        try:
+            with self._lock:
+                if self._faiss is None or not self._tombstones:
+                    return
+                old = self._faiss
+                ids = np.array(sorted(self._vector_ids), dtype=np.int64)
+                vectors = old.reconstruct_batch(ids) if len(ids) else None
+
+            index = self._new_faiss(old.d)
+            if vectors is not None:
+                index.add_with_ids(vectors, ids)
+
+            with self._lock:
+                if self._faiss is not old:
+                    return
+                copied = set(ids.tolist())
+                added = np.array(sorted(self._vector_ids - copied), dtype=np.int64)
+                if len(added):
+                    index.add_with_ids(old.reconstruct_batch(added), added)
+                self._faiss = index
+                self._tombstones = copied - self._vector_ids
+                self._dirty = True
+
+        finally:
+            self._compacting.release()
+
+    def flush(self, force: bool = False) -> None:
+        """Snapshot the FAISS index if it changed (and the interval elapsed).
+
+        Tombstones are compacted away first, so they never outlive a snapshot
+        interval.
+        """
+        with self._lock:
+            if self._faiss is None or not self._dirty:
+                return
+            if (
+                not force
+                and time.monotonic() - self._last_flush < candidate_index_flush_interval
+            ):
+                return
+
+        self._compact()
+
+        with self._lock:
+            if self._faiss is None or not self._dirty:
+                return
+
+            import faiss
+
+            tmp_path = self.faiss_path + ".tmp"
+            faiss.write_index(self._faiss, tmp_path)
+            os.replace(tmp_path, self.faiss_path)
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+    # -- writes ------------------------------------------------------------
+
+    def add(
+        self,
+        cleaned_text: str,
+        analysis: ComprehensiveAnalysisData,
+        session_id: Optional[str] = None,
+    ) -> str:
+        """Index (or re-index) one analysed resume; returns its candidate id."""
+        candidate_id = candidate_key(cleaned_text)
+        skills = candidate_skills(cleaned_text, analysis)
+
+        try:
+            vector: Optional[np.ndarray] = _document_vector(cleaned_text)
+        except EmbeddingModelUnavailable:
+            vector = None
+
+        with self._lock:
+            conn = self._open()
+            self._sync()
+            existing = self._by_candidate.get(candidate_id)
+            if existing is not None:
+                self._forget(existing)
+
+            with conn:
+                conn.execute(
+                    "DELETE FROM candidates WHERE candidate_id = ?", (candidate_id,)
+                )
+                cursor = conn.execute(
+                    "INSERT INTO candidates (candidate_id, session_id, predicted_field, "
+                    "skills, analysis, embedding, indexed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        candidate_id,
+                        session_id,
+                        analysis.predicted_field,
+                        json.dumps(skills),
+                        analysis.model_dump_json(),
+                        vector.tobytes() if vector is not None else None,
+                        time.time(),
+                    ),
+                )
+            row_id = int(cursor.lastrowid)
+
+            self._remember(
+                CandidateRecord(
+                    row_id=row_id,
+                    candidate_id=candidate_id,
+                    predicted_field=analysis.predicted_field,
+                    skills=tuple(skills),
+                    indexed_at=time.time(),
+                )
+            )
+
+            if vector is not None:
+                self._add_vector(row_id, vector)
+
+        self.flush()
+        return candidate_id
+
+    # -- reads -------------------------------------------------------------
+
+    def _filtered_ids(
+        self,
+        predicted_field: Optional[str],
+        skills: Iterable[str],
+    ) -> Optional[Set[int]]:
+        postings: List[Set[int]] = []
+        if predicted_field:
+            postings.append(self._field_postings.get(_norm(predicted_field), set()))
+        for skill in skills:
+            if skill.strip():
+                postings.append(self._skill_postings.get(_norm(skill), set()))
+
+        if not postings:
+            return None
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+        return result
+
+    def _semantic_scores(
+        self,
+        query_vector: np.ndarray,
+        allowed: Optional[Set[int]],
+        k: int,
+    ) -> Dict[int, float]:
+        if self._faiss is None or self._faiss.ntotal == 0:
+            return {}
+
+        if allowed is not None:
+            # Candidates indexed without a model have no vector.
+            allowed = allowed & self._vector_ids
+            if not allowed:
+                return {}
+
+        if allowed is not None and len(allowed) <= EXACT_SEARCH_LIMIT:
+            ids = np.array(sorted(allowed), dtype=np.int64)
+            vectors = self._faiss.reconstruct_batch(ids)
+            return dict(zip(ids.tolist(), (vectors @ query_vector).tolist()))
+
+        import faiss
+
+        params = None
+        if allowed is not None:
+            params = faiss.SearchParametersHNSW(
+                sel=faiss.IDSelectorBatch(np.array(sorted(allowed), dtype=np.int64)),
+                efSearch=max(candidate_index_ef_search, k),
+            )
+        else:
+            k += len(self._tombstones)
+        k = min(k, self._faiss.ntotal)
+        distances, labels = self._faiss.search(
+            query_vector.reshape(1, -1), k, params=params
+        )
+        return {
+            int(label): float(distance)
+            for label, distance in zip(labels[0], distances[0])
+            if label != -1 and label not in self._tombstones
+        }
+
+    def _keyword_scores(
+        self,
+        query_skills: Set[str],
+        allowed: Optional[Set[int]],
+        pool: Optional[Iterable[int]] = None,
+    ) -> Dict[int, float]:
+        """Share of ``query_skills`` each candidate has, from the postings.
+
+        Scores the ``pool`` ids only when given, else every allowed candidate
+        with at least one of the skills.
+        """
+        if not query_skills:
+            return {}
+
+        postings = [self._skill_postings.get(skill, set()) for skill in query_skills]
+        counts: Dict[int, int] = Counter()
+        if pool is not None:
+            for row_id in pool:
+                counts[row_id] = sum(row_id in posting for posting in postings)
+        else:
+            for posting in postings:
+                counts.update(posting if allowed is None else posting & allowed)
+        return {
+            row_id: count / len(query_skills)
+            for row_id, count in counts.items()
+            if count
+        }
+
+    def _recent_ids(
+        self, allowed: Optional[Set[int]], exclude: Iterable[int], limit: int
+    ) -> List[int]:
+        """The ``limit`` newest candidates not in ``exclude``.
+
+        Row ids are assigned in indexing order, so newest means largest id.
+        """
+        exclude = set(exclude)
+        if allowed is None:
+            newest = (
+                row_id for row_id in reversed(self._records) if row_id not in exclude
+            )
+            return list(itertools.islice(newest, limit))
+        return heapq.nlargest(limit, allowed - exclude)
+
+    def _hits(
+        self,
+        scored: List[Tuple[int, float, CandidateRecord]],
+        query_skills: Set[str],
+    ) -> List[CandidateHit]:
+        if not scored:
+            return []
+        placeholders = ",".join("?" for _ in scored)
+        rows = {
+            row[0]: row
+            for row in self._reader().execute(
+                "SELECT row_id, candidate_id, session_id, analysis, indexed_at "
+                f"FROM candidates WHERE row_id IN ({placeholders})",
+                [row_id for row_id, _, _ in scored],
+            )
+        }
+
+        hits = []
+        for row_id, score, record in scored:
+            row = rows.get(row_id)
+            if row is None:
+                continue
+            analysis = ComprehensiveAnalysisData.model_validate_json(row[3])
+            hits.append(
+                CandidateHit(
+                    candidate_id=row[1],
+                    session_id=row[2],
+                    score=round(score, 4),
+                    name=analysis.name,
+                    email=analysis.email,
+                    predicted_field=record.predicted_field,
+                    skills=list(record.skills),
+                    matched_skills=[
+                        skill for skill in record.skills if _norm(skill) in query_skills
+                    ],
+                    analysis=analysis,
+                    indexed_at=datetime.fromtimestamp(row[4], tz=timezone.utc),
+                )
+            )
+        return hits
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        predicted_field: Optional[str] = None,
+        skills: Iterable[str] = (),
+        page: int = 1,
+        page_size: int = 20,
+    ) -> Tuple[int, List[CandidateHit], bool]:
+        """Return ``(total, hits, semantic)`` for one page of ranked candidates.
+
+        Only candidate selection holds the index lock; ranking the pool and
+        loading the page's analyses from SQLite run outside it.
+        """
+        query = (query or "").strip()
+        query_vector = None
+        if query:
+            try:
+                query_vector = _document_vector(query)
+            except EmbeddingModelUnavailable:
+                query_vector = None
+
+        query_skills = {_norm(skill) for skill in get_skill_matcher().extract(query)}
+        query_skills.update(_norm(skill) for skill in skills if skill.strip())
+        offset = (page - 1) * page_size
+
+        with self._lock:
+            self._open()
+            self._sync()
+            allowed = self._filtered_ids(predicted_field, skills)
+            total = len(allowed) if allowed is not None else len(self._records)
+            if offset >= total:
+                return total, [], query_vector is not None
+
+            semantic: Dict[int, float] = {}
+            if query_vector is not None:
+                semantic = self._semantic_scores(
+                    query_vector, allowed, max(offset + page_size, 50) * 2
+                )
+
+            if semantic:
+                keyword = self._keyword_scores(query_skills, allowed, semantic)
+                # Candidates indexed without a model have no vector; they
+                # compete on skill overlap alone.
+                unembedded: Dict[int, float] = {}
+                if len(self._vector_ids) < len(self._records):
+                    unembedded = {
+                        row_id: score
+                        for row_id, score in self._keyword_scores(
+                            query_skills, allowed
+                        ).items()
+                        if row_id not in self._vector_ids
+                    }
+                keyword.update(unembedded)
+                pool: Iterable[int] = itertools.chain(semantic, unembedded)
+            else:
+                # Skill matches rank first; the newest others fill the page.
+                keyword = self._keyword_scores(query_skills, allowed)
+                pool = itertools.chain(
+                    keyword, self._recent_ids(allowed, keyword, offset + page_size)
+                )
+            records = {
+                row_id: self._records[row_id]
+                for row_id in pool
+                if row_id in self._records
+            }
+
+        scored = []
+        for row_id, record in records.items():
+            score = (
+                (1 - KEYWORD_WEIGHT) * semantic[row_id]
+                + KEYWORD_WEIGHT * keyword.get(row_id, 0.0)
+                if row_id in semantic
+                else keyword.get(row_id, 0.0)
+            )
+            scored.append((row_id, score, record))
+
+        scored.sort(key=lambda item: (item[1], item[2].indexed_at), reverse=True)
+        page_items = scored[offset : offset + page_size]
+        return total, self._hits(page_items, query_skills), bool(semantic)
+
+    def recent(
+        self,
+        predicted_field: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[int, List[CandidateHit]]:
+        """Most recently indexed candidates, optionally for one field."""
+        with self._lock:
+            self._open()
+            self._sync()
+            ids = (
+                self._field_postings.get(_norm(predicted_field), set())
+                if predicted_field
+                else set(self._records)
+            )
+            ordered = sorted(
+                ids, key=lambda row_id: self._records[row_id].indexed_at, reverse=True
+            )
+            total = len(ids)
+            page = [
+                (row_id, 0.0, self._records[row_id])
+                for row_id in ordered[offset : offset + limit]
+            ]
+        return total, self._hits(page, set())
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._open()
+            return len(self._records)
+
+
+candidate_index = CandidateIndex(candidate_index_dir)
+
+_pending: Set[asyncio.Task] = set()
+
+
+def index_candidate_in_background(
+    cleaned_text: str,
+    analysis: ComprehensiveAnalysisData,
+    session_id: Optional[str] = None,
+) -> None:
+    """Schedule indexing without delaying the response that produced it."""
+    if not candidate_index_enabled or not cleaned_text.strip():
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    async def _index() -> None:
+        try:
+            await run_blocking(candidate_index.add, cleaned_text, analysis, session_id)
+        except Exception as e:
+            print(f"Failed to index candidate: {e}")
+
+    task = loop.create_task(_index())
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def search_candidates_service(
+    payload: CandidateSearchRequest,
+) -> CandidateSearchResponse:
+    started = time.perf_counter()
+    total, hits, semantic = await run_blocking(
+        candidate_index.search,
+        payload.query,
+        payload.predicted_field,
+        payload.skills,
+        payload.page,
+        payload.page_size,
+    )
+    return CandidateSearchResponse(
+        total=total,
+        page=payload.page,
+        page_size=payload.page_size,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        semantic=semantic,
+        results=hits,
+    )
+
+
+__all__ = [
+    "CandidateIndex",
+    "candidate_index",
+    "candidate_key",
+    "candidate_skills",
+    "index_candidate_in_background",
+    "search_candidates_service",
+]
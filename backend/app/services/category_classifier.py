@@ -0,0 +1,154 @@
+"""Local job-category classifier backed by the pickled TF-IDF model.
+
+``app/model/best_model.pkl`` and ``tfidf.pkl`` are loaded once, lazily, on
+the first prediction. Cleaning is a regex pass plus stop-word removal; the
+spaCy lemmatizer used by the legacy ``server.py`` is replaced by a cheap
+plural fold against the vectorizer vocabulary, so a batch of resumes is
+classified in milliseconds without touching the LLM.
+"""
+
+import os
+import re
+import threading
+from typing import Any, List, Optional, Sequence
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from app.core.concurrency import run_blocking
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "model")
+
+CATEGORY_MAPPING = {
+    15: "Java Developer",
+    23: "Testing",
+    8: "DevOps Engineer",
+    20: "Python Developer",
+    24: "Web Designing",
+    12: "HR",
+    13: "Hadoop",
+    3: "Blockchain",
+    10: "ETL Developer",
+    18: "Operations Manager",
+    6: "Data Science",
+    22: "Sales",
+    16: "Mechanical Engineer",
+    1: "Arts",
+    7: "Database",
+    11: "Electrical Engineering",
+    14: "Health and fitness",
+    19: "PMO",
+    4: "Business Analyst",
+    9: "DotNet Developer",
+    2: "Automation Testing",
+    17: "Network Security Engineer",
+    21: "SAP Developer",
+    5: "Civil Engineer",
+    0: "Advocate",
+}
+
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+_HANDLE_RE = re.compile(r"[@#]\S+")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+class CategoryClassifier:
+    """Thread-safe, lazily loaded wrapper around the pickled classifier."""
+
+    def __init__(self, model_dir: str = MODEL_DIR):
+        self.model_dir = model_dir
+        self._lock = threading.Lock()
+        self._model: Any = None
+        self._vectorizer: Any = None
+        self._vocabulary: frozenset = frozenset()
+
+    def _load(self) -> None:
+        if self._model is not None:
+            return
+
+        with self._lock:
+            if self._model is not None:
+                return
+
+            import pickle
+
+            with open(os.path.join(self.model_dir, "tfidf.pkl"), "rb") as f:
+                vectorizer = pickle.load(f)
+            with open(os.path.join(self.model_dir, "best_model.pkl"), "rb") as f:
+                model = pickle.load(f)
+
+            self._vectorizer = vectorizer
+            self._vocabulary = frozenset(getattr(vectorizer, "vocabulary_", {}))
+            self._model = model
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def _normalize_token(self, token: str) -> str:
+        # Stand-in for lemmatization: fold plurals onto vocabulary terms.
+        if token in self._vocabulary or len(token) < 4:
+            return token
+        if token.endswith("ies") and token[:-3] + "y" in self._vocabulary:
+            return token[:-3] + "y"
+        if token.endswith("es") and token[:-2] in self._vocabulary:
+            return token[:-2]
+        if token.endswith("s") and token[:-1] in self._vocabulary:
+            return token[:-1]
+        return token
+
+    def clean_texts(self, texts: Sequence[str]) -> List[str]:
+        """Clean resume texts the way the model's training data was cleaned."""
+        self._load()
+        cleaned = []
+        for text in texts:
+            text = _HANDLE_RE.sub(" ", _URL_RE.sub(" ", (text or "").lower()))
+            text = _PUNCT_RE.sub("", text)
+            cleaned.append(
+                " ".join(
+                    self._normalize_token(token)
+                    for token in text.split()
+                    if token not in ENGLISH_STOP_WORDS
+                )
+            )
+        return cleaned
+
+    def predict(self, texts: Sequence[str]) -> List[str]:
+        """Predict a category for every resume text in one vectorized pass."""
+        if not texts:
+            return []
+
+        cleaned = self.clean_texts(texts)
+        features = self._vectorizer.transform(cleaned)
+        return [
+            CATEGORY_MAPPING.get(int(prediction_id), "Unknown")
+            for prediction_id in self._model.predict(features)
+        ]
+
+    def predict_one(self, text: str) -> str:
+        return self.predict([text])[0]
+
+
+category_classifier = CategoryClassifier()
+
+
+async def predict_categories(texts: Sequence[str]) -> List[str]:
+    """Classify ``texts`` off the event loop."""
+    return await run_blocking(category_classifier.predict, list(texts))
+
+
+async def predict_category(text: str) -> Optional[str]:
+    """Classify a single resume; returns ``None`` if the model is unavailable."""
+    try:
+        return (await predict_categories([text]))[0]
+    except Exception as e:
+        print(f"Local category classifier failed: {e}")
+        return None
+
+
+__all__ = [
+    "CATEGORY_MAPPING",
+    "CategoryClassifier",
+    "category_classifier",
+    "predict_categories",
+    "predict_category",
+]
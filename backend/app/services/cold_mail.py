@@ -6,12 +6,13 @@ from app.models.schemas import ColdMailResponse, ErrorResponse
 from app.services.process_resume import process_document, is_valid_resume
 from app.services.hiring_assiatnat import get_company_research
 from app.core.llm import llm
+from app.core.concurrency import ainvoke, run_blocking
 from app.services.data_processor import format_resume_text_with_llm
 from app.data.prompt.cold_mail_gen import cold_main_generator_chain
 from app.data.prompt.cold_mail_editor import cold_mail_edit_chain
 
 
-def generate_cold_mail_content(
+async def generate_cold_mail_content(
     resume_text,
     recipient_name,
     recipient_designation,
@@ -23,7 +24,8 @@ def generate_cold_mail_content(
     company_research,
 ):
     try:
-        response = cold_main_generator_chain.invoke(
+        response = await ainvoke(
+            cold_main_generator_chain,
             {
                 "resume_text": resume_text,
                 "recipient_name": recipient_name,
@@ -34,7 +36,7 @@ def generate_cold_mail_content(
                 "key_points_to_include": key_points_to_include,
                 "additional_info_for_llm": additional_info_for_llm,
                 "company_research": company_research,
-            }
+            },
         )
         response_content = (
             response.content if hasattr(response, "content") else str(response)
@@ -123,7 +125,7 @@ def generate_cold_mail_content(
         )
 
 
-def generate_cold_mail_edit_content(
+async def generate_cold_mail_edit_content(
     resume_text,
     recipient_name,
     recipient_designation,
@@ -139,7 +141,8 @@ def generate_cold_mail_edit_content(
 ):
 
     try:
-        response = cold_mail_edit_chain.invoke(
+        response = await ainvoke(
+            cold_mail_edit_chain,
             {
                 "resume_text": resume_text,
                 "recipient_name": recipient_name,
@@ -153,7 +156,7 @@ def generate_cold_mail_edit_content(
                 "previous_email_subject": previous_email_subject,
                 "previous_email_body": previous_email_body,
                 "edit_instructions": edit_instructions,
-            }
+            },
         )
         response_content = (
             response.content if hasattr(response, "content") else str(response)
@@ -241,7 +244,7 @@ def generate_cold_mail_edit_content(
         )
 
 
-def cold_mail_generator_service(
+async def cold_mail_generator_service(
     file: UploadFile,
     recipient_name: str,
     recipient_designation: str,
@@ -272,12 +275,16 @@ def cold_mail_generator_service(
             uploads_dir,
             f"temp_cold_mail_{file.filename}",
         )
-        file_bytes = file.file.read()
+        file_bytes = await file.read()
 
         with open(temp_file_path, "wb") as buffer:
             buffer.write(file_bytes)
 
-        resume_text = process_document(file_bytes, file.filename)
+        resume_text = await run_blocking(
+            process_document,
+            file_bytes,
+            file.filename,
+        )
 
         if resume_text is None:
             os.remove(temp_file_path)
@@ -293,7 +300,7 @@ def cold_mail_generator_service(
         )
 
         if resume_text.strip() and file_extension not in [".md", ".txt"]:
-            resume_text = format_resume_text_with_llm(resume_text)
+            resume_text = await format_resume_text_with_llm(resume_text)
 
         os.remove(temp_file_path)
 
@@ -308,9 +315,12 @@ def cold_mail_generator_service(
         company_research_info = ""
 
         if company_url:
-            company_research_info = get_company_research(company_name, company_url)
+            company_research_info = await get_company_research(
+                company_name,
+                company_url,
+            )
 
-        email_content = generate_cold_mail_content(
+        email_content = await generate_cold_mail_content(
             resume_text=resume_text,
             recipient_name=recipient_name,
             recipient_designation=recipient_designation,
@@ -338,7 +348,7 @@ def cold_mail_generator_service(
         )
 
 
-def cold_mail_editor_service(
+async def cold_mail_editor_service(
     file: UploadFile,
     recipient_name: str,
     recipient_designation: str,
@@ -373,11 +383,15 @@ def cold_mail_editor_service(
             uploads_dir,
             f"temp_cold_mail_{file.filename}",
         )
-        file_bytes = file.file.read()
+        file_bytes = await file.read()
 
         with open(temp_file_path, "wb") as buffer:
             buffer.write(file_bytes)
-        resume_text = process_document(file_bytes, file.filename)
+        resume_text = await run_blocking(
+            process_document,
+            file_bytes,
+            file.filename,
+        )
 
         if resume_text is None:
             os.remove(temp_file_path)
@@ -393,7 +407,7 @@ def cold_mail_editor_service(
         )
 
         if resume_text.strip() and file_extension not in [".md", ".txt"]:
-            resume_text = format_resume_text_with_llm(resume_text)
+            resume_text = await format_resume_text_with_llm(resume_text)
 
         os.remove(temp_file_path)
 
@@ -407,9 +421,12 @@ def cold_mail_editor_service(
 
         company_research_info = ""
         if company_url:
-            company_research_info = get_company_research(company_name, company_url)
+            company_research_info = await get_company_research(
+                company_name,
+                company_url,
+            )
 
-        email_content = generate_cold_mail_edit_content(
+        email_content = await generate_cold_mail_edit_content(
             resume_text=resume_text,
             recipient_name=recipient_name,
             recipient_designation=recipient_designation,
@@ -464,9 +481,12 @@ async def cold_mail_generator_v2_service(
     try:
         company_research_info = ""
         if company_url:
-            company_research_info = get_company_research(company_name, company_url)
+            company_research_info = await get_company_research(
+                company_name,
+                company_url,
+            )
 
-        email_content = generate_cold_mail_content(
+        email_content = await generate_cold_mail_content(
             resume_text=resume_text,
             recipient_name=recipient_name,
             recipient_designation=recipient_designation,
@@ -519,9 +539,12 @@ async def cold_mail_editor_v2_service(
     try:
         company_research_info = ""
         if company_url:
-            company_research_info = get_company_research(company_name, company_url)
+            company_research_info = await get_company_research(
+                company_name,
+                company_url,
+            )
 
-        email_content = generate_cold_mail_edit_content(
+        email_content = await generate_cold_mail_edit_content(
             resume_text=resume_text,
             recipient_name=recipient_name,
             recipient_designation=recipient_designation,
@@ -0,0 +1,402 @@
+"""Persistent cache for company website content.
+
+Cold mails, hiring answers, ATS runs and resume tailoring all read the
+company's website through r.jina.ai. Responses are stored in SQLite at
+``COMPANY_CACHE_PATH`` keyed by the normalized URL, so a popular employer
+costs one fetch per ``COMPANY_CACHE_TTL`` instead of one per request:
+
+- fresh entries are returned directly;
+- stale entries (up to ``COMPANY_CACHE_STALE_TTL`` past expiry) are returned
+  immediately while one background task refreshes them;
+- failed fetches are remembered so a dead site isn't hit again on every
+  request: definite failures (4xx, empty page) for
+  ``COMPANY_CACHE_NEGATIVE_TTL``, transient ones (timeouts, connection
+  errors, 429/5xx) only for ``COMPANY_CACHE_TRANSIENT_TTL``;
+- concurrent requests for the same URL share one in-flight fetch, and at most
+  ``COMPANY_FETCH_CONCURRENCY`` distinct sites are fetched at once.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from app.core import http
+from app.core.cache import register_cache_stats
+from app.core.concurrency import run_blocking
+from app.core.config import (
+    company_cache_negative_ttl,
+    company_cache_path,
+    company_cache_stale_ttl,
+    company_cache_transient_ttl,
+    company_cache_ttl,
+    company_fetch_concurrency,
+    company_fetch_timeout,
+)
+from app.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+JINA_READER_URL = "https://r.jina.ai/"
+
+# Dropped from cache keys: ``utm_*`` by prefix, the others by exact name.
+_TRACKING_PREFIXES = ("utm_",)
+_TRACKING_PARAMS = frozenset({"gclid", "fbclid", "ref"})
+
+
+def _is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key in _TRACKING_PARAMS or key.startswith(_TRACKING_PREFIXES)
+
+
+class CompanyFetchError(RuntimeError):
+    """Raised when a company page could not be fetched (possibly cached)."""
+
+
+def normalize_company_url(url: str) -> str:
+    """Canonical form of ``url`` used as the cache key (not for fetching).
+
+    The scheme defaults to https, scheme and host are lower-cased, a leading
+    ``www.`` and default ports are dropped, tracking parameters and fragments
+    are removed and the trailing slash is stripped.
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    if "://" not in url:
+        url = f"https://{url}"
+
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_param(key)
+        )
+    )
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/"), query, ""))
+
+
+@dataclass
+class CompanyContentEntry:
+    url: str
+    content: str
+    error: Optional[str]
+    fetched_at: float
+    fresh_until: float
+    stale_until: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def is_usable(self, now: float) -> bool:
+        # Failures are never served stale; they simply expire.
+        return self.is_fresh(now) or (self.error is None and now < self.stale_until)
+
+
+class CompanyContentStore:
+    """SQLite table of fetched company pages shared by every worker."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS company_content ("
+                "url TEXT PRIMARY KEY, content TEXT NOT NULL, error TEXT, "
+                "fetched_at REAL NOT NULL, fresh_until REAL NOT NULL, "
+                "stale_until REAL NOT NULL)"
+            )
+
+    def get(self, url: str) -> Optional[CompanyContentEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, content, error, fetched_at, fresh_until, stale_until "
+                "FROM company_content WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return CompanyContentEntry(*row) if row else None
+
+    def set(self, entry: CompanyContentEntry) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO company_content "
+                "(url, content, error, fetched_at, fresh_until, stale_until) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    entry.url,
+                    entry.content,
+                    entry.error,
+                    entry.fetched_at,
+                    entry.fresh_until,
+                    entry.stale_until,
+                ),
+            )
+            self._conn.execute(
+                "DELETE FROM company_content WHERE stale_until <= ?",
+                (entry.fetched_at,),
+            )
+
+    def count(self) -> Dict[str, int]:
+        with self._lock:
+            entries, failures = self._conn.execute(
+                "SELECT COUNT(*), COUNT(error) FROM company_content"
+            ).fetchone()
+        return {"entries": entries, "negative_entries": failures}
+
+
+class CompanyContentCache:
+    def __init__(
+        self,
+        path: Optional[str],
+        ttl: float = company_cache_ttl,
+        stale_ttl: float = company_cache_stale_ttl,
+        negative_ttl: float = company_cache_negative_ttl,
+        transient_ttl: float = company_cache_transient_ttl,
+        fetch_timeout: float = company_fetch_timeout,
+        max_concurrent_fetches: int = company_fetch_concurrency,
+    ) -> None:
+        self.path = path
+        self._store: Optional[CompanyContentStore] = None
+        self._store_lock = threading.Lock()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.transient_ttl = transient_ttl
+        self.fetch_timeout = fetch_timeout
+        self.max_concurrent_fetches = max(1, max_concurrent_fetches)
+        self._flights = SingleFlight("company_content")
+        self._background: Set[asyncio.Task] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.refreshes = 0
+        self.fetch_errors = 0
+
+    def _fetch_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrent_fetches)
+            self._slots_loop = loop
+        return self._slots
+
+    def _open_store(self) -> Optional[CompanyContentStore]:
+        # Opened on first use so importing the app doesn't create the file.
+        if self._store is None and self.path:
+            with self._store_lock:
+                if self._store is None and self.path:
+                    try:
+                        self._store = CompanyContentStore(self.path)
+
+                    except (sqlite3.Error, OSError) as e:
+                        logger.warning(
+                            "Company content cache unavailable (%s); not caching.", e
+                        )
+                        self.path = None
+        return self._store
+
+    def _get_blocking(self, url: str) -> Optional[CompanyContentEntry]:
+        store = self._open_store()
+        return store.get(url) if store is not None else None
+
+    def _set_blocking(self, entry: CompanyContentEntry) -> None:
+        store = self._open_store()
+        if store is not None:
+            store.set(entry)
+
+    async def _read(self, url: str) -> Optional[CompanyContentEntry]:
+        if not self.path:
+            return None
+        try:
+            return await run_blocking(self._get_blocking, url)
+
+        except sqlite3.Error as e:
+            logger.warning("Company cache read failed for %s: %s", url, e)
+            return None
+
+    async def _write(self, entry: CompanyContentEntry) -> None:
+        if not self.path:
+            return
+        try:
+            await run_blocking(self._set_blocking, entry)
+
+        except sqlite3.Error as e:
+            logger.warning("Company cache write failed for %s: %s", entry.url, e)
+
+    async def _download(self, url: str) -> str:
+        async with self._fetch_slots():
+            response = await http.get(
+                JINA_READER_URL + url,
+                timeout=self.fetch_timeout,
+            )
+        response.raise_for_status()
+        return response.text.strip()
+
+    async def _fetch_and_store(self, key: str, url: str) -> CompanyContentEntry:
+        self.fetches += 1
+        now = time.time()
+        # Only a definite answer from the site is remembered for negative_ttl.
+        error_ttl = self.negative_ttl
+        try:
+            content, error = await self._download(url), None
+            if not content:
+                error = "No content found at the provided URL."
+
+        except httpx.HTTPStatusError as e:
+            content, error = "", f"Error fetching data from URL: {e}"
+            status = e.response.status_code
+            if status == 429 or status >= 500:
+                error_ttl = self.transient_ttl
+
+        except httpx.HTTPError as e:
+            content, error = "", f"Error fetching data from URL: {e}"
+            error_ttl = self.transient_ttl
+
+        except Exception as e:
+            content, error = "", f"An unexpected error occurred: {e}"
+            error_ttl = self.transient_ttl
+
+        if error is None:
+            entry = CompanyContentEntry(
+                url=key,
+                content=content,
+                error=None,
+                fetched_at=now,
+                fresh_until=now + self.ttl,
+                stale_until=now + self.ttl + self.stale_ttl,
+            )
+        else:
+            self.fetch_errors += 1
+            entry = CompanyContentEntry(
+                url=key,
+                content="",
+                error=error,
+                fetched_at=now,
+                fresh_until=now + error_ttl,
+                stale_until=now + error_ttl,
+            )
+
+        await self._write(entry)
+        return entry
+
+    def _shared_fetch(self, key: str, url: str) -> asyncio.Task:
+        # Started rather than awaited through ``do``: the result is written to
+        # the store, so the fetch finishes even if every caller goes away.
+        return self._flights.start(key, self._fetch_and_store, key, url)
+
+    def _refresh_in_background(self, key: str, url: str) -> None:
+        if self._flights.in_flight(key):
+            return
+        self.refreshes += 1
+        task = self._shared_fetch(key, url)
+        # Keep a reference so the refresh isn't garbage collected mid-flight.
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get_entry(self, url: str) -> CompanyContentEntry:
+        key = normalize_company_url(url)
+        if not key:
+            raise CompanyFetchError("Invalid or no URL provided.")
+
+        now = time.time()
+        entry = await self._read(key)
+        if entry is not None and entry.is_usable(now):
+            if entry.error is not None:
+                self.negative_hits += 1
+            elif entry.is_fresh(now):
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._refresh_in_background(key, url.strip())
+            return entry
+
+        self.misses += 1
+        # Shielded so a cancelled caller doesn't abort the fetch for the others.
+        return await asyncio.shield(self._shared_fetch(key, url.strip()))
+
+    async def get(self, url: str) -> str:
+        """Return the markdown of ``url``; raises :class:`CompanyFetchError`."""
+        entry = await self.get_entry(url)
+        if entry.error is not None:
+            raise CompanyFetchError(entry.error)
+        return entry.content
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.negative_hits + self.misses
+        served = self.hits + self.stale_hits + self.negative_hits
+        stats: Dict[str, Any] = {
+            "backend": "sqlite" if self.path else "none",
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+            "fetches": self.fetches,
+            "fetch_errors": self.fetch_errors,
+            "coalesced": self._flights.followers,
+            "background_refreshes": self.refreshes,
+            "in_flight": len(self._flights),
+        }
+        if self._store is not None:
+            try:
+                stats.update(self._store.count())
+            except sqlite3.Error:
+                pass
+        return stats
+
+
+company_content_cache = CompanyContentCache(company_cache_path)
+
+register_cache_stats("company_content", company_content_cache.stats)
+
+
+async def get_company_content(url: str) -> str:
+    """Cached markdown of a company page; raises :class:`CompanyFetchError`."""
+    return await company_content_cache.get(url)
+
+
+async def company_markdown(url: Optional[str]) -> str:
+    """Cached markdown of a company page, or ``""`` if it can't be fetched."""
+    if not url:
+        return ""
+    try:
+        return await company_content_cache.get(url)
+
+    except CompanyFetchError:
+        return ""
+
+
+__all__ = [
+    "CompanyFetchError",
+    "CompanyContentEntry",
+    "CompanyContentStore",
+    "CompanyContentCache",
+    "company_content_cache",
+    "normalize_company_url",
+    "get_company_content",
+    "company_markdown",
+]
@@ -3,6 +3,12 @@ from app.data.prompt.json_extractor import josn_formatter_chain
 from app.data.prompt.comprehensive_analysis import comprensive_analysis_chain
 from app.data.prompt.format_analyse import format_analyse_chain
 from app.data.prompt.ats_analysis import ats_analysis_chain
+from app.core.config import ats_semantic_hint
+from app.core.singleflight import coalesced_ainvoke
+from app.models.schemas import RecommendationItem, ResumeResult
+from app.services.ats_metrics import ATSMetrics, compute_ats_metrics, local_feedback
+from app.services.semantic_scorer import semantic_hint
+from app.services.skill_matcher import format_detected_skills
 import json
 
 
@@ -13,7 +19,7 @@ class LLMNotFoundError(Exception):
         super().__init__(message)
 
 
-def format_resume_text_with_llm(
+async def format_resume_text_with_llm(
     raw_text: str,
 ) -> str:
     """Formats the extracted resume text using an LLM."""
@@ -22,10 +28,11 @@ def format_resume_text_with_llm(
         return ""
 
     try:
-        result = text_formater_chain.invoke(
+        result = await coalesced_ainvoke(
+            text_formater_chain,
             {
                 "raw_resume_text": raw_text,
-            }
+            },
         )
         try:
             formatted_text = (
@@ -52,16 +59,17 @@ def format_resume_text_with_llm(
         return raw_text
 
 
-def format_resume_json_with_llm(
+async def format_resume_json_with_llm(
     extracted_resume_text: str,
 ) -> dict | None:
     """Formats the extracted resume JSON using an LLM."""
 
     try:
-        result = josn_formatter_chain.invoke(
+        result = await coalesced_ainvoke(
+            josn_formatter_chain,
             {
                 "extracted_resume_text": extracted_resume_text,
-            }
+            },
         )
         result = str(result.content)
 
@@ -116,7 +124,7 @@ def format_resume_json_with_llm(
         return {}
 
 
-def comprehensive_analysis_llm(
+async def comprehensive_analysis_llm(
     resume_text: str,
 ) -> dict | None:
     """Performs a comprehensive analysis of the resume using LLM."""
@@ -126,10 +134,12 @@ def comprehensive_analysis_llm(
 
     # print("hello")
 
-    result = comprensive_analysis_chain.invoke(
+    result = await coalesced_ainvoke(
+        comprensive_analysis_chain,
         {
             "extracted_resume_text": resume_text,
-        }
+            "detected_skills": format_detected_skills(resume_text),
+        },
     )
     if isinstance(result, dict):
         formatted_json = result
@@ -191,7 +201,7 @@ def comprehensive_analysis_llm(
     return formatted_json
 
 
-def format_and_analyse_resumes(
+async def format_and_analyse_resumes(
     raw_text: str,
 ) -> dict:
     """Formats and analyses the resume text and JSON using LLM."""
@@ -199,10 +209,12 @@ def format_and_analyse_resumes(
     if not raw_text.strip():
         return {}
 
-    result = format_analyse_chain.invoke(
+    result = await coalesced_ainvoke(
+        format_analyse_chain,
         {
             "extracted_resume_text": raw_text,
-        }
+            "detected_skills": format_detected_skills(raw_text),
+        },
     )
     if isinstance(result, dict):
         formatted_json = result
@@ -263,16 +275,7 @@ def format_and_analyse_resumes(
     return formatted_json
 
 
-def ats_analysis_llm(resume_text: str, jd_text: str) -> dict:
-    """Performs ATS scoring and analysis using LLM."""
-    if not resume_text.strip() or not jd_text.strip():
-        return {}
-    result = ats_analysis_chain.invoke(
-        {
-            "resume_text": resume_text,
-            "jd_text": jd_text,
-        }
-    )
+def _parse_llm_json(result) -> dict:
     if isinstance(result, dict):
         return result
     raw_response = str(result.content) if hasattr(result, "content") else str(result)
@@ -295,3 +298,76 @@ def ats_analysis_llm(resume_text: str, jd_text: str) -> dict:
         except Exception:
             pass
     return {}
+
+
+def _str_list(value) -> list:
+    if not isinstance(value, list):
+        return [str(value)] if value else []
+    return [str(item) for item in value if item]
+
+
+def _recommendations(value) -> list:
+    items = []
+    for index, item in enumerate(value if isinstance(value, list) else []):
+        if not isinstance(item, dict):
+            continue
+        items.append(
+            RecommendationItem(
+                id=str(item.get("id") or f"rec-{index + 1}"),
+                title=str(item.get("title", "")),
+                description=str(item.get("description", "")),
+                category=str(item.get("category", "general")),
+                priority=str(item.get("priority", "medium")),
+                impact=str(item.get("impact", "medium")),
+            )
+        )
+    return items
+
+
+async def ats_analysis_llm(resume_text: str, jd_text: str) -> dict:
+    """Performs ATS scoring and analysis.
+
+    The numeric fields are computed locally by ``compute_ats_metrics``; the
+    LLM only writes strengths, improvement areas, recommendations and the
+    summary. If the LLM call fails, rule-based feedback is used instead.
+    """
+    if not resume_text.strip() or not jd_text.strip():
+        return {}
+
+    semantic = None
+    if ats_semantic_hint:
+        hint = await semantic_hint(resume_text, jd_text)
+        semantic = hint.score if hint is not None else None
+    metrics = compute_ats_metrics(resume_text, jd_text, semantic=semantic)
+
+    try:
+        result = await coalesced_ainvoke(
+            ats_analysis_chain,
+            {
+                "resume_text": resume_text,
+                "jd_text": jd_text,
+                "metrics": json.dumps(metrics.as_dict(), indent=2),
+            },
+        )
+        qualitative = _parse_llm_json(result)
+
+    except Exception as e:
+        print(f"ATS qualitative analysis skipped: {e}")
+        qualitative = {}
+
+    return metrics_result(metrics, qualitative or local_feedback(metrics)).model_dump()
+
+
+def metrics_result(metrics: ATSMetrics, feedback: dict, **extra) -> ResumeResult:
+    """Build a ``ResumeResult`` from local metrics and (LLM or rule) feedback."""
+    numbers = metrics.as_dict()
+    numbers.pop("checks")
+    numbers.pop("word_count")
+    return ResumeResult(
+        **numbers,
+        **extra,
+        recommendations=_recommendations(feedback.get("recommendations")),
+        strengths=_str_list(feedback.get("strengths")),
+        areas_for_improvement=_str_list(feedback.get("areas_for_improvement")),
+        summary=str(feedback.get("summary") or local_feedback(metrics)["summary"]),
+    )
@@ -0,0 +1,199 @@
+"""Content-addressed cache for document-to-markdown conversion.
+
+Converted text is keyed by the SHA-256 of the uploaded bytes plus the file
+extension, so the same resume uploaded for analysis, ATS, cold mail and the
+hiring assistant is only run through PyMuPDF (or the Gemini fallback for
+scanned PDFs) once.
+
+Two tiers are used: an in-memory LRU for hot documents and an on-disk tier
+under ``DOCUMENT_CACHE_DIR`` whose total size is capped by
+``DOCUMENT_CACHE_DISK_MAX_BYTES`` (least recently used files are evicted).
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from app.core.cache import LRUCache, register_cache_stats
+from app.core.config import (
+    document_cache_dir,
+    document_cache_disk_max_bytes,
+    document_cache_memory_entries,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def document_key(file_bytes: bytes, file_extension: str) -> str:
+    """Return the cache key for ``file_bytes`` converted as ``file_extension``."""
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    return f"{digest}{file_extension.lower()}"
+
+
+class DocumentCache:
+    # Suffix of the files written under ``cache_dir``; subclasses that store a
+    # different encoding override it together with ``_encode``/``_decode``.
+    suffix = ".md"
+
+    def __init__(
+        self,
+        cache_dir: str,
+        memory_entries: int,
+        disk_max_bytes: int,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.memory = LRUCache[str](max_entries=memory_entries)
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.disk_evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        text = self.memory.get(key)
+        if text is not None:
+            self.memory_hits += 1
+            return text
+
+        text = self._read_disk(key)
+        if text is not None:
+            self.disk_hits += 1
+            self.memory.set(key, text)
+            return text
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, text: str) -> None:
+        # An empty conversion is a failure, not a result worth keeping.
+        if not text or not text.strip():
+            return
+        self.memory.set(key, text)
+        self.stores += 1
+        self._write_disk(key, text)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "memory_entries": len(self.memory),
+            "disk_bytes": self._disk_bytes or 0,
+            "disk_evictions": self.disk_evictions,
+        }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}{self.suffix}")
+
+    def _encode(self, text: str) -> bytes:
+        return text.encode("utf-8")
+
+    def _decode(self, data: bytes) -> str:
+        return data.decode("utf-8")
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                text = self._decode(handle.read())
+            # Touch the file so eviction treats it as recently used.
+            os.utime(path)
+            return text
+
+        except FileNotFoundError:
+            return None
+
+        except (OSError, ValueError) as e:
+            logger.warning("Document cache read failed for %s: %s", key, e)
+            return None
+
+    def _write_disk(self, key: str, text: str) -> None:
+        path = self._path(key)
+        data = self._encode(text)
+        if len(data) > self.disk_max_bytes:
+            return
+
+        try:
+            # An overwrite replaces the old file's bytes rather than adding to them.
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_path, path)
+
+        except OSError as e:
+            logger.warning("Document cache write failed for %s: %s", key, e)
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(data) - replaced
+
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _cached_files(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(self.suffix):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._cached_files())
+
+    def _evict_disk(self) -> None:
+        entries = sorted(self._cached_files())
+        total = sum(size for _, size, _ in entries)
+        # Evict down to 90% of the budget so we don't rescan on every write.
+        target = int(self.disk_max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.disk_evictions += 1
+            except OSError:
+                continue
+        self._disk_bytes = total
+
+
+document_cache = DocumentCache(
+    cache_dir=document_cache_dir,
+    memory_entries=document_cache_memory_entries,
+    disk_max_bytes=document_cache_disk_max_bytes,
+)
+
+register_cache_stats("documents", document_cache.stats)
+
+
+__all__ = [
+    "DocumentCache",
+    "document_cache",
+    "document_key",
+]
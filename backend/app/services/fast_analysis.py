@@ -0,0 +1,101 @@
+"""Zero-LLM resume analysis used by the ``fast=true`` endpoints.
+
+Contact details come from regular expressions and ``predicted_field`` from
+the local TF-IDF classifier; :func:`fast_resume_analysis` also lists skills
+from the compiled skill matcher. A response costs a few milliseconds and no
+LLM quota. Fields that need an LLM (skill proficiency, so
+``skills_analysis`` in the comprehensive analysis, roles, detailed
+experience) are left empty.
+"""
+
+import re
+from typing import List, Optional
+
+from app.models.schemas import ComprehensiveAnalysisData, ResumeAnalysis
+from app.services.category_classifier import predict_categories, predict_category
+from app.services.skill_matcher import get_skill_matcher
+
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+_PHONE_RE = re.compile(
+    r"(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b",
+)
+_LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[\w]+\.)?linkedin\.com/[^\s)\]>|,]+", re.I)
+_GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[^\s)\]>|,]+", re.I)
+_COLLEGE_RE = re.compile(r"(?i).*(college|university|institute).*")
+
+
+def _first(pattern: re.Pattern, text: str) -> Optional[str]:
+    match = pattern.search(text)
+    return match.group().strip() if match else None
+
+
+def _extract_name(text: str) -> Optional[str]:
+    for line in text.splitlines():
+        line = line.strip().lstrip("#").strip().strip("*").strip()
+        if line:
+            return line[:128]
+    return None
+
+
+def _extract_college(text: str) -> Optional[str]:
+    for line in text.splitlines():
+        if _COLLEGE_RE.match(line):
+            return line.strip()[:128]
+    return None
+
+
+def extract_basic_fields(text: str) -> dict:
+    """Pull name, email, phone, profile links and college from resume text."""
+    return {
+        "name": _extract_name(text),
+        "email": _first(_EMAIL_RE, text),
+        "contact": _first(_PHONE_RE, text),
+        "linkedin": _first(_LINKEDIN_RE, text),
+        "github": _first(_GITHUB_RE, text),
+        "college": _extract_college(text),
+    }
+
+
+async def fast_comprehensive_analyses(
+    texts: List[str],
+) -> List[ComprehensiveAnalysisData]:
+    """Analyse many resumes with a single classifier call."""
+    try:
+        categories: List[Optional[str]] = list(await predict_categories(texts))
+
+    except Exception as e:
+        print(f"Local category classifier failed: {e}")
+        categories = [None] * len(texts)
+
+    analyses = []
+    for text, category in zip(texts, categories):
+        fields = extract_basic_fields(text)
+        fields.pop("college")
+        analyses.append(ComprehensiveAnalysisData(**fields, predicted_field=category))
+    return analyses
+
+
+async def fast_comprehensive_analysis(text: str) -> ComprehensiveAnalysisData:
+    return (await fast_comprehensive_analyses([text]))[0]
+
+
+async def fast_resume_analysis(text: str) -> ResumeAnalysis:
+    fields = extract_basic_fields(text)
+    return ResumeAnalysis(
+        **{
+            **fields,
+            "name": fields["name"] or "N/A",
+            "email": fields["email"] or "N/A",
+            "personal_website, or any other link": None,
+            "skills": get_skill_matcher().extract(text),
+            "predicted_field": await predict_category(text) or "Unknown",
+        }
+    )
+
+
+__all__ = [
+    "extract_basic_fields",
+    "fast_comprehensive_analyses",
+    "fast_comprehensive_analysis",
+    "fast_resume_analysis",
+]
@@ -1,35 +1,39 @@
+import asyncio
 import os
 import json
-from typing import Optional
-import requests
+import time
+from typing import AsyncIterator, Dict, List, Optional
 from fastapi import HTTPException, UploadFile
-from app.models.schemas import HiringAssistantResponse, ErrorResponse
+from app.models.schemas import (
+    HiringAnswerMode,
+    HiringAssistantResponse,
+    ErrorResponse,
+    StreamingEvent,
+)
 from app.services.process_resume import process_document, is_valid_resume
 from app.services.data_processor import format_resume_text_with_llm
-from app.data.prompt.hirring_assistant import hiring_assistant_chain
+from app.data.prompt.hirring_assistant import (
+    hiring_assistant_batch_chain,
+    hiring_assistant_chain,
+    hiring_assistant_stream_chain,
+)
 from app.core.llm import llm
+from app.core.concurrency import astream, run_blocking
+from app.core.config import hiring_answer_concurrency
+from app.core.singleflight import coalesced_ainvoke
+from app.services.company_content import CompanyFetchError, get_company_content
 
 
-def get_company_research(company_name, company_url):
+async def get_company_research(company_name, company_url):
     """Gets basic company research information."""
     url = company_url.strip()
     try:
         if not url or not url.startswith(("http://", "https://")):
             return f"Research about {company_name}: Invalid or no URL provided for company research."
 
-        response = requests.get(
-            "https://r.jina.ai/" + url,
-            timeout=10,
-        )
-        response.raise_for_status()
-
-        if not response.text.strip():
-            return (
-                f"Research about {company_name}: No content found at the provided URL."
-            )
+        research_text = await get_company_content(url)
 
         max_research_length = 20_000
-        research_text = response.text.strip()
         if len(research_text) > max_research_length:
             research_text = research_text[:max_research_length] + "..."
 
@@ -38,23 +42,14 @@ def get_company_research(company_name, company_url):
 
         return f"Research about {company_name}: {research_text}"
 
-    except requests.exceptions.RequestException as e:
-        return f"Research about {company_name}: Error fetching data from URL: {e}"
+    except CompanyFetchError as e:
+        return f"Research about {company_name}: {e}"
 
     except Exception as e:
         return f"Research about {company_name}: An unexpected error occurred during company research: {e}"
 
 
-def generate_answers_for_geting_hired(
-    resume_text,
-    role,
-    company,
-    questions_list,
-    word_limit,
-    user_company_knowledge,
-    company_research,
-):
-
+def _company_context(company, user_company_knowledge, company_research) -> str:
     company_context = ""
     if user_company_knowledge.strip():
         company_context += f"\n\nAdditional information about {company}:\n{user_company_knowledge.strip()}"
@@ -63,127 +58,264 @@ def generate_answers_for_geting_hired(
         company_context += (
             f"\n\nResearch findings about {company}:\n{company_research.strip()}"
         )
+    return company_context
 
-    results = []
 
-    for question in questions_list:
-        try:
-            response_content = hiring_assistant_chain.invoke(
-                {
-                    "resume": resume_text,
-                    "role": role,
-                    "company": company,
-                    "company_context": company_context,
-                    "question": question,
-                    "word_limit": word_limit,
-                }
-            )
-            answer = (
-                response_content
-                if isinstance(response_content, str)
-                else getattr(response_content, "content", "")
-            )
+def _response_text(response_content) -> str:
+    return (
+        response_content
+        if isinstance(response_content, str)
+        else getattr(response_content, "content", "")
+    )
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
 
-            results.append(
+async def _answer_question(inputs: dict, question: str, slots: asyncio.Semaphore):
+    async with slots:
+        started = time.perf_counter()
+        try:
+            response_content = await coalesced_ainvoke(
+                hiring_assistant_chain,
                 {
+                    **inputs,
                     "question": question,
-                    "answer": answer.strip(),
-                }
+                },
             )
+            answer = _response_text(response_content).strip()
 
         except Exception as e:
-            results.append(
-                {
-                    "question": question,
-                    "answer": f"Error generating answer: {e}",
-                }
-            )
+            answer = f"Error generating answer: {e}"
 
-    return results
+        return {
+            "question": question,
+            "answer": answer,
+            "elapsed_ms": _elapsed_ms(started),
+        }
 
 
-def hiring_assistant_service(
-    file: UploadFile,
-    role: str,
-    questions: str,
-    company_name: str,
-    user_knowledge: Optional[str],
-    company_url: Optional[str],
-    word_limit: Optional[int],
-):
-    try:
+def _parse_batched_answers(text: str, count: int) -> Dict[int, str]:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.removeprefix("```json").removeprefix("```").removesuffix("```")
+
+    start_index = text.find("{")
+    end_index = text.rfind("}") + 1
+    data = json.loads(text[start_index:end_index])
+
+    answers: Dict[int, str] = {}
+    for item in data.get("answers", []):
         try:
-            questions_list = json.loads(questions)
-            if (
-                not isinstance(questions_list, list)
-                or not all(isinstance(q, str) for q in questions_list)
-                or not questions_list
-            ):
-                raise ValueError("Questions must be a non-empty list of strings.")
-
-        except (json.JSONDecodeError, ValueError) as e:
-            raise HTTPException(
-                status_code=422,
-                detail=ErrorResponse(
-                    message="Invalid format for questions. Expected a JSON string representing a non-empty list of strings.",
-                    error_detail=str(e),
-                ).model_dump(),
-            )
+            index = int(item.get("index"))
+        except (TypeError, ValueError):
+            continue
+        answer = str(item.get("answer") or "").strip()
+        if 1 <= index <= count and answer:
+            answers[index - 1] = answer
+    return answers
 
-        uploads_dir = os.path.join(
-            os.path.dirname(__file__),
-            "../../uploads",
+
+async def _answer_questions_batched(inputs: dict, questions_list) -> List[dict]:
+    started = time.perf_counter()
+    try:
+        response_content = await coalesced_ainvoke(
+            hiring_assistant_batch_chain,
+            {
+                **inputs,
+                "questions": "\n".join(
+                    f"{index}. {question}"
+                    for index, question in enumerate(questions_list, 1)
+                ),
+            },
         )
-        os.makedirs(
-            uploads_dir,
-            exist_ok=True,
+        answers = _parse_batched_answers(
+            _response_text(response_content), len(questions_list)
         )
 
-        temp_file_path = os.path.join(
-            uploads_dir,
-            f"temp_hr_assist_{file.filename}",
+    except Exception as e:
+        print(f"Batched hiring answers failed, answering one by one: {e}")
+        answers = {}
+
+    elapsed = _elapsed_ms(started)
+    return [
+        (
+            {
+                "question": question,
+                "answer": answers[index],
+                "elapsed_ms": elapsed,
+            }
+            if index in answers
+            else None
         )
-        file_bytes = file.file.read()
+        for index, question in enumerate(questions_list)
+    ]
 
-        with open(temp_file_path, "wb") as buffer:
-            buffer.write(file_bytes)
 
-        resume_text = process_document(
-            file_bytes,
-            file.filename,
+async def generate_answers_for_geting_hired(
+    resume_text,
+    role,
+    company,
+    questions_list,
+    word_limit,
+    user_company_knowledge,
+    company_research,
+    mode: HiringAnswerMode = "parallel",
+    max_concurrency: int = hiring_answer_concurrency,
+):
+    """Answer every question, keeping the order of ``questions_list``.
+
+    ``parallel`` runs one LLM call per question, at most ``max_concurrency``
+    at a time. ``batched`` asks for all answers in one call; questions the
+    batch leaves unanswered fall back to individual calls. Each result
+    carries the milliseconds spent producing it.
+    """
+    inputs = {
+        "resume": resume_text,
+        "role": role,
+        "company": company,
+        "company_context": _company_context(
+            company, user_company_knowledge, company_research
+        ),
+        "word_limit": word_limit,
+    }
+
+    results: List[Optional[dict]] = [None] * len(questions_list)
+    if mode == "batched":
+        results = await _answer_questions_batched(inputs, questions_list)
+
+    slots = asyncio.Semaphore(max(1, max_concurrency))
+    pending = [index for index, result in enumerate(results) if result is None]
+    answered = await asyncio.gather(
+        *(_answer_question(inputs, questions_list[index], slots) for index in pending)
+    )
+    for index, result in zip(pending, answered):
+        results[index] = result
+
+    return results
+
+
+def _hiring_assistant_response(generated_answers_list, mode, started):
+    answers_data = {}
+    timings = {}
+    for item in generated_answers_list:
+        answers_data[item["question"]] = item["answer"]
+        timings[item["question"]] = item["elapsed_ms"]
+
+    if not answers_data:
+        raise HTTPException(
+            status_code=500,
+            detail=ErrorResponse(message="No answers were generated.").model_dump(),
         )
+    return HiringAssistantResponse(
+        data=answers_data,
+        mode=mode,
+        elapsed_ms=_elapsed_ms(started),
+        timings=timings,
+    )
 
-        if resume_text is None:
-            os.remove(temp_file_path)
-            raise HTTPException(
-                status_code=400,
-                detail=ErrorResponse(
-                    message=f"Unsupported file type or error processing file: {file.filename}"
-                ).model_dump(),
-            )
 
-        file_extension = (
-            os.path.splitext(file.filename)[1].lower() if file.filename else ""
+def _parse_questions(questions: str) -> List[str]:
+    """Parse the JSON-encoded questions form field; raises a 422 if invalid."""
+    try:
+        questions_list = json.loads(questions)
+        if (
+            not isinstance(questions_list, list)
+            or not all(isinstance(q, str) for q in questions_list)
+            or not questions_list
+        ):
+            raise ValueError("Questions must be a non-empty list of strings.")
+
+    except (json.JSONDecodeError, ValueError) as e:
+        raise HTTPException(
+            status_code=422,
+            detail=ErrorResponse(
+                message="Invalid format for questions. Expected a JSON string representing a non-empty list of strings.",
+                error_detail=str(e),
+            ).model_dump(),
         )
 
-        if resume_text.strip() and file_extension not in [".md", ".txt"]:
-            resume_text = format_resume_text_with_llm(resume_text)
+    return questions_list
+
+
+async def _read_resume_upload(file: UploadFile) -> str:
+    """Extract, format and validate the resume text of an uploaded file."""
+    uploads_dir = os.path.join(
+        os.path.dirname(__file__),
+        "../../uploads",
+    )
+    os.makedirs(
+        uploads_dir,
+        exist_ok=True,
+    )
+
+    temp_file_path = os.path.join(
+        uploads_dir,
+        f"temp_hr_assist_{file.filename}",
+    )
+    file_bytes = await file.read()
 
+    with open(temp_file_path, "wb") as buffer:
+        buffer.write(file_bytes)
+
+    resume_text = await run_blocking(
+        process_document,
+        file_bytes,
+        file.filename,
+    )
+
+    if resume_text is None:
         os.remove(temp_file_path)
+        raise HTTPException(
+            status_code=400,
+            detail=ErrorResponse(
+                message=f"Unsupported file type or error processing file: {file.filename}"
+            ).model_dump(),
+        )
 
-        if not is_valid_resume(resume_text):
-            raise HTTPException(
-                status_code=400,
-                detail=ErrorResponse(
-                    message="Invalid resume format or content."
-                ).model_dump(),
-            )
+    file_extension = os.path.splitext(file.filename)[1].lower() if file.filename else ""
+
+    if resume_text.strip() and file_extension not in [".md", ".txt"]:
+        resume_text = await format_resume_text_with_llm(resume_text)
+
+    os.remove(temp_file_path)
+
+    if not is_valid_resume(resume_text):
+        raise HTTPException(
+            status_code=400,
+            detail=ErrorResponse(
+                message="Invalid resume format or content."
+            ).model_dump(),
+        )
+
+    return resume_text
+
+
+async def hiring_assistant_service(
+    file: UploadFile,
+    role: str,
+    questions: str,
+    company_name: str,
+    user_knowledge: Optional[str],
+    company_url: Optional[str],
+    word_limit: Optional[int],
+    mode: HiringAnswerMode = "parallel",
+):
+    try:
+        questions_list = _parse_questions(questions)
+
+        resume_text = await _read_resume_upload(file)
 
         company_research_info = ""
         if company_url:
-            company_research_info = get_company_research(company_name, company_url)
+            company_research_info = await get_company_research(
+                company_name,
+                company_url,
+            )
 
-        generated_answers_list = generate_answers_for_geting_hired(
+        started = time.perf_counter()
+        generated_answers_list = await generate_answers_for_geting_hired(
             resume_text=resume_text,
             role=role,
             company=company_name,
@@ -191,18 +323,10 @@ def hiring_assistant_service(
             word_limit=word_limit,
             user_company_knowledge=user_knowledge or "",
             company_research=company_research_info,
+            mode=mode,
         )
 
-        answers_data = {}
-        for item in generated_answers_list:
-            answers_data[item["question"]] = item["answer"]
-
-        if not answers_data:
-            raise HTTPException(
-                status_code=500,
-                detail=ErrorResponse(message="No answers were generated.").model_dump(),
-            )
-        return HiringAssistantResponse(data=answers_data)
+        return _hiring_assistant_response(generated_answers_list, mode, started)
 
     except HTTPException:
         raise
@@ -224,6 +348,7 @@ async def hiring_assistant_v2_service(
     user_knowledge: Optional[str],
     company_url: Optional[str],
     word_limit: Optional[int],
+    mode: HiringAnswerMode = "parallel",
 ):
     if not llm:
         raise HTTPException(
@@ -232,29 +357,17 @@ async def hiring_assistant_v2_service(
         )
 
     try:
-        try:
-            questions_list = json.loads(questions)
-            if (
-                not isinstance(questions_list, list)
-                or not all(isinstance(q, str) for q in questions_list)
-                or not questions_list
-            ):
-                raise ValueError("Questions must be a non-empty list of strings.")
-
-        except (json.JSONDecodeError, ValueError) as e:
-            raise HTTPException(
-                status_code=422,
-                detail=ErrorResponse(
-                    message="Invalid format for questions. Expected a JSON string representing a non-empty list of strings.",
-                    error_detail=str(e),
-                ).model_dump(),
-            )
+        questions_list = _parse_questions(questions)
 
         company_research_info = ""
         if company_url:
-            company_research_info = get_company_research(company_name, company_url)
+            company_research_info = await get_company_research(
+                company_name,
+                company_url,
+            )
 
-        generated_answers_list = generate_answers_for_geting_hired(
+        started = time.perf_counter()
+        generated_answers_list = await generate_answers_for_geting_hired(
             resume_text=resume_text,
             role=role,
             company=company_name,
@@ -262,18 +375,178 @@ async def hiring_assistant_v2_service(
             word_limit=word_limit,
             user_company_knowledge=user_knowledge or "",
             company_research=company_research_info,
+            mode=mode,
         )
 
-        answers_data = {}
-        for item in generated_answers_list:
-            answers_data[item["question"]] = item["answer"]
+        return _hiring_assistant_response(generated_answers_list, mode, started)
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=ErrorResponse(
+                message="Failed to generate hiring assistance.", error_detail=str(e)
+            ).model_dump(),
+        )
+
+
+async def _stream_question(
+    inputs: dict,
+    index: int,
+    question: str,
+    slots: asyncio.Semaphore,
+    events: asyncio.Queue,
+):
+    async with slots:
+        started = time.perf_counter()
+        parts: List[str] = []
+        try:
+            async for chunk in astream(
+                hiring_assistant_stream_chain,
+                {
+                    **inputs,
+                    "question": question,
+                },
+            ):
+                delta = _response_text(chunk)
+                if isinstance(delta, str) and delta:
+                    parts.append(delta)
+                    await events.put(
+                        StreamingEvent(
+                            type="token",
+                            payload={
+                                "index": index,
+                                "question": question,
+                                "delta": delta,
+                            },
+                        )
+                    )
+            answer = "".join(parts).strip()
+
+        except Exception as e:
+            answer = f"Error generating answer: {e}"
+
+        return {
+            "question": question,
+            "answer": answer,
+            "elapsed_ms": _elapsed_ms(started),
+        }
+
 
-        if not answers_data:
-            raise HTTPException(
-                status_code=500,
-                detail=ErrorResponse(message="No answers were generated.").model_dump(),
+async def stream_answers_for_geting_hired(
+    resume_text: str,
+    role: str,
+    company: str,
+    questions_list: List[str],
+    word_limit: Optional[int],
+    user_company_knowledge: str,
+    company_url: Optional[str],
+    stream_tokens: bool = False,
+    max_concurrency: int = hiring_answer_concurrency,
+) -> AsyncIterator[StreamingEvent]:
+    """Answer the questions concurrently, yielding each answer as it finishes.
+
+    Events: ``start``, then one ``answer`` per question in completion order
+    (with its index, timing and progress), then ``complete``. With
+    ``stream_tokens`` each answer is also streamed as ``token`` deltas.
+    """
+    total = len(questions_list)
+    started = time.perf_counter()
+    tasks: List[asyncio.Task] = []
+
+    yield StreamingEvent(
+        type="start",
+        message=f"Answering {total} questions",
+        payload={"totalQuestions": total, "streamTokens": stream_tokens},
+    )
+
+    try:
+        company_research_info = ""
+        if company_url:
+            company_research_info = await get_company_research(company, company_url)
+
+        inputs = {
+            "resume": resume_text,
+            "role": role,
+            "company": company,
+            "company_context": _company_context(
+                company, user_company_knowledge, company_research_info
+            ),
+            "word_limit": word_limit,
+        }
+        slots = asyncio.Semaphore(max(1, max_concurrency))
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def _run(index: int, question: str) -> None:
+            if stream_tokens:
+                result = await _stream_question(inputs, index, question, slots, events)
+            else:
+                result = await _answer_question(inputs, question, slots)
+            await events.put(
+                StreamingEvent(
+                    type="answer",
+                    message=question,
+                    payload={"index": index, **result},
+                )
             )
-        return HiringAssistantResponse(data=answers_data)
+
+        tasks = [
+            asyncio.create_task(_run(index, question))
+            for index, question in enumerate(questions_list)
+        ]
+
+        timings: Dict[str, float] = {}
+        completed = 0
+        while completed < total:
+            event = await events.get()
+            if event.type == "answer":
+                completed += 1
+                timings[event.payload["question"]] = event.payload["elapsed_ms"]
+                event.payload["progress"] = {
+                    "completed": completed,
+                    "totalQuestions": total,
+                }
+            yield event
+
+        yield StreamingEvent(
+            type="complete",
+            message=f"Answered {total} questions",
+            payload={
+                "totalQuestions": total,
+                "elapsed_ms": _elapsed_ms(started),
+                "timings": timings,
+            },
+        )
+
+    except Exception as e:
+        yield StreamingEvent(
+            type="error",
+            message="Failed to generate hiring assistance.",
+            payload={"error_detail": str(e)},
+        )
+
+    finally:
+        # The client may disconnect mid-stream; don't leave work running.
+        for task in tasks:
+            task.cancel()
+
+
+async def hiring_assistant_stream_service(
+    file: UploadFile,
+    role: str,
+    questions: str,
+    company_name: str,
+    user_knowledge: Optional[str],
+    company_url: Optional[str],
+    word_limit: Optional[int],
+    stream_tokens: bool = False,
+) -> AsyncIterator[StreamingEvent]:
+    """Validate the upload up front, then return the answer event stream."""
+    try:
+        questions_list = _parse_questions(questions)
+        resume_text = await _read_resume_upload(file)
 
     except HTTPException:
         raise
@@ -285,3 +558,42 @@ async def hiring_assistant_v2_service(
                 message="Failed to generate hiring assistance.", error_detail=str(e)
             ).model_dump(),
         )
+
+    return stream_answers_for_geting_hired(
+        resume_text=resume_text,
+        role=role,
+        company=company_name,
+        questions_list=questions_list,
+        word_limit=word_limit,
+        user_company_knowledge=user_knowledge or "",
+        company_url=company_url,
+        stream_tokens=stream_tokens,
+    )
+
+
+async def hiring_assistant_v2_stream_service(
+    resume_text: str,
+    role: str,
+    questions: str,
+    company_name: str,
+    user_knowledge: Optional[str],
+    company_url: Optional[str],
+    word_limit: Optional[int],
+    stream_tokens: bool = False,
+) -> AsyncIterator[StreamingEvent]:
+    if not llm:
+        raise HTTPException(
+            status_code=503,
+            detail=ErrorResponse(message="LLM service is not available.").model_dump(),
+        )
+
+    return stream_answers_for_geting_hired(
+        resume_text=resume_text,
+        role=role,
+        company=company_name,
+        questions_list=_parse_questions(questions),
+        word_limit=word_limit,
+        user_company_knowledge=user_knowledge or "",
+        company_url=company_url,
+        stream_tokens=stream_tokens,
+    )
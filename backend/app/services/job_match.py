@@ -0,0 +1,206 @@
+"""Match one resume against many job descriptions.
+
+The resume is analysed once: its skills, contact/structure checks and word
+bag are computed by :func:`~app.services.ats_metrics.prepare_resume` and
+cached by text hash, and its embeddings live in the embedding cache. Every
+JD is then scored locally with the ATS metrics (one batched embedding call
+for all JDs), and only the ``top_k`` best matches go through the full
+``/ats/evaluate`` agent. Evaluations run concurrently but are reported in
+rank order.
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.cache import LRUCache, register_cache_stats
+from app.core.concurrency import run_scoring
+from app.core.config import (
+    ats_semantic_hint,
+    job_match_llm_concurrency,
+    job_match_max_jobs,
+    job_match_max_top_k,
+    job_match_resume_cache_entries,
+    job_match_top_k,
+)
+from app.models.schemas import (
+    JDEvaluatorResponse,
+    JobMatchRequest,
+    JobMatchResponse,
+    JobMatchResult,
+    JobPosting,
+    StreamingEvent,
+)
+from app.services.ats import ats_evaluate_service
+from app.services.ats_metrics import PreparedResume, compute_ats_metrics, prepare_resume
+from app.services.resume_session import resolve_resume_text
+from app.services.semantic_scorer import EmbeddingModelUnavailable, score_jds
+
+_prepared_resumes = LRUCache[PreparedResume](max_entries=job_match_resume_cache_entries)
+
+register_cache_stats("prepared_resumes", _prepared_resumes.stats_dict)
+
+
+def _prepared_resume(resume_text: str) -> PreparedResume:
+    key = hashlib.sha1(resume_text.encode("utf-8")).hexdigest()
+    resume = _prepared_resumes.get(key)
+    if resume is None:
+        resume = prepare_resume(resume_text)
+        _prepared_resumes.set(key, resume)
+    return resume
+
+
+def rank_jobs(resume_text: str, jobs: List[JobPosting]) -> List[JobMatchResult]:
+    """Score ``resume_text`` against every JD locally, best match first."""
+    resume = _prepared_resume(resume_text)
+
+    semantic: List[Optional[float]] = [None] * len(jobs)
+    if ats_semantic_hint:
+        try:
+            scores = score_jds(resume_text, [job.jd_text for job in jobs])
+            semantic = [score.score for score in scores]
+
+        except EmbeddingModelUnavailable:
+            pass
+
+    results = []
+    for index, (job, hint) in enumerate(zip(jobs, semantic)):
+        metrics = compute_ats_metrics(resume, job.jd_text, semantic=hint)
+        results.append(
+            JobMatchResult(
+                index=index,
+                rank=0,
+                id=job.id,
+                title=job.title,
+                company_name=job.company_name,
+                score=metrics.composite,
+                semantic=metrics.semantic,
+                req_keyword_cov=metrics.req_keyword_cov,
+                found_keywords=metrics.found_keywords,
+                missing_keywords=metrics.missing_keywords,
+            )
+        )
+
+    results.sort(key=lambda result: (-result.score, result.index))
+    for rank, result in enumerate(results, start=1):
+        result.rank = rank
+    return results
+
+
+async def prepare_job_match(
+    payload: JobMatchRequest,
+) -> Tuple[str, List[JobMatchResult]]:
+    """Validate the request and rank its jobs; returns (resume_text, ranking)."""
+    resume_text = resolve_resume_text(payload.resume_text, payload.session_id)
+    if len(payload.jobs) > job_match_max_jobs:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {job_match_max_jobs} jobs can be matched per request.",
+        )
+
+    ranking = await run_scoring(rank_jobs, resume_text, payload.jobs)
+    return resume_text, ranking
+
+
+async def _evaluate(
+    resume_text: str, job: JobPosting, slots: asyncio.Semaphore
+) -> JDEvaluatorResponse:
+    async with slots:
+        return await ats_evaluate_service(
+            resume_text=resume_text,
+            jd_text=job.jd_text,
+            company_name=job.company_name,
+        )
+
+
+async def _evaluated_in_rank_order(
+    payload: JobMatchRequest,
+    resume_text: str,
+    ranking: List[JobMatchResult],
+) -> AsyncIterator[JobMatchResult]:
+    """Run the top-k evaluations concurrently and yield them by rank."""
+    top_k = job_match_top_k if payload.top_k is None else payload.top_k
+    top_k = min(top_k, job_match_max_top_k)
+    slots = asyncio.Semaphore(max(1, job_match_llm_concurrency))
+    tasks = [
+        asyncio.create_task(_evaluate(resume_text, payload.jobs[result.index], slots))
+        for result in ranking[:top_k]
+    ]
+
+    try:
+        for result, task in zip(ranking, tasks):
+            try:
+                result.evaluation = await task
+
+            except HTTPException as e:
+                result.evaluation_error = str(e.detail)
+
+            except Exception as e:
+                result.evaluation_error = str(e)
+
+            yield result
+
+    finally:
+        # The client may disconnect mid-stream; don't leave evaluations running.
+        for task in tasks:
+            task.cancel()
+
+
+async def job_match_service(payload: JobMatchRequest) -> JobMatchResponse:
+    started = time.perf_counter()
+    resume_text, ranking = await prepare_job_match(payload)
+    async for _ in _evaluated_in_rank_order(payload, resume_text, ranking):
+        pass
+
+    return JobMatchResponse(
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        results=ranking,
+    )
+
+
+async def job_match_stream(
+    payload: JobMatchRequest,
+    resume_text: str,
+    ranking: List[JobMatchResult],
+) -> AsyncIterator[StreamingEvent]:
+    """Stream the local ranking, then one ``evaluation`` event per top-k job."""
+    started = time.perf_counter()
+
+    yield StreamingEvent(
+        type="ranking",
+        message=f"Ranked {len(ranking)} jobs",
+        payload={"results": [result.model_dump() for result in ranking]},
+    )
+
+    try:
+        async for result in _evaluated_in_rank_order(payload, resume_text, ranking):
+            yield StreamingEvent(
+                type="evaluation",
+                message=f"Evaluated rank {result.rank}: "
+                + (result.title or result.id or f"job {result.index}"),
+                payload=result.model_dump(),
+            )
+
+        yield StreamingEvent(
+            type="complete",
+            message="Job matching completed",
+            payload={"elapsed_ms": round((time.perf_counter() - started) * 1000, 1)},
+        )
+
+    except Exception as e:
+        yield StreamingEvent(
+            type="error",
+            message="Job matching failed",
+            payload={"error": str(e)},
+        )
+
+
+__all__ = [
+    "job_match_service",
+    "job_match_stream",
+    "prepare_job_match",
+    "rank_jobs",
+]
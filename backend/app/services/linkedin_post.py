@@ -1,13 +1,18 @@
+import asyncio
 import re
 from fastapi import HTTPException
 from datetime import datetime
 
 from app.models.schemas import (
     PostGenerationRequest,
+    LinkedInPostDraft,
     GeneratedPost,
     PostGenerationResponse,
 )
 from app.core.llm import llm
+from app.core.model_router import routed_llm
+from app.core.concurrency import ainvoke
+from app.core.config import linkedin_post_concurrency
 
 
 try:
@@ -18,6 +23,24 @@ try:
 except ImportError:
     HAS_AGENTS = False
 
+try:
+    from app.agents.github_agent import GitHubAgent
+
+    # One agent for every request; it shares the GitHub client anyway.
+    github_agent = GitHubAgent()
+    HAS_GITHUB_AGENT = True
+
+except ImportError:
+    HAS_GITHUB_AGENT = False
+
+post_llm = routed_llm("creative", "linkedin_post")
+# Post, hashtags and CTA in one call instead of three round-trips.
+structured_post_llm = (
+    post_llm.with_structured_output(LinkedInPostDraft) if post_llm else None
+)
+# Editing an existing post to an instruction is a light rewrite.
+post_edit_llm = routed_llm("formatting", "linkedin_post_edit")
+
 
 def clean_post_content(content: str) -> str:
     """Clean up LLM output to remove explanatory text and return only the post content."""
@@ -64,22 +87,6 @@ def clean_post_content(content: str) -> str:
     return result
 
 
-def scrape_github_project_info(repo_url: str) -> dict:
-    """Mock GitHub scraping function"""
-    match = re.match(r"https://github.com/([^/]+)/([^/]+)", repo_url)
-    if not match:
-        return {"error": "Invalid GitHub URL"}
-
-    owner, repo = match.groups()
-    return {
-        "project_name": repo.replace("-", " ").title(),
-        "description": f"Mock description for {repo}",
-        "main_technologies": ["Python", "FastAPI"],
-        "stars": 123,
-        "repo_link": repo_url,
-    }
-
-
 async def research_topic_with_web(topic: str, context: str = "") -> dict:
     """Research a topic using web search agent"""
     if not HAS_AGENTS:
@@ -101,13 +108,82 @@ async def research_topic_with_web(topic: str, context: str = "") -> dict:
         }
 
 
+async def gather_github_context(repo_url: str) -> str:
+    """Short project description used as context for the posts.
+
+    Returns "" if the repository can't be read, so no made-up project
+    details reach the prompt.
+    """
+    if not HAS_GITHUB_AGENT:
+        return ""
+
+    github_data = await github_agent.get_repository_info(repo_url)
+    if not github_data or github_data.get("error"):
+        error = github_data.get("error") if github_data else "no data"
+        print(f"GitHub context unavailable for {repo_url}: {error}")
+        return ""
+
+    description = github_data.get("description") or ""
+    technologies = list(github_data.get("languages", {}))[:5]
+    context = f"\nProject: {github_data.get('name')} - {description}\n"
+    if technologies:
+        context += f"Technologies: {', '.join(technologies)}\n"
+    return context
+
+
+_PLAIN_FIELD_RE = re.compile(r"^\s*(POST|HASHTAGS|CTA)\s*:\s*(.*)$", re.I)
+
+
+def _parse_plain_draft(content: str) -> LinkedInPostDraft:
+    """Split a ``POST:`` / ``HASHTAGS:`` / ``CTA:`` reply into its fields.
+
+    Lines before any label, or the whole reply if the model ignored the
+    format, are taken as the post text.
+    """
+    fields = {"post": [], "hashtags": [], "cta": []}
+    current = "post"
+    for line in content.splitlines():
+        match = _PLAIN_FIELD_RE.match(line)
+        if match:
+            current = match.group(1).lower()
+            line = match.group(2)
+        fields[current].append(line)
+
+    hashtags = re.split(r"[,\s]+", " ".join(fields["hashtags"]))
+    return LinkedInPostDraft(
+        text="\n".join(fields["post"]).strip(),
+        hashtags=[tag for tag in hashtags if tag],
+        cta=" ".join(fields["cta"]).strip(),
+    )
+
+
+def _clean_hashtags(hashtags) -> list:
+    cleaned_hashtags = []
+    for h in hashtags[:3]:
+        cleaned = (
+            h.strip()
+            .replace("#", "")
+            .replace('"', "")
+            .replace("'", "")
+            .replace("[", "")
+            .replace("]", "")
+        )
+        if cleaned:
+            cleaned_hashtags.append(cleaned)
+    return cleaned_hashtags
+
+
 async def generate_single_post(
     request: PostGenerationRequest,
     post_number: int = 1,
     github_context: str = "",
     research_context: str = "",
 ) -> GeneratedPost:
-    """Generate a single LinkedIn post with enhanced context"""
+    """Generate a single LinkedIn post with enhanced context.
+
+    The post, its hashtags and its call to action come back from one
+    structured-output call.
+    """
 
     if not llm:
         raise HTTPException(status_code=500, detail="LLM is not available")
@@ -140,64 +216,73 @@ async def generate_single_post(
     if research_context:
         enhanced_context += f"\nResearch Insights: {research_context}"
 
+    audience = (
+        ", ".join(request.audience)
+        if isinstance(request.audience, list)
+        else request.audience
+    )
+    suggest_hashtags = request.hashtags_option == "suggest"
+
     # Create the enhanced prompt
-    prompt = (
-        f"Generate ONLY the LinkedIn post content ({length_guidance}) about {request.topic}.\n"
-        "Tone: {request.tone or 'Professional'}\n"
-        "Audience: {request.audience or 'General'}\n"
+    brief = (
+        f"Generate a LinkedIn post ({length_guidance}) about {request.topic}.\n"
+        f"Tone: {request.tone or 'Professional'}\n"
+        f"Audience: {audience or 'General'}\n"
         f"Use {emoji_guidance}.\n"
+        f"This is post {post_number} of {request.post_count}; give it its own angle.\n"
         f"{enhanced_context}\n"
         "\n"
         "Make the post engaging, authentic, and valuable to your professional network. Include insights, personal thoughts, or industry perspectives when relevant.\n"
         "\n"
-        "IMPORTANT: Return ONLY the post text without any explanatory lines, introductions, or meta-commentary. \n"
-        "Do not include lines like 'Here's a LinkedIn post about...' or similar. \n"
-        "Just return the actual post content that would be posted directly to LinkedIn."
     )
-
-    try:
-        # Generate the post content
-        response = await llm.ainvoke(prompt)
-        post_text = clean_post_content(
-            str(response.content) if hasattr(response, "content") else str(response)
+    fill_in = (
+        "Fill in:\n"
+        + "- text: ONLY the post content that would be posted directly to LinkedIn, without explanatory lines, introductions, or meta-commentary (no 'Here's a LinkedIn post about...').\n"
+        + (
+            "- hashtags: exactly 3 simple hashtags for the post, without # symbols.\n"
+            if suggest_hashtags
+            else "- hashtags: an empty list.\n"
+        )
+        + (
+            "- cta: a concise call-to-action (CTA) for the post.\n"
+            if not request.cta_text
+            else "- cta: an empty string.\n"
+        )
+    )
+    # Fallback when the structured call fails: labelled plain-text sections.
+    plain_format = (
+        "Reply in exactly this format, with nothing before or after it:\n"
+        "POST:\n"
+        "<only the post content that would be posted directly to LinkedIn, without explanatory lines or meta-commentary>\n"
+        + (
+            "HASHTAGS: <exactly 3 simple hashtags, comma-separated, without # symbols>\n"
+            if suggest_hashtags
+            else ""
         )
+        + (
+            "CTA: <a concise call-to-action for the post>\n"
+            if not request.cta_text
+            else ""
+        )
+    )
 
-        # Generate hashtags if requested
-        hashtags = []
-        if request.hashtags_option == "suggest":
-            hashtag_prompt = f"Suggest exactly 3 simple hashtags for this LinkedIn post (return as plain text separated by commas, no quotes, no # symbols): {post_text}"
-            hashtag_response = await llm.ainvoke(hashtag_prompt)
-
-            # Parse hashtags
-            hashtag_text = (
-                str(hashtag_response.content)
-                if hasattr(hashtag_response, "content")
-                else str(hashtag_response)
-            )
-            hashtag_text = hashtag_text.strip()
-            for h in hashtag_text.split(",")[:3]:
-                cleaned = (
-                    h.strip()
-                    .replace("#", "")
-                    .replace('"', "")
-                    .replace("'", "")
-                    .replace("[", "")
-                    .replace("]", "")
-                )
-                if cleaned:
-                    hashtags.append(cleaned)
-
-        # Generate CTA if not provided
-        cta = request.cta_text
-        if not cta:
-            cta_prompt = f"Suggest a concise call-to-action (CTA) for this LinkedIn post: {post_text}"
-            cta_response = await llm.ainvoke(cta_prompt)
-            cta = (
-                str(cta_response.content)
-                if hasattr(cta_response, "content")
-                else str(cta_response)
+    try:
+        try:
+            draft = await ainvoke(structured_post_llm, brief + fill_in)
+            if not isinstance(draft, LinkedInPostDraft) or not draft.text.strip():
+                raise ValueError("Empty structured post.")
+
+        except Exception as e:
+            # Some responses don't fit the schema; fall back to plain text.
+            print(f"Structured post generation failed, using plain text: {e}")
+            response = await ainvoke(post_llm, brief + plain_format)
+            draft = _parse_plain_draft(
+                str(response.content) if hasattr(response, "content") else str(response)
             )
-            cta = cta.strip()
+
+        post_text = clean_post_content(draft.text)
+        hashtags = _clean_hashtags(draft.hashtags) if suggest_hashtags else []
+        cta = request.cta_text or draft.cta.strip()
 
         # Get GitHub project name if available
         github_project_name = None
@@ -222,44 +307,69 @@ async def generate_single_post(
         )
 
 
+async def _research_context(topic: str) -> str:
+    try:
+        research_data = await research_topic_with_web(topic)
+        return research_data.get("research_summary", "")
+
+    except Exception as e:
+        print(f"Research failed, continuing without: {e}")
+        return ""
+
+
+async def _github_context(repo_url: str) -> str:
+    try:
+        return await gather_github_context(repo_url)
+
+    except Exception as e:
+        print(f"GitHub context failed, continuing without: {e}")
+        return ""
+
+
+async def _empty_context() -> str:
+    return ""
+
+
 async def generate_linkedin_posts_service(
     request: PostGenerationRequest,
 ) -> PostGenerationResponse:
     """Generate LinkedIn posts using the core LLM with enhanced research capabilities"""
 
     try:
-        # Research the topic if agents are available
-        research_context = ""
-        if HAS_AGENTS and request.topic:
-            try:
-                research_data = await research_topic_with_web(request.topic)
-                research_context = research_data.get("research_summary", "")
-
-            except Exception as e:
-                print(f"Research failed, continuing without: {e}")
-
-        # Handle GitHub project info if provided
-        github_context = ""
-        if request.github_project_url:
-            github_data = scrape_github_project_info(str(request.github_project_url))
-            if not github_data.get("error"):
-                github_context = f"\nProject: {github_data.get('project_name')} - {github_data.get('description')}\n"
-
-        # Generate multiple posts
-        posts = []
-        for i in range(request.post_count):
-            post = await generate_single_post(
-                request,
-                i + 1,
-                github_context,
-                research_context,
-            )
-            posts.append(post)
+        # Topic research and GitHub context are independent; gather both at once.
+        research_context, github_context = await asyncio.gather(
+            (
+                _research_context(request.topic)
+                if HAS_AGENTS and request.topic and request.enable_research
+                else _empty_context()
+            ),
+            (
+                _github_context(str(request.github_project_url))
+                if request.github_project_url
+                else _empty_context()
+            ),
+        )
+
+        # Generate the posts concurrently, at most linkedin_post_concurrency at once.
+        slots = asyncio.Semaphore(max(1, linkedin_post_concurrency))
+
+        async def _generate(post_number: int) -> GeneratedPost:
+            async with slots:
+                return await generate_single_post(
+                    request,
+                    post_number,
+                    github_context,
+                    research_context,
+                )
+
+        posts = await asyncio.gather(
+            *(_generate(i + 1) for i in range(request.post_count))
+        )
 
         return PostGenerationResponse(
             success=True,
             message=f"Successfully generated {len(posts)} LinkedIn posts",
-            posts=posts,
+            posts=list(posts),
             timestamp=datetime.now().isoformat(),
         )
 
@@ -294,7 +404,7 @@ async def edit_post_llm_service(payload: dict) -> dict:
             "Return only the edited post text without any explanatory comments."
         )
 
-        response = await llm.ainvoke(prompt)
+        response = await ainvoke(post_edit_llm, prompt)
         edited_text = clean_post_content(
             str(response.content) if hasattr(response, "content") else str(response)
         )
@@ -7,8 +7,11 @@ from datetime import datetime
 from fastapi import HTTPException
 from pydantic import BaseModel, HttpUrl, Field
 
-from app.core.llm import llm
+from app.core.model_router import routed_llm
+from app.core.concurrency import ainvoke
+from app.core.dag import Stage, StageGraph
 from app.models.schemas import PostGenerationRequest, GeneratedPost
+from app.services.linkedin_post import generate_single_post
 
 # Import agents with fallback
 try:
@@ -19,6 +22,8 @@ try:
 except ImportError:
     HAS_AGENTS = False
 
+profile_llm = routed_llm("creative", "linkedin_profile")
+
 
 class LinkedInProfileContent(BaseModel):
     """LinkedIn profile content structure"""
@@ -66,6 +71,15 @@ class LinkedInPageRequest(BaseModel):
     )
 
 
+class StageTimingInfo(BaseModel):
+    """Timing of one generation stage"""
+
+    status: str = Field(description="ok, timeout or failed (fallback used)")
+    started_ms: float
+    elapsed_ms: float
+    error: Optional[str] = None
+
+
 class LinkedInPageResponse(BaseModel):
     """Response model for LinkedIn page generation"""
 
@@ -74,9 +88,44 @@ class LinkedInPageResponse(BaseModel):
     suggested_posts: List[GeneratedPost] = Field(default_factory=list)
     content_calendar: List[Dict[str, Any]] = Field(default_factory=list)
     engagement_tips: List[str] = Field(default_factory=list)
+    elapsed_ms: Optional[float] = None
+    stage_timings: Dict[str, StageTimingInfo] = Field(default_factory=dict)
     timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
 
 
+# Seconds each stage may take before its fallback is used.
+STAGE_TIMEOUTS = {
+    "industry_research": 30.0,
+    "github_repo": 60.0,
+    "profile_section": 45.0,
+    "post": 45.0,
+}
+
+# Stages running at once for one page request.
+LINKEDIN_PAGE_MAX_CONCURRENCY = 8
+
+SECTION_PROMPTS = {
+    "headline": """
+Create a compelling LinkedIn headline for this professional. Keep it under 220 characters, professional yet engaging.
+
+{context}
+
+Generate ONLY the headline text, no explanations:""",
+    "summary": """
+Create a professional LinkedIn summary/about section (2-3 paragraphs) for this professional. Make it engaging, authentic, and value-focused.
+
+{context}
+
+Generate ONLY the summary text, no explanations:""",
+    "about_section": """
+Create a detailed LinkedIn 'About' section for this professional. Include professional journey, expertise, values, and what they're passionate about. Keep it conversational but professional.
+
+{context}
+
+Generate ONLY the about section text, no explanations:""",
+}
+
+
 class LinkedInPageGenerator:
     """Service class for generating comprehensive LinkedIn page content"""
 
@@ -84,6 +133,88 @@ class LinkedInPageGenerator:
         self.web_agent = WebSearchAgent() if HAS_AGENTS else None
         self.github_agent = GitHubAgent() if HAS_AGENTS else None
 
+    def _build_stage_graph(self, request: LinkedInPageRequest) -> StageGraph:
+        """Declare the page pipeline as stages with their dependencies.
+
+        Research and every repository analysis start immediately; headline,
+        summary and about only need the research; each suggested post waits
+        for the research and the repository analyses.
+        """
+        graph = StageGraph(max_concurrency=LINKEDIN_PAGE_MAX_CONCURRENCY)
+
+        graph.add(
+            Stage(
+                "industry_research",
+                lambda: self._research_industry(request),
+                timeout=STAGE_TIMEOUTS["industry_research"],
+                fallback="",
+            )
+        )
+
+        repo_stages = []
+        if self.github_agent:
+            for index, repo_url in enumerate(request.featured_repositories):
+                name = f"github_repo_{index + 1}"
+                repo_stages.append(name)
+                graph.add(
+                    Stage(
+                        name,
+                        lambda url=str(repo_url): self._analyze_repository(url),
+                        timeout=STAGE_TIMEOUTS["github_repo"],
+                        fallback=None,
+                    )
+                )
+
+        async def _collect_insights(**analyses) -> List[Dict]:
+            return [analyses[name] for name in repo_stages if analyses[name]]
+
+        graph.add(Stage("github_insights", _collect_insights, depends_on=repo_stages))
+
+        for section in ("headline", "summary", "about_section"):
+            graph.add(
+                Stage(
+                    section,
+                    lambda industry_research, section=section: self._generate_section(
+                        section, request, industry_research
+                    ),
+                    depends_on=["industry_research"],
+                    timeout=STAGE_TIMEOUTS["profile_section"],
+                    fallback=lambda section=section: self._fallback_section(
+                        section, request
+                    ),
+                )
+            )
+
+        post_stages = []
+        if request.generate_posts:
+            themes = request.content_themes or [
+                "Industry insights",
+                "Career growth",
+                "Technology trends",
+            ]
+            for i, theme in enumerate(themes[: request.post_count]):
+                name = f"post_{i + 1}"
+                post_stages.append(name)
+                graph.add(
+                    Stage(
+                        name,
+                        lambda industry_research, github_insights, i=i, theme=theme: (
+                            self._generate_suggested_post(
+                                request, i, theme, industry_research, github_insights
+                            )
+                        ),
+                        depends_on=["industry_research", "github_insights"],
+                        timeout=STAGE_TIMEOUTS["post"],
+                        fallback=None,
+                    )
+                )
+
+        async def _collect_posts(**posts) -> List[GeneratedPost]:
+            return [posts[name] for name in post_stages if posts[name] is not None]
+
+        graph.add(Stage("suggested_posts", _collect_posts, depends_on=post_stages))
+        return graph
+
     async def generate_linkedin_page(
         self, request: LinkedInPageRequest
     ) -> LinkedInPageResponse:
@@ -91,42 +222,16 @@ class LinkedInPageGenerator:
         Generate comprehensive LinkedIn page content including profile and posts
         """
         try:
-            # Research industry trends if agents are available
-            industry_insights = ""
-            if self.web_agent and request.industry:
-                try:
-                    research = await self.web_agent.research_topic(
-                        f"{request.industry} trends career opportunities 2024",
-                        f"Professional with {request.years_of_experience} years experience",
-                    )
-                    industry_insights = research.get("research_summary", "")
-                except Exception as e:
-                    print(f"Industry research failed: {e}")
-
-            # Analyze GitHub projects if provided
-            github_insights = []
-            if self.github_agent and request.featured_repositories:
-                for repo_url in request.featured_repositories:
-                    try:
-                        analysis = await self.github_agent.analyze_project_for_linkedin(
-                            str(repo_url)
-                        )
-                        if not analysis.get("error"):
-                            github_insights.append(analysis)
-                    except Exception as e:
-                        print(f"GitHub analysis failed for {repo_url}: {e}")
-
-            # Generate profile content
-            profile_content = await self._generate_profile_content(
-                request, industry_insights, github_insights
+            outcome = await self._build_stage_graph(request).run()
+
+            profile_content = self._assemble_profile_content(
+                request,
+                outcome["headline"],
+                outcome["summary"],
+                outcome["about_section"],
+                outcome["github_insights"],
             )
-
-            # Generate suggested posts
-            suggested_posts = []
-            if request.generate_posts:
-                suggested_posts = await self._generate_suggested_posts(
-                    request, industry_insights, github_insights
-                )
+            suggested_posts = outcome["suggested_posts"]
 
             # Create content calendar
             content_calendar = self._create_content_calendar(request, suggested_posts)
@@ -139,6 +244,11 @@ class LinkedInPageGenerator:
                 suggested_posts=suggested_posts,
                 content_calendar=content_calendar,
                 engagement_tips=engagement_tips,
+                elapsed_ms=outcome.elapsed_ms,
+                stage_timings={
+                    name: StageTimingInfo(**timing.as_dict())
+                    for name, timing in outcome.timings.items()
+                },
             )
 
         except Exception as e:
@@ -146,16 +256,28 @@ class LinkedInPageGenerator:
                 status_code=500, detail=f"Error generating LinkedIn page: {str(e)}"
             )
 
-    async def _generate_profile_content(
-        self,
-        request: LinkedInPageRequest,
-        industry_insights: str,
-        github_insights: List[Dict],
-    ) -> LinkedInProfileContent:
-        """Generate LinkedIn profile content"""
+    async def _research_industry(self, request: LinkedInPageRequest) -> str:
+        """Research industry trends if agents are available"""
+        if not self.web_agent or not request.industry:
+            return ""
 
-        # Build context for profile generation
-        context = f"""
+        research = await self.web_agent.research_topic(
+            f"{request.industry} trends career opportunities 2024",
+            f"Professional with {request.years_of_experience} years experience",
+        )
+        return research.get("research_summary", "")
+
+    async def _analyze_repository(self, repo_url: str) -> Optional[Dict]:
+        analysis = await self.github_agent.analyze_project_for_linkedin(repo_url)
+        if analysis.get("error"):
+            print(f"GitHub analysis failed for {repo_url}: {analysis['error']}")
+            return None
+        return analysis
+
+    def _profile_context(
+        self, request: LinkedInPageRequest, industry_insights: str
+    ) -> str:
+        return f"""
 Professional Profile Information:
 - Name: {request.name}
 - Current Role: {request.current_role}
@@ -168,54 +290,41 @@ Professional Profile Information:
 
 Industry Context: {industry_insights}
 
-GitHub Projects: {len(github_insights)} featured projects available
+GitHub Projects: {len(request.featured_repositories)} featured projects available
 """
 
-        # Generate headline
-        headline_prompt = f"""
-Create a compelling LinkedIn headline for this professional. Keep it under 220 characters, professional yet engaging.
-
-{context}
-
-Generate ONLY the headline text, no explanations:"""
-
-        headline_response = await llm.ainvoke(headline_prompt)
-        headline = str(
-            headline_response.content
-            if hasattr(headline_response, "content")
-            else headline_response
-        ).strip()
-
-        # Generate summary
-        summary_prompt = f"""
-Create a professional LinkedIn summary/about section (2-3 paragraphs) for this professional. Make it engaging, authentic, and value-focused.
-
-{context}
-
-Generate ONLY the summary text, no explanations:"""
-
-        summary_response = await llm.ainvoke(summary_prompt)
-        summary = str(
-            summary_response.content
-            if hasattr(summary_response, "content")
-            else summary_response
+    async def _generate_section(
+        self,
+        section: str,
+        request: LinkedInPageRequest,
+        industry_insights: str,
+    ) -> str:
+        """Generate the headline, summary or about section of the profile"""
+        prompt = SECTION_PROMPTS[section].format(
+            context=self._profile_context(request, industry_insights)
+        )
+        response = await ainvoke(profile_llm, prompt)
+        return str(
+            response.content if hasattr(response, "content") else response
         ).strip()
 
-        # Generate about section (longer version)
-        about_prompt = f"""
-Create a detailed LinkedIn 'About' section for this professional. Include professional journey, expertise, values, and what they're passionate about. Keep it conversational but professional.
-
-{context}
-
-Generate ONLY the about section text, no explanations:"""
-
-        about_response = await llm.ainvoke(about_prompt)
-        about_section = str(
-            about_response.content
-            if hasattr(about_response, "content")
-            else about_response
-        ).strip()
+    def _fallback_section(self, section: str, request: LinkedInPageRequest) -> str:
+        if section == "headline":
+            return f"{request.current_role} | {request.industry}"
+        return (
+            f"{request.current_role} with {request.years_of_experience} years of "
+            f"experience in {request.industry}, skilled in "
+            f"{', '.join(request.key_skills[:5])}."
+        )
 
+    def _assemble_profile_content(
+        self,
+        request: LinkedInPageRequest,
+        headline: str,
+        summary: str,
+        about_section: str,
+        github_insights: List[Dict],
+    ) -> LinkedInProfileContent:
         # Process experience highlights
         experience_highlights = [
             f"{request.years_of_experience}+ years in {request.industry}",
@@ -248,57 +357,39 @@ Generate ONLY the about section text, no explanations:"""
             featured_projects=featured_projects,
         )
 
-    async def _generate_suggested_posts(
+    async def _generate_suggested_post(
         self,
         request: LinkedInPageRequest,
+        i: int,
+        theme: str,
         industry_insights: str,
         github_insights: List[Dict],
-    ) -> List[GeneratedPost]:
-        """Generate suggested LinkedIn posts"""
-
-        posts = []
-        themes = request.content_themes or [
-            "Industry insights",
-            "Career growth",
-            "Technology trends",
-        ]
-
-        for i, theme in enumerate(themes[: request.post_count]):
-            try:
-                # Create context for post generation
-                post_context = f"""
+    ) -> GeneratedPost:
+        """Generate one suggested LinkedIn post for ``theme``"""
+        # Create context for post generation
+        post_context = f"""
 Professional Background: {request.current_role} in {request.industry}
 Industry Insights: {industry_insights}
 Theme: {theme}
 """
 
-                # Add GitHub context if available
-                if github_insights and i < len(github_insights):
-                    project = github_insights[i]
-                    post_context += f"\nFeatured Project: {project.get('name')} - {project.get('description')}"
-
-                # Generate post using existing LinkedIn service logic
-                post_request = PostGenerationRequest(
-                    topic=f"{theme} in {request.industry}",
-                    tone=request.professional_tone,
-                    audience=[request.target_audience],
-                    length="Medium",
-                    hashtags_option="suggest",
-                    post_count=1,
-                    emoji_level=1 if request.include_personal_touch else 0,
-                )
-
-                # Generate individual post
-                from app.services.linkedin_post import generate_single_post
-
-                post = await generate_single_post(post_request, i + 1, post_context)
-                posts.append(post)
-
-            except Exception as e:
-                print(f"Error generating post for theme '{theme}': {e}")
-                continue
+        # Add GitHub context if available
+        if github_insights and i < len(github_insights):
+            project = github_insights[i]
+            post_context += f"\nFeatured Project: {project.get('name')} - {project.get('description')}"
+
+        # Generate post using existing LinkedIn service logic
+        post_request = PostGenerationRequest(
+            topic=f"{theme} in {request.industry}",
+            tone=request.professional_tone,
+            audience=[request.target_audience],
+            length="Medium",
+            hashtags_option="suggest",
+            post_count=1,
+            emoji_level=1 if request.include_personal_touch else 0,
+        )
 
-        return posts
+        return await generate_single_post(post_request, i + 1, post_context)
 
     def _create_content_calendar(
         self, request: LinkedInPageRequest, posts: List[GeneratedPost]
@@ -2,7 +2,8 @@ import os
 import fitz
 import pymupdf4llm
 import re
-from app.core.llm import MODEL_NAME
+from app.core.model_router import model_router
+from app.services.document_cache import document_cache, document_key
 
 
 def _fallback_convert_to_text(file_bytes: bytes) -> str:
@@ -20,19 +21,20 @@ def _fallback_convert_to_text(file_bytes: bytes) -> str:
         "You don't talk about the conversion process, just provide the plain text output.\n",
         "MIND IT YOU ARE JUST SUPPOSED TO RETURN THE PLAIN OUTPUT.\n",
     )
-    response = client.models.generate_content(
-        model=MODEL_NAME + "-lite",
-        contents=[
-            types.Part.from_bytes(
-                data=file_bytes,
-                mime_type="application/pdf",
-            ),
-            "".join(prompt),
-        ],
-    )
-    cleaned_output = response.text
-
-    return str(cleaned_output)
+    model_name = model_router.resolve("extraction", "document_conversion")
+    with model_router.timed(model_name, "extraction"):
+        response = client.models.generate_content(
+            model=model_name,
+            contents=[
+                types.Part.from_bytes(
+                    data=file_bytes,
+                    mime_type="application/pdf",
+                ),
+                "".join(prompt),
+            ],
+        )
+    # ``response.text`` is None when the model returns no text part.
+    return response.text or ""
 
 
 def _convert_document_to_markdown(file_bytes: bytes, filetype: str) -> str:
@@ -54,11 +56,19 @@ def process_document(file_bytes, file_name):
             return file_bytes.decode()
 
         if file_extension in {".pdf", ".doc", ".docx"}:
+            cache_key = document_key(file_bytes, file_extension)
+            cached_txt = document_cache.get(cache_key)
+            if cached_txt is not None:
+                return cached_txt
+
             filetype = file_extension.lstrip(".")
             processed_txt = _convert_document_to_markdown(file_bytes, filetype)
 
             if not processed_txt.strip() and file_extension == ".pdf":
-                return _fallback_convert_to_text(file_bytes)
+                processed_txt = _fallback_convert_to_text(file_bytes)
+
+            if processed_txt.strip():
+                document_cache.set(cache_key, processed_txt)
 
             return processed_txt
 
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from fastapi import HTTPException, UploadFile, File
 from pydantic import ValidationError
 from app.models.schemas import (
@@ -8,11 +9,22 @@ from app.models.schemas import (
     ErrorResponse,
     ComprehensiveAnalysisResponse,
     ComprehensiveAnalysisData,
+    CandidateHit,
 )
+from app.core.concurrency import run_blocking
 from app.services.process_resume import (
     process_document,
     is_valid_resume,
 )
+from app.services.resume_session import create_resume_session, get_resume_session
+from app.services.candidate_index import (
+    candidate_index,
+    index_candidate_in_background,
+)
+from app.services.fast_analysis import (
+    fast_comprehensive_analysis,
+    fast_resume_analysis,
+)
 
 from app.services.data_processor import (
     format_resume_text_with_llm,
@@ -22,8 +34,27 @@ from app.services.data_processor import (
     LLMNotFoundError,
 )
 
+PORTFOLIO_ALIASES = (
+    "personal_website, or any other link",
+    "personal_website",
+    "any other link",
+    "website",
+)
+
+
+def build_comprehensive_analysis(analysis_dict: dict) -> ComprehensiveAnalysisData:
+    """Validate LLM analysis output, mapping the portfolio aliases it may use."""
+    analysis = ComprehensiveAnalysisData(**analysis_dict)
+
+    for alias_key in PORTFOLIO_ALIASES:
+        if alias := analysis_dict.get(alias_key):
+            analysis.portfolio = alias
+            break
+
+    return analysis
+
 
-async def analyze_resume_service(file: UploadFile = File(...)):
+async def analyze_resume_service(file: UploadFile = File(...), fast: bool = False):
     cleaned_data_dict = None
     try:
         uploads_dir = os.path.join(
@@ -43,7 +74,8 @@ async def analyze_resume_service(file: UploadFile = File(...)):
         with open(temp_file_path, "wb") as buffer:
             buffer.write(file_bytes)
 
-        resume_text = process_document(
+        resume_text = await run_blocking(
+            process_document,
             file_bytes,
             file.filename,
         )
@@ -59,8 +91,8 @@ async def analyze_resume_service(file: UploadFile = File(...)):
             os.path.splitext(file.filename)[1].lower() if file.filename else ""
         )
 
-        if resume_text.strip() and file_extension not in [".md", ".txt"]:
-            resume_text = format_resume_text_with_llm(resume_text)
+        if not fast and resume_text.strip() and file_extension not in [".md", ".txt"]:
+            resume_text = await format_resume_text_with_llm(resume_text)
 
         os.remove(temp_file_path)
 
@@ -70,8 +102,11 @@ async def analyze_resume_service(file: UploadFile = File(...)):
                 detail="Invalid resume format",
             )
 
+        if fast:
+            return ResumeUploadResponse(data=await fast_resume_analysis(resume_text))
+
         try:
-            resume_data = format_resume_json_with_llm(
+            resume_data = await format_resume_json_with_llm(
                 extracted_resume_text=resume_text,
             )
             if not resume_data:
@@ -153,7 +188,7 @@ async def analyze_resume_service(file: UploadFile = File(...)):
         )
 
 
-async def comprehensive_resume_analysis_service(file: UploadFile):
+async def comprehensive_resume_analysis_service(file: UploadFile, fast: bool = False):
     try:
         uploads_dir = os.path.join(
             os.path.dirname(__file__),
@@ -174,7 +209,8 @@ async def comprehensive_resume_analysis_service(file: UploadFile):
         with open(temp_file_path, "wb") as buffer:
             buffer.write(file_bytes)
 
-        resume_text = process_document(
+        resume_text = await run_blocking(
+            process_document,
             file_bytes,
             file.filename,
         )
@@ -194,7 +230,13 @@ async def comprehensive_resume_analysis_service(file: UploadFile):
                 detail="Invalid resume format or content.",
             )
 
-        analysis_dict = comprehensive_analysis_llm(resume_text)
+        if fast:
+            return ComprehensiveAnalysisResponse(
+                data=await fast_comprehensive_analysis(resume_text),
+                cleaned_text=resume_text,
+            )
+
+        analysis_dict = await comprehensive_analysis_llm(resume_text)
         if not isinstance(analysis_dict, dict):
             raise HTTPException(
                 status_code=500,
@@ -205,16 +247,9 @@ async def comprehensive_resume_analysis_service(file: UploadFile):
             )
         analysis_dict = {str(k): v for k, v in analysis_dict.items()}
 
-        comprehensive_data = ComprehensiveAnalysisData(**analysis_dict)
+        comprehensive_data = build_comprehensive_analysis(analysis_dict)
 
-        if alias := analysis_dict.get("personal_website, or any other link"):
-            comprehensive_data.portfolio = alias
-        elif alias := analysis_dict.get("personal_website"):
-            comprehensive_data.portfolio = alias
-        elif alias := analysis_dict.get("any other link"):
-            comprehensive_data.portfolio = alias
-        elif alias := analysis_dict.get("website"):
-            comprehensive_data.portfolio = alias
+        index_candidate_in_background(resume_text, comprehensive_data)
 
         return ComprehensiveAnalysisResponse(
             data=comprehensive_data,
@@ -234,7 +269,7 @@ async def comprehensive_resume_analysis_service(file: UploadFile):
         )
 
 
-async def format_and_analyze_resume_service(file: UploadFile):
+async def format_and_analyze_resume_service(file: UploadFile, fast: bool = False):
     # Async version for v2
     try:
         uploads_dir = os.path.join(
@@ -253,7 +288,8 @@ async def format_and_analyze_resume_service(file: UploadFile):
         with open(temp_file_path, "wb") as buffer:
             buffer.write(file_bytes)
 
-        raw_resume_text = process_document(
+        raw_resume_text = await run_blocking(
+            process_document,
             file_bytes,
             file.filename,
         )
@@ -265,24 +301,24 @@ async def format_and_analyze_resume_service(file: UploadFile):
                 detail=f"Unsupported file type or error processing file: {file.filename}",
             )
 
-        analysis_dict = format_and_analyse_resumes(
-            raw_text=raw_resume_text,
-        )
-
-        analysis = ComprehensiveAnalysisData(**analysis_dict)
+        if fast:
+            analysis = await fast_comprehensive_analysis(raw_resume_text)
+        else:
+            analysis_dict = await format_and_analyse_resumes(
+                raw_text=raw_resume_text,
+            )
+            analysis = build_comprehensive_analysis(analysis_dict)
 
-        if alias := analysis_dict.get("personal_website, or any other link"):
-            analysis.portfolio = alias
-        elif alias := analysis_dict.get("personal_website"):
-            analysis.portfolio = alias
-        elif alias := analysis_dict.get("any other link"):
-            analysis.portfolio = alias
-        elif alias := analysis_dict.get("website"):
-            analysis.portfolio = alias
+        session = create_resume_session(
+            cleaned_text=raw_resume_text,
+            analysis=analysis,
+            file_name=file.filename,
+        )
 
         return FormattedAndAnalyzedResumeResponse(
             cleaned_text=raw_resume_text,
             analysis=analysis,
+            session_id=session.session_id,
         )
 
     except HTTPException:
@@ -298,17 +334,28 @@ async def format_and_analyze_resume_service(file: UploadFile):
         )
 
 
-async def analyze_resume_v2_service(formated_resume: str):
+async def analyze_resume_v2_service(
+    formated_resume: Optional[str],
+    session_id: Optional[str] = None,
+    fast: bool = False,
+):
     # Async version for v2
     try:
-        if not formated_resume.strip():
+        if session_id:
+            # The session already holds the analysis of this resume.
+            return get_resume_session(session_id).analysis
+
+        if not formated_resume or not formated_resume.strip():
             raise HTTPException(
                 status_code=400, detail="Formatted resume text cannot be empty."
             )
 
         formated_resume = formated_resume.strip()
 
-        analysis_dict = comprehensive_analysis_llm(
+        if fast:
+            return await fast_comprehensive_analysis(formated_resume)
+
+        analysis_dict = await comprehensive_analysis_llm(
             resume_text=formated_resume,
         )
 
@@ -336,23 +383,44 @@ async def analyze_resume_v2_service(formated_resume: str):
         )
 
 
-# db response placeholders
-def get_resumes_service():
-    # TODO: Replace with actual DB or persistent storage
+def _hit_to_resume_analysis(hit: CandidateHit) -> ResumeAnalysis:
+    analysis = hit.analysis
+    return ResumeAnalysis(
+        **{
+            "name": analysis.name or "N/A",
+            "email": analysis.email or "N/A",
+            "linkedin": analysis.linkedin,
+            "github": analysis.github,
+            "blog": analysis.blog,
+            "personal_website, or any other link": analysis.portfolio,
+            "contact": analysis.contact,
+            "predicted_field": hit.predicted_field or "Unknown",
+            "skills": hit.skills,
+            "upload_date": hit.indexed_at,
+        }
+    )
+
+
+async def get_resumes_service(limit: int = 50, offset: int = 0):
+    total, hits = await run_blocking(candidate_index.recent, None, limit, offset)
     return {
         "success": True,
         "message": "Fetched resumes successfully.",
-        "data": [],
-        "count": 0,
+        "data": [_hit_to_resume_analysis(hit) for hit in hits],
+        "count": total,
     }
 
 
-def get_resumes_by_category_service(category: str):
-    # TODO: Replace with actual DB or persistent storage
+async def get_resumes_by_category_service(
+    category: str,
+    limit: int = 50,
+    offset: int = 0,
+):
+    total, hits = await run_blocking(candidate_index.recent, category, limit, offset)
     return {
         "success": True,
         "message": f"Fetched resumes for category: {category}",
-        "data": [],
-        "count": 0,
+        "data": [_hit_to_resume_analysis(hit) for hit in hits],
+        "count": total,
         "category": category,
     }
@@ -16,10 +16,12 @@ Usage:
 
 from .graph import (
     run_resume_pipeline as generate_tailored_resume,
+    get_resume_graph,
     GraphBuilder,
 )
 
 __all__ = [
     "generate_tailored_resume",
     "GraphBuilder",
+    "get_resume_graph",
 ]
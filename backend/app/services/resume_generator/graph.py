@@ -5,42 +5,83 @@ from typing import Optional, List
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
-from langgraph.graph import StateGraph, START, END, MessagesState
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import StateGraph, START, END
 from langchain_core.prompts import ChatPromptTemplate
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import ToolNode
 from langchain_tavily import TavilySearch
 
 import json
 import re
 
-from app.core.llm import llm
+from app.core.graph_cache import graph_cache
 from app.core.llm import MODEL_NAME
+from app.core.model_router import model_router, routed_llm
 
 from app.services.ats import ats_evaluate_service
-from app.agents.web_content_agent import return_markdown
+from app.services.company_content import company_markdown
+from app.core.agent_budget import (
+    FINAL_ANSWER_NODE,
+    AgentBudget,
+    AgentState,
+    agent_step,
+    budget_config,
+    final_answer_step,
+    route_tools,
+)
 
 
 load_dotenv()
 
 
+RESUME_TAILOR_PROMPT = ChatPromptTemplate.from_template(
+    """
+        You are a resume expert. The ML model predicted the job of {job} at {company_name}.
+        Given the resume below, the company's website content, the job description, and the ATS evaluation summary, highlight and improve the resume's impact and tailor it for this role.
+        Use the given tools to search for relevant details and to align the resume with the company's products, tech stack, and values.
+
+        Company: {company_name}
+
+        Company website content:
+        {company_website_content}
+
+        Job description:
+        {jd}
+
+        ATS evaluation (score, reasons, suggestions, and message):
+        {ats_summary}
+
+        Resume:
+        {resume}
+
+        Use the ATS "suggestions" and "reasons_for_the_score" to modify the resume where relevant.
+        At the end, return only a single JSON object strictly matching the ComprehensiveAnalysisData schema.
+        """,
+)
+
+
 class GraphBuilder:
     def __init__(
         self,
-        system_prompt_messages: List,
+        system_prompt_messages: Optional[List],
         tools: List,
-        model_name: str = MODEL_NAME,
+        model_name: Optional[str] = None,
     ) -> None:
         """Create a GraphBuilder that will run the state graph with a chat LLM bound to tools.
 
         Args:
-            system_prompt_messages: list of Message objects returned from prompt.format_messages(...)
+            system_prompt_messages: list of Message objects returned from prompt.format_messages(...),
+                or None to read them from the ``system_messages`` state key (shared graphs)
             tools: list of tool instances to expose to the model
-            model_name: model identifier for ChatGoogleGenerativeAI
+            model_name: model identifier for ChatGoogleGenerativeAI, or None to
+                use the model routed for the ``resume_generator`` task
         """
-        if llm:
-            self.llm = llm
+        if model_name is None:
+            self.llm = routed_llm("reasoning", "resume_generator")
         else:
-            self.llm = ChatGoogleGenerativeAI(model=model_name)
+            self.llm = model_router.model(model_name)
+        if self.llm is None:
+            self.llm = ChatGoogleGenerativeAI(model=model_name or MODEL_NAME)
         self.tools = tools or []
         self.llm_with_tools = self.llm.bind_tools(
             tools=self.tools,
@@ -48,20 +89,25 @@ class GraphBuilder:
         self.graph = None
         self.system_prompt = system_prompt_messages
 
-    def agent_function(self, state: MessagesState):
-        user_question = state["messages"]
-        input_question = [*self.system_prompt] + user_question
-        response = self.llm_with_tools.invoke(input_question)
-        return {"messages": [response]}
+    async def agent_function(self, state: AgentState, config: RunnableConfig):
+        return await agent_step(
+            self.llm_with_tools, self.llm, self.system_prompt, state, config
+        )
+
+    async def final_answer_function(self, state: AgentState, config: RunnableConfig):
+        return await final_answer_step(self.llm, self.system_prompt, state, config)
 
     def build_graph(self):
-        graph_builder = StateGraph(MessagesState)
+        graph_builder = StateGraph(AgentState)
         graph_builder.add_node("agent", self.agent_function)
         graph_builder.add_node("tools", ToolNode(tools=self.tools))
+        graph_builder.add_node(FINAL_ANSWER_NODE, self.final_answer_function)
         graph_builder.add_edge(START, "agent")
-        graph_builder.add_conditional_edges("agent", tools_condition)
+        graph_builder.add_conditional_edges(
+            "agent", route_tools, ["tools", FINAL_ANSWER_NODE, END]
+        )
         graph_builder.add_edge("tools", "agent")
-        graph_builder.add_edge("agent", END)
+        graph_builder.add_edge(FINAL_ANSWER_NODE, END)
         self.graph = graph_builder.compile()
         return self.graph
 
@@ -69,6 +115,30 @@ class GraphBuilder:
         return self.build_graph()
 
 
+def _resume_graph_key(model_name: Optional[str], max_tool_results: int) -> str:
+    return f"resume_generator:{model_name or 'routed'}:{max_tool_results}"
+
+
+def _build_resume_graph(model_name: Optional[str], max_tool_results: int):
+    tools = [TavilySearch(max_results=max_tool_results, topic="general")]
+    return GraphBuilder(
+        system_prompt_messages=None,
+        tools=tools,
+        model_name=model_name,
+    ).build_graph()
+
+
+def get_resume_graph(model_name: Optional[str] = None, max_tool_results: int = 3):
+    """The shared compiled tailoring graph for this model and tool setup."""
+    return graph_cache.get(
+        _resume_graph_key(model_name, max_tool_results),
+        lambda: _build_resume_graph(model_name, max_tool_results),
+    )
+
+
+graph_cache.register(_resume_graph_key(None, 3), lambda: _build_resume_graph(None, 3))
+
+
 async def run_resume_pipeline(
     resume: str,
     job: str,
@@ -76,11 +146,14 @@ async def run_resume_pipeline(
     company_website: Optional[str] = None,
     jd: Optional[str] = None,
     max_tool_results: int = 3,
-    model_name: str = MODEL_NAME,
+    model_name: Optional[str] = None,
+    budget: Optional[AgentBudget] = None,
 ) -> str:
     """Run the end-to-end resume tailoring pipeline and return a JSON string result.
 
     The function centralizes all side-effects and avoids executing work at import time.
+    ``budget`` caps the agent's tool loop; the name of an exhausted budget is
+    returned under ``budget_exhausted``.
     """
 
     try:
@@ -113,57 +186,19 @@ async def run_resume_pipeline(
         )
 
     # Fetch company website content if provided
-    company_website_content = (
-        return_markdown(company_website) if company_website else ""
-    )
-
-    # Build prompt template with partial values
-    prompt = ChatPromptTemplate.from_template(
-        """
-        You are a resume expert. The ML model predicted the job of {job} at {company_name}.
-        Given the resume below, the company's website content, the job description, and the ATS evaluation summary, highlight and improve the resume's impact and tailor it for this role.
-        Use the given tools to search for relevant details and to align the resume with the company's products, tech stack, and values.
-
-        Company: {company_name}
+    company_website_content = await company_markdown(company_website)
 
-        Company website content:
-        {company_website_content}
-
-        Job description:
-        {jd}
-
-        ATS evaluation (score, reasons, suggestions, and message):
-        {ats_summary}
-
-        Resume:
-        {resume}
-
-        Use the ATS "suggestions" and "reasons_for_the_score" to modify the resume where relevant.
-        At the end, return only a single JSON object strictly matching the ComprehensiveAnalysisData schema.
-        """,
-    ).partial(
+    # The compiled graph is shared; this request's context goes in the state.
+    graph = get_resume_graph(model_name=model_name, max_tool_results=max_tool_results)
+    system_prompt_messages = RESUME_TAILOR_PROMPT.format_messages(
+        resume=resume,
+        job=job,
         company_name=company_name or "",
         company_website_content=company_website_content,
         jd=jd or "",
         ats_summary=ats_summary,
     )
 
-    # Prepare tools
-    tavily_search_tool = TavilySearch(max_results=max_tool_results, topic="general")
-    tools = [tavily_search_tool]
-
-    # Instantiate graph builder with formatted system prompt messages
-    system_prompt_messages = prompt.format_messages(
-        resume=resume,
-        job=job,
-    )
-    builder = GraphBuilder(
-        system_prompt_messages=system_prompt_messages,
-        tools=tools,
-        model_name=model_name,
-    )
-    graph = builder()
-
     # Instruction asking model to return a strict JSON matching the expected schema
     json_instruction = (
         "Return only a single valid JSON object (no extra text). "
@@ -186,16 +221,19 @@ async def run_resume_pipeline(
         "Only include these keys. If a field is empty, return an empty array or null for optional strings. Ensure all strings are properly quoted and the output is strictly valid JSON."
     )
 
-    response = graph.invoke(
+    response = await graph.ainvoke(
         {
             "messages": [
                 HumanMessage(
                     content=json_instruction,
                 )
-            ]
-        }
+            ],
+            "system_messages": system_prompt_messages,
+        },
+        config=budget_config(budget),
     )
     text = response["messages"][-1].content.strip()
+    budget_exhausted = response.get("budget_exhausted")
 
     # Try to extract JSON substring
     start = text.find("{")
@@ -205,6 +243,8 @@ async def run_resume_pipeline(
     # Attempt to parse; try simple fixes if necessary
     try:
         parsed = json.loads(json_text)
+        if isinstance(parsed, dict):
+            parsed["budget_exhausted"] = budget_exhausted
         return json.dumps(
             parsed,
             indent=2,
@@ -219,6 +259,8 @@ async def run_resume_pipeline(
                 r"(?<=[\\{\\s,])([A-Za-z0-9_+-]+)\\s*:\\s", r'"\\1": ', fixed
             )
             parsed = json.loads(fixed)
+            if isinstance(parsed, dict):
+                parsed["budget_exhausted"] = budget_exhausted
             return json.dumps(
                 parsed,
                 indent=2,
@@ -229,11 +271,13 @@ async def run_resume_pipeline(
                 {
                     "error": "failed to parse model output as JSON",
                     "raw": text,
+                    "budget_exhausted": budget_exhausted,
                 },
                 indent=2,
             )
 
 
 __all__ = [
+    "get_resume_graph",
     "run_resume_pipeline",
 ]
@@ -0,0 +1,147 @@
+"""Resume sessions: parse and analyse a resume once, reuse it everywhere.
+
+A session stores the cleaned resume text and its ``ComprehensiveAnalysisData``
+under an opaque handle. Text-based endpoints (ATS, tailoring, cold mail,
+hiring assistant, v2 analysis) accept ``session_id`` in place of
+``resume_text`` so the frontend's feature-by-feature flow no longer re-parses
+and re-formats the same upload.
+
+Sessions live in a bounded in-process store and expire after
+``RESUME_SESSION_TTL`` seconds. The store is per worker: with several
+uvicorn workers a ``session_id`` is only valid on the worker that created
+it, so run one worker or route a client's requests to the same worker.
+"""
+
+import secrets
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.cache import LRUCache, register_cache_stats
+from app.core.config import resume_session_max_entries, resume_session_ttl
+from app.services.candidate_index import index_candidate_in_background
+from app.models.schemas import (
+    ComprehensiveAnalysisData,
+    ErrorResponse,
+    ResumeSessionResponse,
+)
+
+
+@dataclass
+class ResumeSession:
+    session_id: str
+    cleaned_text: str
+    analysis: ComprehensiveAnalysisData
+    file_name: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def expires_at(self) -> datetime:
+        return self.created_at + timedelta(seconds=resume_session_ttl)
+
+
+session_store = LRUCache[ResumeSession](
+    max_entries=resume_session_max_entries,
+    ttl=resume_session_ttl,
+)
+
+register_cache_stats("resume_sessions", session_store.stats_dict)
+
+
+def create_resume_session(
+    cleaned_text: str,
+    analysis: ComprehensiveAnalysisData,
+    file_name: Optional[str] = None,
+) -> ResumeSession:
+    """Store an analysed resume and return its session."""
+    session = ResumeSession(
+        session_id=secrets.token_urlsafe(16),
+        cleaned_text=cleaned_text,
+        analysis=analysis,
+        file_name=file_name,
+    )
+    session_store.set(session.session_id, session)
+    index_candidate_in_background(cleaned_text, analysis, session.session_id)
+    return session
+
+
+def get_resume_session(session_id: str) -> ResumeSession:
+    """Return a live session or raise a 404 if it is unknown or expired."""
+    session = session_store.get(session_id.strip()) if session_id else None
+    if session is None:
+        raise HTTPException(
+            status_code=404,
+            detail=ErrorResponse(
+                message="Resume session not found or expired. Upload the resume again.",
+            ).model_dump(),
+        )
+    return session
+
+
+def resolve_resume_text(
+    resume_text: Optional[str],
+    session_id: Optional[str],
+) -> str:
+    """Return the resume text for a request that sent text or a session handle."""
+    if session_id:
+        return get_resume_session(session_id).cleaned_text
+
+    if resume_text and resume_text.strip():
+        return resume_text
+
+    raise HTTPException(
+        status_code=400,
+        detail=ErrorResponse(
+            message="Either resume_text or session_id must be provided.",
+        ).model_dump(),
+    )
+
+
+def session_response(session: ResumeSession) -> ResumeSessionResponse:
+    return ResumeSessionResponse(
+        session_id=session.session_id,
+        cleaned_text=session.cleaned_text,
+        analysis=session.analysis,
+        expires_at=session.expires_at,
+    )
+
+
+async def create_resume_session_service(
+    file: UploadFile,
+    fast: bool = False,
+) -> ResumeSessionResponse:
+    # Imported lazily: resume_analysis registers sessions itself.
+    from app.services.resume_analysis import format_and_analyze_resume_service
+
+    result = await format_and_analyze_resume_service(file, fast=fast)
+    return session_response(get_resume_session(result.session_id or ""))
+
+
+async def get_resume_session_service(session_id: str) -> ResumeSessionResponse:
+    return session_response(get_resume_session(session_id))
+
+
+async def delete_resume_session_service(session_id: str) -> dict:
+    if not session_store.delete(session_id):
+        raise HTTPException(
+            status_code=404,
+            detail=ErrorResponse(message="Resume session not found.").model_dump(),
+        )
+    return {
+        "success": True,
+        "message": "Resume session deleted.",
+        "session_id": session_id,
+    }
+
+
+__all__ = [
+    "ResumeSession",
+    "create_resume_session",
+    "get_resume_session",
+    "resolve_resume_text",
+    "create_resume_session_service",
+    "get_resume_session_service",
+    "delete_resume_session_service",
+]
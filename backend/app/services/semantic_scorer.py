@@ -0,0 +1,380 @@
+"""Local embedding engine for semantic JD <-> resume scoring.
+
+Resumes and job descriptions are split into sections, embedded on CPU with
+a sentence-transformers model (``EMBEDDING_MODEL``) and compared with
+cosine similarity. For every JD section the best matching resume section
+is reported; the semantic score is the mean of those best matches, so a
+resume that covers every part of the JD scores high even if its overall
+wording differs.
+
+Section embeddings are cached by content hash, so ranking hundreds of
+resumes against one JD embeds the JD once and each resume once. The model
+is optional: when ``sentence-transformers`` is not installed the endpoints
+answer 503 and the ATS evaluator simply runs without the semantic hint.
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.core.cache import LRUCache, register_cache_stats
+from app.core.concurrency import run_blocking
+from app.core.config import (
+    embedding_batch_size,
+    embedding_cache_entries,
+    embedding_model_name,
+    embedding_retry_interval,
+    semantic_chunk_max_chars,
+)
+from app.models.schemas import ErrorResponse
+
+# Markdown headings, bold-only lines, ALL-CAPS lines and "Title:" lines.
+_HEADING_RE = re.compile(
+    r"^\s*(?:#{1,6}\s+(?P<md>.+?)"
+    r"|\*\*(?P<bold>[^*]{2,60})\*\*:?"
+    r"|(?P<caps>[A-Z][A-Z &/()-]{2,40})"
+    r"|(?P<colon>[A-Z][A-Za-z &/()-]{2,40}):)\s*$"
+)
+
+Section = Tuple[str, str]
+
+
+class EmbeddingModelUnavailable(RuntimeError):
+    """Raised when the sentence-transformers model cannot be loaded."""
+
+
+@dataclass
+class SemanticScore:
+    score: float
+    document_similarity: float
+    sections: List[dict] = field(default_factory=list)
+
+
+def _split_long(body: str, max_chars: int) -> List[str]:
+    if len(body) <= max_chars:
+        return [body]
+
+    chunks: List[str] = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n|\n(?=[-*•])", body):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) + 1 > max_chars:
+            chunks.append(current)
+            current = ""
+        while len(paragraph) > max_chars:
+            chunks.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        current = f"{current}\n{paragraph}" if current else paragraph
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_sections(
+    text: str,
+    max_chars: int = semantic_chunk_max_chars,
+    preamble_title: str = "Summary",
+) -> List[Section]:
+    """Split a resume or JD into ``(title, body)`` chunks.
+
+    Markdown headings and short title-like lines start a new section; long
+    sections are split on paragraph boundaries to at most ``max_chars``.
+    Text before the first heading (usually name and contact lines) is titled
+    ``preamble_title``; pass ``""`` to tell it apart from real sections.
+    """
+    sections: List[Section] = []
+    title, lines = preamble_title, []
+
+    def flush() -> None:
+        body = "\n".join(lines).strip()
+        if body:
+            for index, chunk in enumerate(_split_long(body, max_chars)):
+                continued = index and title
+                sections.append((f"{title} (cont.)" if continued else title, chunk))
+
+    for line in (text or "").splitlines():
+        heading = _HEADING_RE.match(line)
+        if heading and len(line.strip()) <= 60:
+            flush()
+            title = next(group for group in heading.groups() if group).strip("*: ")
+            lines = []
+        else:
+            lines.append(line)
+    flush()
+
+    return sections
+
+
+class EmbeddingEngine:
+    """Lazily loaded sentence-transformers model with a per-chunk cache."""
+
+    def __init__(self, model_name: str = embedding_model_name):
+        self.model_name = model_name
+        self._model: Any = None
+        self._error: Optional[EmbeddingModelUnavailable] = None
+        # Monotonic time after which a failed load may be retried.
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self.cache = LRUCache[np.ndarray](max_entries=embedding_cache_entries)
+
+    def _load(self) -> Any:
+        if self._model is not None:
+            return self._model
+
+        if self._error is not None and time.monotonic() < self._retry_at:
+            raise self._error
+
+        with self._lock:
+            if self._model is None and (
+                self._error is None or time.monotonic() >= self._retry_at
+            ):
+                # Failures are remembered so callers don't retry per request:
+                # a missing package for good, anything else for a while.
+                try:
+                    from sentence_transformers import SentenceTransformer
+
+                    self._model = SentenceTransformer(self.model_name, device="cpu")
+                    self._error = None
+
+                except ImportError:
+                    self._error = EmbeddingModelUnavailable(
+                        "sentence-transformers is not installed."
+                    )
+                    self._retry_at = math.inf
+
+                except Exception as e:
+                    self._error = EmbeddingModelUnavailable(
+                        f"Failed to load embedding model {self.model_name}: {e}"
+                    )
+                    self._retry_at = time.monotonic() + embedding_retry_interval
+
+        if self._model is None:
+            assert self._error is not None
+            raise self._error
+        return self._model
+
+    @property
+    def available(self) -> bool:
+        try:
+            self._load()
+            return True
+
+        except EmbeddingModelUnavailable:
+            return False
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return L2-normalised embeddings, one row per text."""
+        keys = [hashlib.sha1(text.encode("utf-8")).hexdigest() for text in texts]
+        vectors: List[Optional[np.ndarray]] = [self.cache.get(key) for key in keys]
+
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if missing:
+            encoded = self._load().encode(
+                [texts[index] for index in missing],
+                batch_size=embedding_batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+            for index, vector in zip(missing, encoded):
+                vector = np.asarray(vector, dtype=np.float32)
+                vectors[index] = vector
+                self.cache.set(keys[index], vector)
+
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(vectors)
+
+
+embedding_engine = EmbeddingEngine()
+
+register_cache_stats("embeddings", embedding_engine.cache.stats_dict)
+
+
+def _section_text(section: Section) -> str:
+    return f"{section[0]}: {section[1]}"
+
+
+def _score_against(
+    jd_sections: List[Section],
+    jd_vectors: np.ndarray,
+    jd_document: np.ndarray,
+    resume_sections: List[Section],
+    resume_vectors: np.ndarray,
+    resume_document: np.ndarray,
+) -> SemanticScore:
+    if not resume_sections or not jd_sections:
+        return SemanticScore(score=0.0, document_similarity=0.0)
+
+    similarity = jd_vectors @ resume_vectors.T
+    best = similarity.argmax(axis=1)
+    best_scores = np.clip(similarity[np.arange(len(jd_sections)), best], 0.0, 1.0)
+
+    return SemanticScore(
+        score=round(float(best_scores.mean()), 4),
+        document_similarity=round(
+            float(np.clip(jd_document @ resume_document, 0.0, 1.0)), 4
+        ),
+        sections=[
+            {
+                "jd_section": jd_sections[index][0],
+                "resume_section": resume_sections[best[index]][0],
+                "similarity": round(float(best_scores[index]), 4),
+            }
+            for index in range(len(jd_sections))
+        ],
+    )
+
+
+def score_resumes(jd_text: str, resume_texts: Sequence[str]) -> List[SemanticScore]:
+    """Score each resume against ``jd_text``.
+
+    All sections of the JD and of every resume are embedded in one batched
+    call, then each resume is scored with a small matrix product.
+    """
+    jd_sections = split_sections(jd_text)
+    resume_sections = [split_sections(text) for text in resume_texts]
+
+    # Layout: JD sections, JD document, then per resume its sections + document.
+    texts = [_section_text(section) for section in jd_sections] + [jd_text]
+    for sections, text in zip(resume_sections, resume_texts):
+        texts.extend(_section_text(section) for section in sections)
+        texts.append(text)
+    vectors = embedding_engine.embed(texts)
+
+    jd_count = len(jd_sections)
+    jd_vectors, jd_document = vectors[:jd_count], vectors[jd_count]
+    offset = jd_count + 1
+
+    scores = []
+    for sections in resume_sections:
+        count = len(sections)
+        scores.append(
+            _score_against(
+                jd_sections,
+                jd_vectors,
+                jd_document,
+                sections,
+                vectors[offset : offset + count],
+                vectors[offset + count],
+            )
+        )
+        offset += count + 1
+
+    return scores
+
+
+def score_jds(resume_text: str, jd_texts: Sequence[str]) -> List[SemanticScore]:
+    """Score one resume against each of ``jd_texts``.
+
+    The mirror of :func:`score_resumes`: the resume and every JD are embedded
+    in one batched call.
+    """
+    resume_sections = split_sections(resume_text)
+    jd_sections = [split_sections(text) for text in jd_texts]
+
+    # Layout: resume sections, resume document, then per JD its sections + document.
+    texts = [_section_text(section) for section in resume_sections] + [resume_text]
+    for sections, text in zip(jd_sections, jd_texts):
+        texts.extend(_section_text(section) for section in sections)
+        texts.append(text)
+    vectors = embedding_engine.embed(texts)
+
+    resume_count = len(resume_sections)
+    resume_vectors, resume_document = vectors[:resume_count], vectors[resume_count]
+    offset = resume_count + 1
+
+    scores = []
+    for sections in jd_sections:
+        count = len(sections)
+        scores.append(
+            _score_against(
+                sections,
+                vectors[offset : offset + count],
+                vectors[offset + count],
+                resume_sections,
+                resume_vectors,
+                resume_document,
+            )
+        )
+        offset += count + 1
+
+    return scores
+
+
+def _unavailable_error(error: Exception) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=ErrorResponse(
+            message="Semantic scoring is unavailable on this server.",
+            error_detail=str(error),
+        ).model_dump(),
+    )
+
+
+async def score_resumes_async(
+    jd_text: str,
+    resume_texts: Sequence[str],
+) -> List[SemanticScore]:
+    """Async wrapper raising a 503 when the embedding model is unavailable."""
+    try:
+        return await run_blocking(score_resumes, jd_text, list(resume_texts))
+
+    except EmbeddingModelUnavailable as e:
+        raise _unavailable_error(e)
+
+
+async def semantic_hint(resume_text: str, jd_text: str) -> Optional[SemanticScore]:
+    """Best-effort score for prompt enrichment; ``None`` if unavailable."""
+    try:
+        return (await run_blocking(score_resumes, jd_text, [resume_text]))[0]
+
+    except EmbeddingModelUnavailable:
+        return None
+
+    except Exception as e:
+        print(f"Semantic hint skipped: {e}")
+        return None
+
+
+def format_semantic_hint(score: Optional[SemanticScore]) -> str:
+    """Render a semantic score for the ATS evaluator prompt."""
+    if score is None:
+        return "Not computed"
+
+    weakest = sorted(score.sections, key=lambda section: section["similarity"])[:3]
+    lines = [
+        f"Overall semantic match: {score.score:.2f} "
+        f"(whole-document similarity {score.document_similarity:.2f})"
+    ]
+    lines.extend(
+        f"- Weakest JD section: {section['jd_section']} "
+        f"(best resume match: {section['resume_section']}, "
+        f"{section['similarity']:.2f})"
+        for section in weakest
+    )
+    return "\n".join(lines)
+
+
+__all__ = [
+    "EmbeddingModelUnavailable",
+    "SemanticScore",
+    "EmbeddingEngine",
+    "embedding_engine",
+    "split_sections",
+    "score_resumes",
+    "score_jds",
+    "score_resumes_async",
+    "semantic_hint",
+    "format_semantic_hint",
+]
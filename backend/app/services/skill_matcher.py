@@ -0,0 +1,134 @@
+"""Single-pass skill matcher over the skills vocabulary.
+
+The vocabulary is compiled once into one regular expression whose
+alternation is factored as a character trie, so matching costs one scan of
+the resume regardless of how many skills are known (the legacy
+``extract_skills_from_resume`` ran one ``re.search`` per skill). Longer
+skills win over their prefixes ("Spring Boot" over "Spring"), and the
+custom boundaries keep "C" from matching inside "C++" or "C#".
+
+Results carry the canonical skill name, an occurrence count and the
+character offsets of every hit; :func:`format_detected_skills` renders them
+for the prompts that are pre-annotated before the LLM call.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.data.skills import skills_list
+
+# Skills may start or end with symbols (".NET", "C++"), so ``\b`` won't do.
+_LEFT_BOUNDARY = r"(?<![\w])"
+_RIGHT_BOUNDARY = r"(?![\w+#])"
+
+
+def _normalize(skill: str) -> str:
+    return " ".join(skill.split()).lower()
+
+
+@dataclass
+class SkillMatch:
+    skill: str
+    count: int = 0
+    offsets: List[Tuple[int, int]] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "skill": self.skill,
+            "count": self.count,
+            "offsets": [list(offset) for offset in self.offsets],
+        }
+
+
+def _trie_pattern(node: dict) -> str:
+    """Render a character trie as a regex alternation, longest branch first."""
+    terminal = "" in node
+    branches = []
+    for char in sorted((c for c in node if c), reverse=True):
+        atom = r"\s+" if char == " " else re.escape(char)
+        branches.append(atom + _trie_pattern(node[char]))
+
+    if not branches:
+        return ""
+
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if terminal:
+        return "(?:" + body + ")?"
+    return body
+
+
+class SkillMatcher:
+    """Compiled matcher for a fixed skills vocabulary."""
+
+    def __init__(self, skills: Iterable[str]):
+        self.canonical: Dict[str, str] = {}
+        for skill in skills:
+            key = _normalize(skill)
+            if key:
+                self.canonical.setdefault(key, skill.strip())
+
+        trie: dict = {}
+        for key in self.canonical:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        self.pattern: Optional[re.Pattern] = (
+            re.compile(
+                _LEFT_BOUNDARY + "(?:" + _trie_pattern(trie) + ")" + _RIGHT_BOUNDARY,
+                re.IGNORECASE,
+            )
+            if trie
+            else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.canonical)
+
+    def match(self, text: str) -> List[SkillMatch]:
+        """Return every known skill in ``text``, ordered by first occurrence."""
+        if not text or self.pattern is None:
+            return []
+
+        matches: Dict[str, SkillMatch] = {}
+        for hit in self.pattern.finditer(text):
+            skill = self.canonical.get(_normalize(hit.group()))
+            if skill is None:
+                continue
+            entry = matches.setdefault(skill, SkillMatch(skill=skill))
+            entry.count += 1
+            entry.offsets.append(hit.span())
+
+        return list(matches.values())
+
+    def extract(self, text: str) -> List[str]:
+        return [entry.skill for entry in self.match(text)]
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    """Matcher over ``app.data.skills.skills_list``, built on first use."""
+    return SkillMatcher(skills_list)
+
+
+def format_detected_skills(text: str, limit: int = 50) -> str:
+    """One-line summary of detected skills for prompt pre-annotation."""
+    matches = sorted(
+        get_skill_matcher().match(text),
+        key=lambda entry: entry.count,
+        reverse=True,
+    )[:limit]
+    if not matches:
+        return "None detected"
+    return ", ".join(f"{entry.skill} (x{entry.count})" for entry in matches)
+
+
+__all__ = [
+    "SkillMatch",
+    "SkillMatcher",
+    "get_skill_matcher",
+    "format_detected_skills",
+]
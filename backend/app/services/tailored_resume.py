@@ -69,12 +69,19 @@ async def tailor_resume(
             data=ComprehensiveAnalysisData(),
         )
 
+    budget_exhausted = (
+        parsed_result.pop("budget_exhausted", None)
+        if isinstance(parsed_result, dict)
+        else None
+    )
+
     if isinstance(parsed_result, dict) and parsed_result.get("error"):
         return ComprehensiveAnalysisResponse(
             success=False,
             message=parsed_result.get("error", "Tailored resume generation failed"),
             data=ComprehensiveAnalysisData(),
             cleaned_text=parsed_result.get("raw"),
+            budget_exhausted=budget_exhausted,
         )
 
     try:
@@ -86,4 +93,5 @@ async def tailor_resume(
 
     return ComprehensiveAnalysisResponse(
         data=analysis,
+        budget_exhausted=budget_exhausted,
     )
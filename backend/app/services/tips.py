@@ -2,9 +2,10 @@ import json
 from fastapi import HTTPException
 from app.models.schemas import TipsResponse, TipsData, Tip
 from app.data.prompt.tips_generator import tips_generator_chain
+from app.core.singleflight import coalesced_ainvoke
 
 
-def tips_llm(
+async def tips_llm(
     job_category: str,
     skills: list[str] | str,
 ) -> TipsData:
@@ -24,11 +25,12 @@ def tips_llm(
         skills = ", ".join(skills)
 
     try:
-        result = tips_generator_chain.invoke(
+        result = await coalesced_ainvoke(
+            tips_generator_chain,
             {
                 "job_category": job_category,
                 "skills_list_str": skills,
-            }
+            },
         )
         result = str(result.content)
 
@@ -92,12 +94,12 @@ def tips_llm(
     raise ValueError("Unexpected result format from tips_generator_chain")
 
 
-def get_career_tips_service(
+async def get_career_tips_service(
     job_category: str,
     skills: list[str] | str,
 ) -> TipsResponse:
     try:
-        tips_data = tips_llm(job_category, skills)
+        tips_data = await tips_llm(job_category, skills)
 
     except HTTPException:
         raise